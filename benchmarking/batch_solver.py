@@ -0,0 +1,28 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import importlib
+
+# Algorithms that can solve a whole batch of mazes at once: name -> (module, function)
+BATCH_ALGORITHMS = {
+    'bfs': ('search_algorithms.batched_bfs', 'batched_bfs'),
+    'value_iteration': ('mdp_algorithms.batched_value_iteration', 'batched_value_iteration'),
+}
+
+
+# Solve many mazes (pyamaze or compact mazes, any mix of sizes) with a batched algorithm
+# Mazes of the same size are stacked and solved together, at most batch_size at a time (all of them if None), and any
+# other options are passed on to the batched algorithm (e.g. threshold= for value iteration)
+# Returns a {'path': path from the start to the target (see maze_representations.compact_path.CompactPath, empty if
+# it was not reached), 'stats': counters} dictionary for each maze, in the order the mazes were given
+def solve_many(mazes, algorithm='bfs', batch_size=None, **options):
+    if algorithm not in BATCH_ALGORITHMS:
+        raise ValueError(f"Unknown batched algorithm {algorithm!r}, expected one of {tuple(BATCH_ALGORITHMS)}")
+    # Only import NumPy when a batched algorithm is actually used
+    from maze_representations.maze_batch import batches_by_size
+    module_name, function_name = BATCH_ALGORITHMS[algorithm]
+    function = getattr(importlib.import_module(module_name), function_name)
+    results = [None] * len(mazes)
+    for positions, maze_batch in batches_by_size(mazes, batch_size):
+        for position, (path, stats) in zip(positions, function(maze_batch, **options)):
+            results[position] = {'path': path, 'stats': stats}
+    return results
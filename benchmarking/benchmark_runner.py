@@ -0,0 +1,165 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import importlib
+import random
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from maze_representations.compact_maze import compile_maze
+
+# Algorithms that can be benchmarked: name -> (display name, module, function)
+# Workers import the function themselves, so only the algorithm name has to be sent to them
+ALGORITHMS = {
+    'a_star': ('A*', 'search_algorithms.a_star', 'a_star_algorithm'),
+    'bfs': ('BFS', 'search_algorithms.bfs', 'bfs_algorithm'),
+    'bidirectional_a_star': ('Bidirectional A*', 'search_algorithms.bidirectional_a_star',
+                             'bidirectional_a_star_algorithm'),
+    'bidirectional_bfs': ('Bidirectional BFS', 'search_algorithms.bidirectional_bfs', 'bidirectional_bfs_algorithm'),
+    'bitset_dfs': ('Bitset DFS', 'search_algorithms.memory_bounded_search', 'bitset_dfs_algorithm'),
+    'corridor_a_star': ('Corridor A*', 'search_algorithms.corridor_search', 'corridor_a_star_algorithm'),
+    'corridor_bfs': ('Corridor BFS', 'search_algorithms.corridor_search', 'corridor_bfs_algorithm'),
+    'dfs': ('DFS', 'search_algorithms.dfs', 'dfs_algorithm'),
+    'ida_star': ('IDA*', 'search_algorithms.memory_bounded_search', 'ida_star_algorithm'),
+    'modified_policy_iteration': ('Modified policy iteration', 'mdp_algorithms.modified_policy_iteration',
+                                  'modified_policy_iteration_algorithm'),
+    'paged_a_star': ('Paged A*', 'search_algorithms.memory_bounded_search', 'paged_a_star_algorithm'),
+    'policy_iteration': ('Policy iteration', 'mdp_algorithms.policy_iteration', 'policy_iteration_algorithm'),
+    'value_iteration': ('Value iteration', 'mdp_algorithms.value_iteration', 'value_iteration_algorithm'),
+    'wavefront_bfs': ('Wavefront BFS', 'search_algorithms.wavefront_bfs', 'wavefront_bfs_algorithm'),
+}
+
+# Algorithms that can write counters (nodes expanded, Bellman backups, sweeps, ...) into a report dictionary
+REPORTING_ALGORITHMS = ('a_star', 'bfs', 'bitset_dfs', 'dfs', 'ida_star', 'modified_policy_iteration', 'paged_a_star',
+                        'policy_iteration', 'value_iteration', 'wavefront_bfs')
+
+# Percentiles reported for time taken and memory used
+REPORTED_PERCENTILES = (5, 25, 75, 95)
+
+# Compact mazes available to the worker process (set once per worker instead of being sent with every job)
+worker_mazes = {}
+
+
+# Get the function that runs an algorithm from its name
+def algorithm_function(algorithm):
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {tuple(ALGORITHMS)}")
+    _, module_name, function_name = ALGORITHMS[algorithm]
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+# Give a worker process the mazes it will be running algorithms on
+def initialize_worker(compact_mazes):
+    worker_mazes.clear()
+    worker_mazes.update(compact_mazes)
+
+
+# Run a single (algorithm, maze, repetition) job, measuring peak memory and time taken in separate runs
+# Tracing allocations slows every allocation down (algorithms that allocate more would look slower than they are), so
+# the memory is measured in a traced run first and the time in an untraced run after it (which, like later
+# repetitions, finds what the algorithm caches on the maze already built)
+# With collect_stats, the counters the algorithm reports are returned as its stats (None if it does not report any)
+def run_benchmark_job(job):
+    algorithm, maze_key, repetition, seed, measure_memory, collect_stats = job
+    function = algorithm_function(algorithm)
+    report = {} if collect_stats and algorithm in REPORTING_ALGORITHMS else None
+    # Seed every run so runs with randomness (e.g. value iteration's initial policy) are reproducible
+    random_seed = f"{seed}-{algorithm}-{maze_key}-{repetition}"
+    peak_memory = None
+    if measure_memory:
+        random.seed(random_seed)
+        tracemalloc.start()
+        function(worker_mazes[maze_key])
+        # Peak memory allocated by the algorithm in MiB
+        peak_memory = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    random.seed(random_seed)
+    start_time = time.perf_counter()
+    result = function(worker_mazes[maze_key]) if report is None else function(worker_mazes[maze_key], report=report)
+    time_taken = time.perf_counter() - start_time
+    # Search algorithms return (search space, path), MDP algorithms only return the path
+    if isinstance(result, tuple):
+        maze_area_to_search, path_to_target = result
+        search_space = len(maze_area_to_search) + 1
+    else:
+        path_to_target = result
+        search_space = None
+    return {
+        'algorithm': algorithm,
+        'maze': maze_key,
+        'repetition': repetition,
+        'time_taken': time_taken,
+        'peak_memory': peak_memory,
+        'path_length': len(path_to_target),
+        'search_space': search_space,
+        'stats': report,
+    }
+
+
+# Run every algorithm on every maze a number of times, spread across a pool of worker processes
+# The mazes are a dictionary of key -> pyamaze maze or compact maze, workers=1 runs everything in this process
+# collect_stats asks the algorithms that can report counters for them (counting makes them slightly slower)
+def run_benchmarks(algorithms, mazes, repetitions, workers=None, measure_memory=True, seed=0, collect_stats=False):
+    for algorithm in algorithms:
+        algorithm_function(algorithm)
+    # Compile each maze once (pyamaze mazes hold Tk objects and cannot be sent to other processes)
+    compact_mazes = {maze_key: compile_maze(maze) for maze_key, maze in mazes.items()}
+    jobs = [(algorithm, maze_key, repetition, seed, measure_memory, collect_stats)
+            for maze_key in compact_mazes for algorithm in algorithms for repetition in range(repetitions)]
+    if workers == 1:
+        initialize_worker(compact_mazes)
+        results = [run_benchmark_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=initialize_worker,
+                                 initargs=(compact_mazes,)) as executor:
+            results = list(executor.map(run_benchmark_job, jobs))
+    return results, aggregate_results(results)
+
+
+# Summary statistics (mean, median, standard deviation and percentiles) of a list of measurements
+def summarize(measurements):
+    measurements = [measurement for measurement in measurements if measurement is not None]
+    if not measurements:
+        return None
+    summary = {
+        'mean': statistics.mean(measurements),
+        'median': statistics.median(measurements),
+        'stdev': statistics.stdev(measurements) if len(measurements) > 1 else 0.0,
+        'min': min(measurements),
+        'max': max(measurements),
+    }
+    # Percentiles need at least 2 measurements to interpolate between
+    percentiles = (statistics.quantiles(measurements, n=100, method='inclusive') if len(measurements) > 1
+                   else [measurements[0]] * 99)
+    for percentile in REPORTED_PERCENTILES:
+        summary[f'p{percentile}'] = percentiles[percentile - 1]
+    return summary
+
+
+# Aggregate job results into summary statistics for each (algorithm, maze) pair
+def aggregate_results(results):
+    grouped_results = {}
+    for result in results:
+        grouped_results.setdefault((result['algorithm'], result['maze']), []).append(result)
+    aggregated_results = []
+    for (algorithm, maze_key), group in grouped_results.items():
+        aggregated_results.append({
+            'algorithm': algorithm,
+            'maze': maze_key,
+            'repetitions': len(group),
+            'time_taken': summarize([result['time_taken'] for result in group]),
+            'peak_memory': summarize([result['peak_memory'] for result in group]),
+            'path_length': summarize([result['path_length'] for result in group]),
+            'search_space': summarize([result['search_space'] for result in group]),
+            'stats': summarize_stats([result['stats'] for result in group]),
+        })
+    return aggregated_results
+
+
+# Summary statistics of each counter in the stats of a group of runs (lists like the residuals are left out)
+def summarize_stats(stats):
+    stats = [run_stats for run_stats in stats if run_stats is not None]
+    if not stats:
+        return None
+    return {counter: summarize([run_stats[counter] for run_stats in stats])
+            for counter, value in stats[0].items() if isinstance(value, (int, float))}
@@ -0,0 +1,172 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+from datetime import datetime, timezone
+from benchmarking.benchmark_runner import summarize
+
+# Tables of a results store: one row per run of a command, and one row per (algorithm, maze, repetition) job of a run
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    command TEXT NOT NULL,
+    label TEXT,
+    version TEXT,
+    python_version TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    algorithm TEXT NOT NULL,
+    maze TEXT NOT NULL,
+    rows INTEGER,
+    cols INTEGER,
+    loop_percent INTEGER,
+    seed INTEGER,
+    generator TEXT,
+    repetition INTEGER NOT NULL,
+    time_taken REAL,
+    peak_memory REAL,
+    path_length INTEGER,
+    search_space INTEGER,
+    nodes_expanded INTEGER,
+    sweeps INTEGER,
+    backups INTEGER,
+    stats TEXT
+);
+CREATE INDEX IF NOT EXISTS results_by_algorithm_and_maze ON results (algorithm, maze, run_id);
+"""
+# Columns of the results table, in the order a result row is built in
+RESULT_COLUMNS = ('run_id', 'algorithm', 'maze', 'rows', 'cols', 'loop_percent', 'seed', 'generator', 'repetition',
+                  'time_taken', 'peak_memory', 'path_length', 'search_space', 'nodes_expanded', 'sweeps', 'backups',
+                  'stats')
+# Counters of an algorithm's stats kept in columns of their own (the whole stats are also kept as JSON)
+STATS_COLUMNS = ('nodes_expanded', 'sweeps', 'backups')
+# Measurements the history report summarizes for every run and compares between runs
+HISTORY_MEASUREMENTS = ('time_taken', 'peak_memory', 'path_length', 'nodes_expanded')
+# Measurements that count as a regression as soon as they grow at all (the others are allowed to grow by the
+# tolerance, since timings and memory use are noisy)
+EXACT_MEASUREMENTS = ('path_length', 'nodes_expanded')
+
+
+# Commit of the repository the solvers were run from (None outside a git checkout)
+def solver_version():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Results of solve, compare and bench kept in a SQLite database, so runs can be compared over time (e.g. to catch a
+# change that made a solver slower or its paths longer)
+# Every run is appended with all its jobs in one transaction, and reading the history only touches the results of the
+# algorithms and mazes asked for (through the index on algorithm and maze)
+class ResultsStore:
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    # Append the job results of one command (like benchmarking.benchmark_runner.run_benchmarks returns) as a new run
+    # Maze descriptions give the key, rows, cols, loop_percent, seed and generator of each result's maze
+    # Returns the ID of the new run
+    def record_run(self, command, results, maze_descriptions, label=None):
+        with self.connection:
+            run_id = self.connection.execute(
+                "INSERT INTO runs (created_at, command, label, version, python_version) VALUES (?, ?, ?, ?, ?)",
+                (datetime.now(timezone.utc).isoformat(timespec='seconds'), command, label, solver_version(),
+                 platform.python_version())).lastrowid
+            self.connection.executemany(
+                f"INSERT INTO results ({', '.join(RESULT_COLUMNS)}) VALUES ({', '.join('?' * len(RESULT_COLUMNS))})",
+                (result_row(run_id, result, maze_descriptions[result['maze']]) for result in results))
+        return run_id
+
+    # Summary of every run of each (algorithm, maze) pair, oldest run first
+    # Only the given algorithms and mazes (maze keys) are read if they are given, and only the last runs if last_runs
+    # is given
+    def history(self, algorithms=None, mazes=None, last_runs=None):
+        conditions = []
+        parameters = []
+        for column, values in (('algorithm', algorithms), ('maze', mazes)):
+            if values:
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                parameters.extend(values)
+        if last_runs is not None:
+            conditions.append("run_id IN (SELECT run_id FROM runs ORDER BY run_id DESC LIMIT ?)")
+            parameters.append(last_runs)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        runs = {row[0]: row for row in self.connection.execute(
+            "SELECT run_id, created_at, command, label, version FROM runs")}
+        measurements_of_runs = {}
+        for row in self.connection.execute(f"SELECT algorithm, maze, run_id, {', '.join(HISTORY_MEASUREMENTS)} "
+                                           f"FROM results {where} ORDER BY algorithm, maze, run_id", parameters):
+            algorithm, maze, run_id = row[:3]
+            measurements_of_runs.setdefault((algorithm, maze), {}).setdefault(run_id, []).append(row[3:])
+        history = []
+        for (algorithm, maze), measurements_of_run in measurements_of_runs.items():
+            run_summaries = []
+            for run_id, measurements in measurements_of_run.items():
+                _, created_at, command, label, version = runs[run_id]
+                run_summary = {'run_id': run_id, 'created_at': created_at, 'command': command, 'label': label,
+                               'version': version, 'repetitions': len(measurements)}
+                for index, measurement in enumerate(HISTORY_MEASUREMENTS):
+                    run_summary[measurement] = summarize([job[index] for job in measurements])
+                run_summaries.append(run_summary)
+            history.append({'algorithm': algorithm, 'maze': maze, 'runs': run_summaries})
+        return history
+
+
+# Row of the results table for one job result of a run
+# Mazes loaded from a file have no key, so they are kept under the file's path
+def result_row(run_id, result, maze_description):
+    stats = result.get('stats') or {}
+    maze = maze_description['key'] or maze_description['maze_file']
+    return (run_id, result['algorithm'], maze, maze_description['rows'], maze_description['cols'],
+            maze_description['loop_percent'], maze_description['seed'], maze_description['generator'],
+            result.get('repetition', 0), result['time_taken'], result.get('peak_memory'), result['path_length'],
+            result.get('search_space'), *(stats.get(counter) for counter in STATS_COLUMNS),
+            json.dumps(stats) if stats else None)
+
+
+# Compare the median of each measurement of every run with the run before it (of the same algorithm and maze)
+# Runs are only compared with runs of the same command, since solve, compare and bench measure differently (e.g. solve
+# times a single run on a fresh maze, compare and bench time runs after the one tracing memory)
+# A measurement regressed if it grew by more than the tolerance (a fraction, e.g. 0.2 for 20%), or at all for the
+# exact measurements
+# Returns a list of the regressions found in a history (see ResultsStore.history)
+def find_regressions(history, tolerance=0.2):
+    regressions = []
+    for entry in history:
+        # Latest run of each command so far
+        previous_runs = {}
+        for run in entry['runs']:
+            previous_run = previous_runs.get(run['command'])
+            previous_runs[run['command']] = run
+            if previous_run is None:
+                continue
+            for measurement in HISTORY_MEASUREMENTS:
+                if previous_run[measurement] is None or run[measurement] is None:
+                    continue
+                previous_median = previous_run[measurement]['median']
+                median = run[measurement]['median']
+                allowed_growth = 0 if measurement in EXACT_MEASUREMENTS else tolerance
+                if median > previous_median * (1 + allowed_growth):
+                    regressions.append({'algorithm': entry['algorithm'], 'maze': entry['maze'],
+                                        'measurement': measurement, 'previous_run_id': previous_run['run_id'],
+                                        'run_id': run['run_id'], 'previous_median': previous_median,
+                                        'median': median,
+                                        'change': median / previous_median - 1 if previous_median else None})
+    return regressions
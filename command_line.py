@@ -0,0 +1,404 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from benchmarking.batch_solver import BATCH_ALGORITHMS, solve_many
+from benchmarking.benchmark_runner import ALGORITHMS, REPORTING_ALGORITHMS, algorithm_function, run_benchmarks
+from benchmarking.results_store import ResultsStore, find_regressions
+from maze_representations.compact_maze import compile_maze, load_pyamaze_csv, save_pyamaze_csv
+from maze_representations.maze_corpus import MAZE_GENERATORS, MazeCorpus, generate_compact_maze, \
+    generate_pyamaze_maze, maze_key
+from maze_representations.maze_generator import DEFAULT_MAZE_GENERATION_ALGORITHM
+from mdp_algorithms.policy_iteration import POLICY_ITERATION_STOPPING_RULES
+from mdp_algorithms.stopping_rules import STOPPING_RULES
+from search_algorithms.a_star import a_star_search_events
+from search_algorithms.bfs import bfs_search_events
+from search_algorithms.dfs import dfs_search_events
+from search_algorithms.memory_bounded_search import bitset_dfs_search_events, ida_star_search_events, \
+    paged_a_star_search_events
+from search_algorithms.utility_functions import EXPLORED_EVENT, PATH_EVENT
+
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+# Colours of the agents showing each algorithm's path when the GUI is asked for
+AGENT_COLOURS = {'a_star': 'blue', 'bfs': 'yellow', 'bidirectional_a_star': 'cyan', 'bidirectional_bfs': 'black',
+                 'bitset_dfs': 'red', 'corridor_a_star': 'pink', 'corridor_bfs': 'light', 'dfs': 'red',
+                 'ida_star': 'blue', 'modified_policy_iteration': 'green', 'paged_a_star': 'blue',
+                 'policy_iteration': 'green', 'value_iteration': 'dark', 'wavefront_bfs': 'yellow'}
+# Algorithms that take a stopping rule and budgets
+MDP_ALGORITHMS = ('modified_policy_iteration', 'policy_iteration', 'value_iteration')
+# Algorithms that take a memory limit (see search_algorithms.memory_bounded_search)
+MEMORY_BOUNDED_ALGORITHMS = ('bitset_dfs', 'ida_star', 'paged_a_star')
+# Algorithms compare and bench run when none are chosen (IDA* is left out, it takes exponential time on large mazes
+# with loops)
+DEFAULT_ALGORITHMS = [algorithm for algorithm in ALGORITHMS if algorithm != 'ida_star']
+# Algorithms that can stream their search space to the GUI while they run: name -> function yielding search events
+SEARCH_EVENT_FUNCTIONS = {'a_star': a_star_search_events, 'bfs': bfs_search_events,
+                          'bitset_dfs': bitset_dfs_search_events, 'dfs': dfs_search_events,
+                          'ida_star': ida_star_search_events, 'paged_a_star': paged_a_star_search_events}
+
+
+# Parse a maze size written as ROWSxCOLUMNS (e.g. 20x30)
+def maze_size(size):
+    try:
+        rows, columns = (int(dimension) for dimension in size.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{size!r} is not a maze size like 20x30")
+    if rows <= 0 or columns <= 0:
+        raise argparse.ArgumentTypeError(f"{size!r} must have a positive number of rows and columns")
+    return rows, columns
+
+
+# Parse a number that has to be above 0
+def positive_integer(value):
+    if not value.isdigit() or int(value) <= 0:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a positive whole number")
+    return int(value)
+
+
+# Build the parser of the solve, compare, bench, solve-many and history commands
+def build_parser():
+    parser = argparse.ArgumentParser(prog='main.py', description="Solve mazes with search and MDP algorithms. "
+                                                                 "Run without a command for the interactive menus.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    # Options describing the maze every command runs on
+    maze_options = argparse.ArgumentParser(add_help=False)
+    maze_options.add_argument('--size', type=maze_size, default=(10, 10), help="maze size as ROWSxCOLUMNS")
+    maze_options.add_argument('--loop-percent', type=int, default=50, help="pyamaze loopPercent (0 = perfect maze)")
+    maze_options.add_argument('--seed', type=int, default=0, help="seed for maze generation and the algorithms")
+    maze_options.add_argument('--generator', choices=MAZE_GENERATORS, default=DEFAULT_MAZE_GENERATION_ALGORITHM,
+                              help="maze generation algorithm (pyamaze needs Tkinter and a display)")
+    maze_options.add_argument('--maze-file', help="solve a maze saved by pyamaze (CSV) instead of generating one")
+    maze_options.add_argument('--corpus', help="directory to cache generated mazes in (and load them from)")
+    maze_options.add_argument('--output', help="write the JSON results to this file instead of standard output")
+    maze_options.add_argument('--stats', action='store_true',
+                              help="include the algorithms' counters (nodes expanded, Bellman backups, sweeps, ...)")
+    maze_options.add_argument('--store', help="also append the results to this SQLite results store (see history)")
+    maze_options.add_argument('--label', help="label of the run in the results store (e.g. the change being tested)")
+
+    solve = commands.add_parser('solve', parents=[maze_options], help="run one algorithm once")
+    solve.add_argument('--algorithm', choices=ALGORITHMS, required=True)
+    solve.add_argument('--include-path', action='store_true', help="include the path squares in the results")
+    solve.add_argument('--stopping-rule', choices=STOPPING_RULES,
+                       help="when the MDP algorithm stops (policy iteration: policy_stable or path_stable)")
+    solve.add_argument('--max-iterations', type=positive_integer,
+                       help="most sweeps (value iteration) or improvement rounds (policy iteration) to run")
+    solve.add_argument('--time-budget', type=float, help="seconds the MDP algorithm may run before stopping")
+    solve.add_argument('--evaluation-sweeps', type=positive_integer,
+                       help="evaluation sweeps per improvement round of modified policy iteration (default 5)")
+    solve.add_argument('--memory-limit', type=float, metavar='MIB',
+                       help="most memory (in MiB) a memory-bounded search may allocate before giving up")
+    solve.add_argument('--gui', action='store_true', help="show the search space and path in a pyamaze window")
+    solve.add_argument('--buffered', action='store_true',
+                       help="show the search space found by the timed run instead of streaming it from a new search")
+
+    compare = commands.add_parser('compare', parents=[maze_options], help="compare algorithms on one maze")
+    compare.add_argument('--algorithms', nargs='+', choices=ALGORITHMS, default=DEFAULT_ALGORITHMS)
+    compare.add_argument('--iterations', type=positive_integer, default=1, help="runs of each algorithm")
+    compare.add_argument('--workers', type=positive_integer, help="worker processes (default: one per CPU)")
+    compare.add_argument('--gui', action='store_true', help="show each algorithm's path in a pyamaze window")
+
+    bench = commands.add_parser('bench', help="benchmark algorithms over many maze sizes and seeds")
+    bench.add_argument('--algorithms', nargs='+', choices=ALGORITHMS, default=DEFAULT_ALGORITHMS)
+    bench.add_argument('--sizes', nargs='+', type=maze_size, default=[(10, 10)], help="sizes as ROWSxCOLUMNS")
+    bench.add_argument('--seeds', nargs='+', type=int, default=[0], help="one maze is generated per size and seed")
+    bench.add_argument('--loop-percent', type=int, default=50, help="pyamaze loopPercent (0 = perfect maze)")
+    bench.add_argument('--generator', choices=MAZE_GENERATORS, default=DEFAULT_MAZE_GENERATION_ALGORITHM,
+                       help="maze generation algorithm (pyamaze needs Tkinter and a display)")
+    bench.add_argument('--iterations', type=positive_integer, default=1, help="runs of each algorithm per maze")
+    bench.add_argument('--workers', type=positive_integer, help="worker processes (default: one per CPU)")
+    bench.add_argument('--corpus', help="directory to cache generated mazes in (and load them from)")
+    bench.add_argument('--output', help="write the JSON results to this file instead of standard output")
+    bench.add_argument('--stats', action='store_true',
+                       help="include the algorithms' counters (nodes expanded, Bellman backups, sweeps, ...)")
+    bench.add_argument('--store', help="also append the results to this SQLite results store (see history)")
+    bench.add_argument('--label', help="label of the run in the results store (e.g. the change being tested)")
+
+    solve_many_command = commands.add_parser('solve-many', help="solve many mazes of one size at once with a batched "
+                                                                "algorithm")
+    solve_many_command.add_argument('--algorithm', choices=BATCH_ALGORITHMS, default='bfs')
+    solve_many_command.add_argument('--size', type=maze_size, default=(20, 20), help="maze size as ROWSxCOLUMNS")
+    solve_many_command.add_argument('--count', type=positive_integer, default=100,
+                                    help="number of mazes, generated with the seeds counting up from --seed")
+    solve_many_command.add_argument('--seed', type=int, default=0, help="seed of the first maze and the algorithm")
+    solve_many_command.add_argument('--loop-percent', type=int, default=50,
+                                    help="pyamaze loopPercent (0 = perfect maze)")
+    solve_many_command.add_argument('--generator', choices=MAZE_GENERATORS, default=DEFAULT_MAZE_GENERATION_ALGORITHM,
+                                    help="maze generation algorithm (pyamaze needs Tkinter and a display)")
+    solve_many_command.add_argument('--batch-size', type=positive_integer,
+                                    help="most mazes solved at once (default: all of them)")
+    solve_many_command.add_argument('--corpus', help="directory to cache generated mazes in (and load them from)")
+    solve_many_command.add_argument('--output', help="write the JSON results to this file instead of standard output")
+    solve_many_command.add_argument('--include-path', action='store_true',
+                                    help="include the path squares in the results")
+    solve_many_command.add_argument('--stats', action='store_true',
+                                    help="include the algorithm's counters (nodes expanded, sweeps, ...)")
+
+    history = commands.add_parser('history', help="compare the runs kept in a results store over time")
+    history.add_argument('--store', required=True, help="SQLite results store written by solve, compare or bench")
+    history.add_argument('--algorithms', nargs='+', help="only show these algorithms")
+    history.add_argument('--mazes', nargs='+', help="only show these mazes (keys like 10x10-loop50-seed0-kruskal)")
+    history.add_argument('--last', type=positive_integer, help="only show the last runs")
+    history.add_argument('--tolerance', type=float, default=0.2,
+                         help="fraction time and memory may grow by between runs before it counts as a regression")
+    history.add_argument('--fail-on-regression', action='store_true',
+                         help="exit with status 1 if any regression is found")
+    history.add_argument('--output', help="write the JSON results to this file instead of standard output")
+    return parser
+
+
+# Load a maze into a pyamaze maze so it can be shown in a window
+def pyamaze_maze_from_file(maze_file):
+    # Only import pyamaze (and so Tkinter) when a maze has to be shown
+    from pyamaze import maze
+    pyamaze_maze = maze()
+    pyamaze_maze.CreateMaze(loadMaze=maze_file)
+    return pyamaze_maze
+
+
+# Show a compact maze (e.g. one from the corpus) in a pyamaze window
+def pyamaze_maze_from_compact_maze(compact_maze):
+    maze_file_descriptor, maze_file = tempfile.mkstemp(suffix='.csv')
+    os.close(maze_file_descriptor)
+    try:
+        save_pyamaze_csv(compact_maze, maze_file)
+        return pyamaze_maze_from_file(maze_file)
+    finally:
+        os.remove(maze_file)
+
+
+# Get the maze of a solve/compare command as (pyamaze maze if it is needed for the GUI, compact maze)
+def maze_from_arguments(arguments):
+    if arguments.maze_file:
+        pyamaze_maze = pyamaze_maze_from_file(arguments.maze_file) if arguments.gui else None
+        return pyamaze_maze, load_pyamaze_csv(arguments.maze_file)
+    if arguments.corpus:
+        compact_maze = MazeCorpus(arguments.corpus, arguments.generator).get(*arguments.size, arguments.loop_percent,
+                                                                             arguments.seed)
+    elif arguments.generator == 'pyamaze':
+        pyamaze_maze = generate_pyamaze_maze(*arguments.size, arguments.loop_percent, arguments.seed)
+        return pyamaze_maze, compile_maze(pyamaze_maze)
+    else:
+        compact_maze = generate_compact_maze(*arguments.size, arguments.loop_percent, arguments.seed,
+                                             arguments.generator)
+    # Only pyamaze mazes can be shown, so the GUI loads the compact maze into one
+    pyamaze_maze = pyamaze_maze_from_compact_maze(compact_maze) if arguments.gui else None
+    return pyamaze_maze, compact_maze
+
+
+# Describe the maze a command ran on in the results
+def maze_description(arguments, compact_maze):
+    key = None if arguments.maze_file else maze_key(*arguments.size, arguments.loop_percent, arguments.seed,
+                                                    arguments.generator)
+    return {'key': key, 'rows': compact_maze.rows, 'cols': compact_maze.cols, 'loop_percent': arguments.loop_percent,
+            'seed': arguments.seed, 'generator': None if arguments.maze_file else arguments.generator,
+            'maze_file': arguments.maze_file}
+
+
+# Show the search space of a search in a pyamaze window as its events arrive, then trace the path it found
+# Each event is only taken from the search when it is shown, so the search runs along with the window
+def stream_search(pyamaze_maze, search_events, path_agent, delay=75):
+    from pyamaze import agent, COLOR
+    search_space = agent(pyamaze_maze, footprints=True, shape='square', color=COLOR.yellow)
+
+    # Move the search space agent to the next explored square (or start tracing the path once the search is over)
+    def show_next_event():
+        for event, value in search_events:
+            if event == EXPLORED_EVENT:
+                search_space.position = value
+                pyamaze_maze._win.after(delay, show_next_event)
+                return
+            if event == PATH_EVENT:
+                pyamaze_maze.tracePath({path_agent: value.trace_path()}, delay=delay)
+                return
+    show_next_event()
+
+
+# Show the paths (and the search space when there is only one algorithm) in a pyamaze window
+# The search space is streamed from search_events when they are given, otherwise the buffered one is traced
+def show_paths(pyamaze_maze, paths, search_events=None):
+    from pyamaze import agent, COLOR
+    for algorithm, (maze_area_to_search, path_to_target) in paths.items():
+        if len(paths) == 1 and search_events is not None:
+            path = agent(pyamaze_maze, footprints=True, color=COLOR[AGENT_COLOURS[algorithm]])
+            stream_search(pyamaze_maze, search_events, path)
+            continue
+        if len(paths) == 1 and maze_area_to_search is not None:
+            search_space = agent(pyamaze_maze, footprints=True, shape='square', color=COLOR.yellow)
+            pyamaze_maze.tracePath({search_space: maze_area_to_search}, showMarked=True, delay=75)
+        path = agent(pyamaze_maze, footprints=True, color=COLOR[AGENT_COLOURS[algorithm]])
+        pyamaze_maze.tracePath({path: path_to_target.trace_path()}, delay=75)
+    pyamaze_maze.run()
+
+
+# Squares of a path in order from the start to the target (as JSON lists)
+def path_squares(path_to_target):
+    return [list(square) for square in path_to_target]
+
+
+# Run one algorithm once on one maze
+def solve_command(arguments):
+    pyamaze_maze, compact_maze = maze_from_arguments(arguments)
+    random.seed(arguments.seed)
+    function = algorithm_function(arguments.algorithm)
+    report = {} if arguments.stats and arguments.algorithm in REPORTING_ALGORITHMS else None
+    options = {} if report is None else {'report': report}
+    # Stopping rules and budgets only apply to the MDP algorithms
+    for option in ('stopping_rule', 'max_iterations', 'time_budget'):
+        if getattr(arguments, option) is not None:
+            if arguments.algorithm not in MDP_ALGORITHMS:
+                raise SystemExit(f"--{option.replace('_', '-')} only applies to {', '.join(MDP_ALGORITHMS)}")
+            options[option] = getattr(arguments, option)
+    # (Modified) policy iteration stops between improvement rounds, so only the rules about the policy apply to it
+    if (arguments.stopping_rule is not None and arguments.algorithm != 'value_iteration'
+            and arguments.stopping_rule not in POLICY_ITERATION_STOPPING_RULES):
+        raise SystemExit(f"--stopping-rule {arguments.stopping_rule} only applies to value_iteration "
+                         f"({arguments.algorithm} takes {', '.join(POLICY_ITERATION_STOPPING_RULES)})")
+    if arguments.evaluation_sweeps is not None:
+        if arguments.algorithm != 'modified_policy_iteration':
+            raise SystemExit("--evaluation-sweeps only applies to modified_policy_iteration")
+        options['evaluation_sweeps'] = arguments.evaluation_sweeps
+    if arguments.memory_limit is not None:
+        if arguments.algorithm not in MEMORY_BOUNDED_ALGORITHMS:
+            raise SystemExit(f"--memory-limit only applies to {', '.join(MEMORY_BOUNDED_ALGORITHMS)}")
+        options['memory_limit'] = int(arguments.memory_limit * 2 ** 20)
+    start_time = time.perf_counter()
+    try:
+        result = function(compact_maze, **options)
+    except MemoryError as error:
+        raise SystemExit(str(error))
+    time_taken = time.perf_counter() - start_time
+    # Search algorithms return (search space, path), MDP algorithms only return the path
+    maze_area_to_search, path_to_target = result if isinstance(result, tuple) else (None, result)
+    results = {
+        'command': 'solve',
+        'algorithm': arguments.algorithm,
+        'maze': maze_description(arguments, compact_maze),
+        'time_taken': time_taken,
+        'path_length': len(path_to_target),
+        'search_space': None if maze_area_to_search is None else len(maze_area_to_search) + 1,
+    }
+    if arguments.stats:
+        results['stats'] = report
+    if arguments.include_path:
+        results['path'] = path_squares(path_to_target)
+    write_results(results, arguments.output)
+    # Peak memory is only measured by compare and bench (tracing allocations would slow the timed run down)
+    store_results(arguments, 'solve', [{'algorithm': arguments.algorithm, 'maze': 'maze', 'repetition': 0,
+                                        'time_taken': time_taken, 'path_length': results['path_length'],
+                                        'search_space': results['search_space'], 'stats': report}],
+                  {'maze': results['maze']})
+    if arguments.gui:
+        # Stream the search space from a new search unless the buffered one is asked for
+        search_events = None
+        if not arguments.buffered and arguments.algorithm in SEARCH_EVENT_FUNCTIONS:
+            search_events = SEARCH_EVENT_FUNCTIONS[arguments.algorithm](compact_maze, frontier_events=False)
+        show_paths(pyamaze_maze, {arguments.algorithm: (maze_area_to_search, path_to_target)}, search_events)
+
+
+# Compare algorithms on one maze using the benchmark runner
+def compare_command(arguments):
+    pyamaze_maze, compact_maze = maze_from_arguments(arguments)
+    results, aggregated_results = run_benchmarks(arguments.algorithms, {'maze': compact_maze}, arguments.iterations,
+                                                 workers=arguments.workers, seed=arguments.seed,
+                                                 collect_stats=arguments.stats)
+    description = maze_description(arguments, compact_maze)
+    write_results({'command': 'compare', 'maze': description, 'iterations': arguments.iterations,
+                   'results': aggregated_results}, arguments.output)
+    store_results(arguments, 'compare', results, {'maze': description})
+    if arguments.gui:
+        paths = {}
+        for algorithm in arguments.algorithms:
+            result = algorithm_function(algorithm)(compact_maze)
+            paths[algorithm] = result if isinstance(result, tuple) else (None, result)
+        show_paths(pyamaze_maze, paths)
+
+
+# Benchmark algorithms over every combination of maze size and seed
+def bench_command(arguments):
+    corpus = MazeCorpus(arguments.corpus, arguments.generator) if arguments.corpus else None
+    mazes = {}
+    descriptions = {}
+    for rows, columns in arguments.sizes:
+        for seed in arguments.seeds:
+            if corpus:
+                maze = corpus.get(rows, columns, arguments.loop_percent, seed)
+            else:
+                maze = generate_compact_maze(rows, columns, arguments.loop_percent, seed, arguments.generator)
+            key = maze_key(rows, columns, arguments.loop_percent, seed, arguments.generator)
+            mazes[key] = maze
+            descriptions[key] = {'key': key, 'rows': rows, 'cols': columns, 'loop_percent': arguments.loop_percent,
+                                 'seed': seed, 'generator': arguments.generator, 'maze_file': None}
+    results, aggregated_results = run_benchmarks(arguments.algorithms, mazes, arguments.iterations,
+                                                 workers=arguments.workers, collect_stats=arguments.stats)
+    write_results({'command': 'bench', 'iterations': arguments.iterations, 'results': results,
+                   'aggregated_results': aggregated_results}, arguments.output)
+    store_results(arguments, 'bench', results, descriptions)
+
+
+# Solve many mazes of one size with a batched algorithm (only the batched solve is timed, not generating the mazes)
+def solve_many_command(arguments):
+    corpus = MazeCorpus(arguments.corpus, arguments.generator) if arguments.corpus else None
+    seeds = range(arguments.seed, arguments.seed + arguments.count)
+    mazes = [corpus.get(*arguments.size, arguments.loop_percent, seed) if corpus else
+             generate_compact_maze(*arguments.size, arguments.loop_percent, seed, arguments.generator)
+             for seed in seeds]
+    random.seed(arguments.seed)
+    start_time = time.perf_counter()
+    maze_results = solve_many(mazes, arguments.algorithm, arguments.batch_size)
+    time_taken = time.perf_counter() - start_time
+    results = []
+    for seed, maze_result in zip(seeds, maze_results):
+        path = maze_result['path']
+        result = {'maze': maze_key(*arguments.size, arguments.loop_percent, seed, arguments.generator),
+                  'path_length': len(path)}
+        if arguments.stats:
+            result['stats'] = maze_result['stats']
+        if arguments.include_path:
+            result['path'] = path_squares(path)
+        results.append(result)
+    write_results({'command': 'solve-many', 'algorithm': arguments.algorithm, 'rows': arguments.size[0],
+                   'cols': arguments.size[1], 'count': arguments.count, 'time_taken': time_taken,
+                   'mazes_per_second': arguments.count / time_taken, 'results': results}, arguments.output)
+
+
+# Append the job results of a command to the results store given with --store (if one is given)
+def store_results(arguments, command, results, maze_descriptions):
+    if arguments.store:
+        with ResultsStore(arguments.store) as store:
+            store.record_run(command, results, maze_descriptions, arguments.label)
+
+
+# Show how each algorithm did on each maze in every run kept in a results store, and the regressions between runs
+def history_command(arguments):
+    if not os.path.exists(arguments.store):
+        raise SystemExit(f"No results store at {arguments.store}")
+    with ResultsStore(arguments.store) as store:
+        history = store.history(arguments.algorithms, arguments.mazes, arguments.last)
+    regressions = find_regressions(history, arguments.tolerance)
+    write_results({'command': 'history', 'store': arguments.store, 'tolerance': arguments.tolerance,
+                   'results': history, 'regressions': regressions}, arguments.output)
+    if arguments.fail_on_regression and regressions:
+        raise SystemExit(1)
+
+
+# Write results as JSON to a file, or to standard output if no file is given
+def write_results(results, output):
+    if output:
+        with open(output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+
+# Run a command given on the command line (e.g. ['solve', '--algorithm', 'a_star', '--size', '20x20'])
+def run_command_line(argv):
+    arguments = build_parser().parse_args(argv)
+    commands = {'solve': solve_command, 'compare': compare_command, 'bench': bench_command,
+                'solve-many': solve_many_command, 'history': history_command}
+    commands[arguments.command](arguments)
@@ -1,33 +1,34 @@
-import statistics
 import sys
-from timeit import timeit
-from memory_profiler import memory_usage
-from pyamaze import maze, agent, textLabel, COLOR
+from pyamaze import agent, textLabel, COLOR
 from pyfiglet import figlet_format
 import inquirer
-from search_algorithms.a_star import a_star_algorithm
-from search_algorithms.bfs import bfs_algorithm
-from search_algorithms.dfs import dfs_algorithm
-from mdp_algorithms.policy_iteration import policy_iteration_algorithm
-from mdp_algorithms.value_iteration import value_iteration_algorithm
+from benchmarking.benchmark_runner import ALGORITHMS, algorithm_function, run_benchmarks
+from command_line import SEARCH_EVENT_FUNCTIONS, pyamaze_maze_from_compact_maze, run_command_line, stream_search
+from maze_representations.maze_generator import generate_maze
 
 # Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
 
-# Print welcome banner!
-print(figlet_format("Welcome to Prathamesh's Maze Solver for CS7IS2!", justify='center', width=140))
+# Names of the algorithms in the menus and their names in the benchmark runner
+# IDA* is left out: the menus run on mazes with loops, where it takes exponential time (seconds at 60x60 and over a
+# minute at 100x100), so it is only available from the command line
+MENU_ALGORITHMS = {"A*": 'a_star', "Breadth-first search": 'bfs', "Depth-first search": 'dfs',
+                   "Bidirectional A*": 'bidirectional_a_star',
+                   "Bidirectional breadth-first search": 'bidirectional_bfs',
+                   "Corridor A*": 'corridor_a_star', "Corridor breadth-first search": 'corridor_bfs',
+                   "Policy iteration": 'policy_iteration', "Modified policy iteration": 'modified_policy_iteration',
+                   "Value iteration": 'value_iteration', "Wavefront breadth-first search": 'wavefront_bfs',
+                   "Paged A*": 'paged_a_star', "Bitset depth-first search": 'bitset_dfs'}
+
+
+# Add a label to the maze window
+def add_label(maze, title, value, font_size):
+    label = textLabel(maze, title, value)
+    label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', font_size), relief="raised")
+    label.lab.pack_configure(expand=False, anchor='s')
 
-# Either run an individual algorithm or compare multiple algorithms
-answer = inquirer.prompt([inquirer.List("wish", message="I want to", choices=["Run an individual algorithm",
-                                                                              "Compare multiple algorithms", "Exit"]
-                                        )])
 
-# Run an individual algorithm
-if answer["wish"] == "Run an individual algorithm":
-    # 5 algorithm options
-    answer = inquirer.prompt([inquirer.List("algorithm", message="I want to run the individual algorithm",
-                                            choices=["A*", "Breadth-first search", "Depth-first search",
-                                                     "Policy iteration", "Value iteration"]
-                                            )])
+# Ask for the size of the maze and the number of iterations to run each algorithm for
+def ask_for_maze_and_iterations(iterations_message):
     # Number of columns in the maze
     maze_columns = inquirer.prompt([inquirer.Text("number of columns for the maze",
                                                   message="How many columns do you want in the maze?",
@@ -38,521 +39,236 @@ if answer["wish"] == "Run an individual algorithm":
                                                message="How many rows do you want in the maze?",
                                                validate=lambda _, c: c.isdigit() and int(c) > 0
                                                )])
-
     # Number of iterations for measuring time taken
-    iterations = inquirer.prompt([inquirer.Text("iterations",
-                                                message="How many iterations do you want to run the algorithm for?",
+    iterations = inquirer.prompt([inquirer.Text("iterations", message=iterations_message,
                                                 validate=lambda _, c: c.isdigit() and int(c) > 0
                                                 )])
+    return (int(maze_rows["number of rows for the maze"]), int(maze_columns["number of columns for the maze"]),
+            int(iterations["iterations"]))
+
+
+# Benchmark algorithms on the maze (across worker processes, measuring memory and time in separate runs)
+# Prints the averages and returns the summary of each algorithm along with its search space and path
+def benchmark_algorithms(algorithms, compact_maze, iterations):
+    _, aggregated_results = run_benchmarks(algorithms, {'maze': compact_maze}, iterations)
+    summaries = {}
+    for summary in aggregated_results:
+        name = ALGORITHMS[summary['algorithm']][0]
+        print(f"Average {name} maximum memory usage: {summary['peak_memory']['mean']} MiB")
+        print(f"Average {name} path length: {summary['path_length']['mean']}")
+        # MDP algorithms do not have a search space
+        if summary['search_space'] is not None:
+            print(f"Average {name} search space: {summary['search_space']['mean']}")
+        print(f"Average {name} time taken: {summary['time_taken']['mean']} seconds")
+        # Run the algorithm once more to get its search space and path to show in the maze
+        result = algorithm_function(summary['algorithm'])(compact_maze)
+        maze_area_to_search, path_to_target = result if isinstance(result, tuple) else (None, result)
+        summaries[summary['algorithm']] = (summary, maze_area_to_search, path_to_target)
+    return summaries
 
-    # Create the maze
-    maze = maze(int(maze_rows["number of rows for the maze"]), int(maze_columns["number of columns for the maze"]))
-    maze.CreateMaze(loopPercent=50)
+
+# Run an individual algorithm
+def run_individual_algorithm():
+    # 5 algorithm options
+    answer = inquirer.prompt([inquirer.List("algorithm", message="I want to run the individual algorithm",
+                                            choices=list(MENU_ALGORITHMS)
+                                            )])
+    rows, columns, iterations = ask_for_maze_and_iterations(
+        "How many iterations do you want to run the algorithm for?")
+
+    # Create the maze with the built-in generator (every algorithm run shares its compact representation)
+    compact_maze = generate_maze(rows, columns, loop_percent=50)
+    # Load it into a pyamaze maze to show it
+    maze_to_solve = pyamaze_maze_from_compact_maze(compact_maze)
 
     # Calculate the search space and path after running the chosen algorithm while also tracking time and memory used
-    memory_from_iterations = []
-    search_space_from_iterations = []
-    path_length_from_iterations = []
-
-    average_memory = None
-    average_search_space = None
-    average_path_length = None
-    maze_area_to_search = None
-    path_to_target = None
-    memory = None
-    time_taken = None
-
-    if answer["algorithm"] == "A*":
-        for _ in range (int(iterations["iterations"])):
-            memory, (maze_area_to_search, path_to_target) = memory_usage((a_star_algorithm, (maze,), {}),
-                                                                         retval=True)
-            memory_from_iterations.append(max(memory))
-            search_space_from_iterations.append(len(maze_area_to_search) + 1)
-            path_length_from_iterations.append(len(path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_search_space = statistics.mean(search_space_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        time_taken = timeit(stmt='a_star_algorithm(maze)', number=int(iterations["iterations"]),
-                            globals=globals())
-
-    elif answer["algorithm"] == "Breadth-first search":
-        for _ in range (int(iterations["iterations"])):
-            memory, (maze_area_to_search, path_to_target) = memory_usage((bfs_algorithm, (maze,), {}),
-                                                                         retval=True)
-            memory_from_iterations.append(max(memory))
-            search_space_from_iterations.append(len(maze_area_to_search) + 1)
-            path_length_from_iterations.append(len(path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_search_space = statistics.mean(search_space_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        time_taken = timeit(stmt='bfs_algorithm(maze)', number=int(iterations["iterations"]),
-                            globals=globals())
-
-    elif answer["algorithm"] == "Depth-first search":
-        for _ in range (int(iterations["iterations"])):
-            memory, (maze_area_to_search, path_to_target) = memory_usage((dfs_algorithm, (maze,), {}),
-                                                                         retval=True)
-            memory_from_iterations.append(max(memory))
-            search_space_from_iterations.append(len(maze_area_to_search) + 1)
-            path_length_from_iterations.append(len(path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_search_space = statistics.mean(search_space_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        time_taken = timeit(stmt='dfs_algorithm(maze)', number=int(iterations["iterations"]),
-                            globals=globals())
-
-    elif answer["algorithm"] == "Policy iteration":
-        for _ in range (int(iterations["iterations"])):
-            memory, path_to_target = memory_usage((policy_iteration_algorithm, (maze,), {}),
-                                                  retval=True)
-            memory_from_iterations.append(max(memory))
-            path_length_from_iterations.append(len(path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        time_taken = timeit(stmt='policy_iteration_algorithm(maze)',
-                            number=int(iterations["iterations"]),
-                            globals=globals())
-
-    elif answer["algorithm"] == "Value iteration":
-        for _ in range (int(iterations["iterations"])):
-            memory, path_to_target = memory_usage((value_iteration_algorithm, (maze,), {}),
-                                                  retval=True)
-            memory_from_iterations.append(max(memory))
-            path_length_from_iterations.append(len(path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        time_taken = timeit(stmt='value_iteration_algorithm(maze)',
-                            number=int(iterations["iterations"]),
-                            globals=globals())
+    algorithm = MENU_ALGORITHMS[answer["algorithm"]]
+    summary, maze_area_to_search, path_to_target = benchmark_algorithms([algorithm], compact_maze,
+                                                                        iterations)[algorithm]
 
     # Add title and labels to the maze to show memory and path information
-    print(f"Average {answer['algorithm']} maximum memory usage: {average_memory} MiB")
-    print(f"Average {answer['algorithm']} path length:", average_path_length)
-    print(f"Average {answer['algorithm']} time taken: {time_taken} seconds")
-    label = textLabel(maze, f"{answer['algorithm']} maximum memory used", f"{round(max(memory), 4)}MiB")
-    label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 15), relief="raised")
-    label.lab.pack_configure(expand=False, anchor='s')
-    label = textLabel(maze, f"{answer['algorithm']} path length", len(path_to_target) + 1)
-    label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 15), relief="raised")
-    label.lab.pack_configure(expand=False, anchor='s')
+    add_label(maze_to_solve, f"{answer['algorithm']} maximum memory used",
+              f"{round(summary['peak_memory']['max'], 4)}MiB", 15)
+    add_label(maze_to_solve, f"{answer['algorithm']} path length", len(path_to_target), 15)
     # MDP algorithms do not have a search space to be mentioned in the label
     if maze_area_to_search is not None:
-        label = textLabel(maze, f"{answer['algorithm']} search space", len(maze_area_to_search) + 1)
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 15), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-    label = textLabel(maze, f"{answer['algorithm']} time taken", f"{round(time_taken, 4)}s")
-    label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 15), relief="raised")
-    label.lab.pack_configure(expand=False, anchor='s')
-    maze._win.title(f"{answer['algorithm']} algorithm solving a {maze_rows['number of rows for the maze']}x"
-                    f"{maze_columns['number of columns for the maze']} maze (Path is cyan)")
+        add_label(maze_to_solve, f"{answer['algorithm']} search space", len(maze_area_to_search) + 1, 15)
+    add_label(maze_to_solve, f"{answer['algorithm']} time taken", f"{round(summary['time_taken']['mean'], 4)}s", 15)
+    maze_to_solve._win.title(f"{answer['algorithm']} algorithm solving a {rows}x{columns} maze (Path is cyan)")
+
+    # Search algorithms that can stream their search space show it as a new search runs instead of replaying the list
+    if algorithm in SEARCH_EVENT_FUNCTIONS:
+        maze_to_solve._win.title(f"{answer['algorithm']} algorithm solving a {rows}x{columns} maze "
+                                 f"(Search space is yellow, path is cyan)")
+        path = agent(maze_to_solve, footprints=True, color=COLOR.cyan)
+        stream_search(maze_to_solve, SEARCH_EVENT_FUNCTIONS[algorithm](compact_maze, frontier_events=False), path)
+        maze_to_solve.run()
+        return
 
     # Add agents to the maze to show the search space (for search algorithms only) and path of the algorithm
-    search_space = agent(maze, footprints=True, shape='square', color=COLOR.yellow)
+    search_space = agent(maze_to_solve, footprints=True, shape='square', color=COLOR.yellow)
 
     # MDP algorithms do not have a search space to be an agent or label in the maze
     if maze_area_to_search is not None:
-        maze._win.title(f"{answer['algorithm']} algorithm solving a {maze_rows['number of rows for the maze']}x"
-                        f"{maze_columns['number of columns for the maze']} maze (Search space is yellow, "
-                        f"path is cyan)")
-        maze.tracePath({search_space: maze_area_to_search}, showMarked=True, delay=75)
+        maze_to_solve._win.title(f"{answer['algorithm']} algorithm solving a {rows}x{columns} maze "
+                                 f"(Search space is yellow, path is cyan)")
+        maze_to_solve.tracePath({search_space: maze_area_to_search}, showMarked=True, delay=75)
 
     # All algorithms have a path to be an agent
-    path = agent(maze, footprints=True, color=COLOR.cyan)
-    maze.tracePath({path: path_to_target}, delay=75)
+    path = agent(maze_to_solve, footprints=True, color=COLOR.cyan)
+    maze_to_solve.tracePath({path: path_to_target.trace_path()}, delay=75)
 
     # Run the maze
-    maze.run()
+    maze_to_solve.run()
+
 
 # Run multiple algorithms
-elif answer["wish"] == "Compare multiple algorithms":
+def compare_algorithms():
     # Either compare between search algorithms, MDP algorithms, or between all of them together
     answer = inquirer.prompt([inquirer.List("algorithm_type",
                                             message="The type of algorithms I want to compare between are",
                                             choices=["Search algorithms (to each other)",
+                                                     "Bidirectional and one-directional search algorithms",
                                                      "MDP algorithms (to each other)",
                                                      "Search and MDP algorithms"]
                                             )])
+    rows, columns, iterations = ask_for_maze_and_iterations(
+        "How many iterations do you want to run each algorithm for?")
 
-    # Number of columns in the maze
-    maze_columns = inquirer.prompt([inquirer.Text("number of columns for the maze",
-                                                  message="How many columns do you want in the maze?",
-                                                  validate=lambda _, c: c.isdigit() and int(c) > 0
-                                                  )])
+    # Create the maze with the built-in generator (every algorithm run shares its compact representation)
+    compact_maze = generate_maze(rows, columns, loop_percent=50)
+    # Load it into a pyamaze maze to show it
+    maze_to_solve = pyamaze_maze_from_compact_maze(compact_maze)
 
-    # Number of rows in the maze
-    maze_rows = inquirer.prompt([inquirer.Text("number of rows for the maze",
-                                               message="How many rows do you want in the maze?",
-                                               validate=lambda _, c: c.isdigit() and int(c) > 0
-                                               )])
+    # Calculate the search space and path after running the chosen algorithms while also tracking the memory used
+    if answer["algorithm_type"] == "Search algorithms (to each other)":
+        results = benchmark_algorithms(['a_star', 'dfs', 'bfs'], compact_maze, iterations)
 
-    # Number of iterations for measuring time taken
-    iterations = inquirer.prompt([inquirer.Text("iterations",
-                                                message="How many iterations do you want to run each algorithm for?",
-                                                validate=lambda _, c: c.isdigit() and int(c) > 0
-                                                )])
+        # Add title and labels to the maze to show memory and path information
+        for algorithm in ('a_star', 'dfs', 'bfs'):
+            add_label(maze_to_solve, f"{ALGORITHMS[algorithm][0]} search space", len(results[algorithm][1]) + 1, 11)
+        for algorithm in ('a_star', 'dfs', 'bfs'):
+            add_label(maze_to_solve, f"{ALGORITHMS[algorithm][0]} path length", len(results[algorithm][2]), 11)
+        for algorithm in ('a_star', 'dfs', 'bfs'):
+            add_label(maze_to_solve, f"{ALGORITHMS[algorithm][0]} time taken",
+                      f"{round(results[algorithm][0]['time_taken']['mean'], 4)}", 11)
+        maze_to_solve._win.title(f"Search algorithms solving a {rows}x{columns} maze (A* is yellow, DFS is blue,"
+                                 f" BFS is red)")
 
-    # Create the maze
-    maze = maze(int(maze_rows["number of rows for the maze"]), int(maze_columns["number of columns for the maze"]))
-    maze.CreateMaze(loopPercent=50)
-
-    memory_from_iterations = []
-    search_space_from_iterations = []
-    path_length_from_iterations = []
-    average_memory = None
-    average_search_space = None
-    average_path_length = None
-    a_star_maze_area_to_search = None
-    dfs_maze_area_to_search = None
-    bfs_maze_area_to_search = None
-    a_star_path_to_target = None
-    dfs_path_to_target = None
-    bfs_path_to_target = None
-    policy_iteration_path_to_target = None
-    value_iteration_path_to_target = None
-    policy_iteration_memory = None
-    value_iteration_memory = None
-
-    # Calculate the search space and path after running the chosen algorithm while also tracking the memory used
+        # Agents for each search algorithm
+        a_star_path = agent(maze_to_solve, footprints=True, color=COLOR.yellow)
+        dfs_path = agent(maze_to_solve, footprints=True, color=COLOR.blue)
+        bfs_path = agent(maze_to_solve, footprints=True, color=COLOR.red)
 
-    if answer["algorithm_type"] == "Search algorithms (to each other)":
-        # A star algorithm completion with memory and time taken being measured
-        for _ in range(int(iterations["iterations"])):
-            a_star_memory, (a_star_maze_area_to_search, a_star_path_to_target) = memory_usage((a_star_algorithm,
-                                                                                               (maze,), {}),
-                                                                                              retval=True)
-            memory_from_iterations.append(max(a_star_memory))
-            search_space_from_iterations.append(len(a_star_maze_area_to_search) + 1)
-            path_length_from_iterations.append(len(a_star_path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_search_space = statistics.mean(search_space_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        a_star_time_taken = timeit(stmt='a_star_algorithm(maze)', number=int(iterations["iterations"]),
-                            globals=globals())
-
-        print(f"Average A* maximum memory usage: {average_memory} MiB")
-        print(f"Average A* path length: {average_path_length}")
-        print(f"Average A* search space: {average_search_space}")
-        print(f"Average A* time taken: {a_star_time_taken} seconds")
-
-        memory_from_iterations = []
-        search_space_from_iterations = []
-        path_length_from_iterations = []
-
-        # DFS algorithm completion with memory and time taken being measured
-        for _ in range(int(iterations["iterations"])):
-            dfs_memory, (dfs_maze_area_to_search, dfs_path_to_target) = memory_usage((dfs_algorithm,
-                                                                                      (maze,), {}), retval=True)
-            memory_from_iterations.append(max(dfs_memory))
-            search_space_from_iterations.append(len(dfs_maze_area_to_search) + 1)
-            path_length_from_iterations.append(len(dfs_path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_search_space = statistics.mean(search_space_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        dfs_time_taken = timeit(stmt='dfs_algorithm(maze)', number=int(iterations["iterations"]),
-                                globals=globals())
-
-        print(f"Average DFS maximum memory usage: {average_memory} MiB")
-        print(f"Average DFS path length: {average_path_length}")
-        print(f"Average DFS search space: {average_search_space}")
-        print(f"Average DFS time taken: {dfs_time_taken} seconds")
-
-        memory_from_iterations = []
-        search_space_from_iterations = []
-        path_length_from_iterations = []
-
-        # BFS algorithm completion with memory and time taken being measured
-        for _ in range(int(iterations["iterations"])):
-            bfs_memory, (bfs_maze_area_to_search, bfs_path_to_target) = memory_usage((bfs_algorithm,
-                                                                                      (maze,), {}), retval=True)
-            memory_from_iterations.append(max(bfs_memory))
-            search_space_from_iterations.append(len(bfs_maze_area_to_search) + 1)
-            path_length_from_iterations.append(len(bfs_path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_search_space = statistics.mean(search_space_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        bfs_time_taken = timeit(stmt='bfs_algorithm(maze)', number=int(iterations["iterations"]),
-                                globals=globals())
-
-        print(f"Average BFS maximum memory usage: {average_memory} MiB")
-        print(f"Average BFS path length: {average_path_length}")
-        print(f"Average BFS search space: {average_search_space}")
-        print(f"Average BFS time taken: {bfs_time_taken} seconds")
+        # Create a trace of each agent
+        maze_to_solve.tracePath({a_star_path: results['a_star'][2].trace_path()}, delay=75)
+        maze_to_solve.tracePath({dfs_path: results['dfs'][2].trace_path()}, delay=75)
+        maze_to_solve.tracePath({bfs_path: results['bfs'][2].trace_path()}, delay=75)
+
+    elif answer["algorithm_type"] == "Bidirectional and one-directional search algorithms":
+        algorithms = ('a_star', 'bidirectional_a_star', 'bfs', 'bidirectional_bfs')
+        results = benchmark_algorithms(list(algorithms), compact_maze, iterations)
 
         # Add title and labels to the maze to show memory and path information
-        label = textLabel(maze, 'A* search space', len(a_star_maze_area_to_search) + 1)
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'DFS search space', len(dfs_maze_area_to_search) + 1)
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'BFS search space', len(bfs_maze_area_to_search) + 1)
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'A* path length', len(a_star_path_to_target) + 1)
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'DFS path length', len(dfs_path_to_target) + 1)
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'BFS path length', len(bfs_path_to_target) + 1)
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'A* time taken', f"{round(a_star_time_taken, 4)}")
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'DFS time taken', f"{round(dfs_time_taken, 4)}")
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'BFS time taken', f"{round(bfs_time_taken, 4)}")
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        maze._win.title(f"Search algorithms solving a {maze_rows['number of rows for the maze']}x"
-                        f"{maze_columns['number of columns for the maze']} maze (A* is yellow, DFS is blue,"
-                        f" BFS is red)")
+        for algorithm in algorithms:
+            add_label(maze_to_solve, f"{ALGORITHMS[algorithm][0]} search space", len(results[algorithm][1]) + 1, 11)
+        for algorithm in algorithms:
+            add_label(maze_to_solve, f"{ALGORITHMS[algorithm][0]} path length", len(results[algorithm][2]), 11)
+        for algorithm in algorithms:
+            add_label(maze_to_solve, f"{ALGORITHMS[algorithm][0]} time taken",
+                      f"{round(results[algorithm][0]['time_taken']['mean'], 4)}", 11)
+        maze_to_solve._win.title(f"Search algorithms solving a {rows}x{columns} maze (A* is yellow, bidirectional A* "
+                                 f"is cyan, BFS is red, bidirectional BFS is blue)")
 
         # Agents for each search algorithm
-        a_star_path = agent(maze, footprints=True, color=COLOR.yellow)
-        dfs_path = agent(maze, footprints=True, color=COLOR.blue)
-        bfs_path = agent(maze, footprints=True, color=COLOR.red)
+        a_star_path = agent(maze_to_solve, footprints=True, color=COLOR.yellow)
+        bidirectional_a_star_path = agent(maze_to_solve, footprints=True, color=COLOR.cyan)
+        bfs_path = agent(maze_to_solve, footprints=True, color=COLOR.red)
+        bidirectional_bfs_path = agent(maze_to_solve, footprints=True, color=COLOR.blue)
 
         # Create a trace of each agent
-        maze.tracePath({a_star_path: a_star_path_to_target}, delay=75)
-        maze.tracePath({dfs_path: dfs_path_to_target}, delay=75)
-        maze.tracePath({bfs_path: bfs_path_to_target}, delay=75)
-
-        # Run the maze
-        maze.run()
+        maze_to_solve.tracePath({a_star_path: results['a_star'][2].trace_path()}, delay=75)
+        maze_to_solve.tracePath({bidirectional_a_star_path: results['bidirectional_a_star'][2].trace_path()}, delay=75)
+        maze_to_solve.tracePath({bfs_path: results['bfs'][2].trace_path()}, delay=75)
+        maze_to_solve.tracePath({bidirectional_bfs_path: results['bidirectional_bfs'][2].trace_path()}, delay=75)
 
     elif answer["algorithm_type"] == "MDP algorithms (to each other)":
-        # Policy iteration algorithm completion with memory and time taken being measured
-        for _ in range(int(iterations["iterations"])):
-            policy_iteration_memory, policy_iteration_path_to_target = memory_usage((policy_iteration_algorithm,
-                                                                                     (maze,), {}), retval=True)
-            memory_from_iterations.append(max(policy_iteration_memory))
-            path_length_from_iterations.append(len(policy_iteration_path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        policy_iteration_time_taken = timeit(stmt='policy_iteration_algorithm(maze)',
-                                             number=int(iterations["iterations"]),
-                                             globals=globals())
-
-        print(f"Average policy iteration maximum memory usage: {average_memory} MiB")
-        print(f"Average policy iteration path length: {average_path_length}")
-        print(f"Average policy iteration time taken: {policy_iteration_time_taken} seconds")
-
-        memory_from_iterations = []
-        path_length_from_iterations = []
-
-        # Value iteration algorithm completion with memory and time taken being measured
-        for _ in range(int(iterations["iterations"])):
-            value_iteration_memory, value_iteration_path_to_target = memory_usage((value_iteration_algorithm,
-                                                                                   (maze,), {}), retval=True)
-            memory_from_iterations.append(max(value_iteration_memory))
-            path_length_from_iterations.append(len(value_iteration_path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        value_iteration_time_taken = timeit(stmt='value_iteration_algorithm(maze)',
-                                            number=int(iterations["iterations"]),
-                                            globals=globals())
-
-        print(f"Average value iteration maximum memory usage: {average_memory} MiB")
-        print(f"Average value iteration path length: {average_path_length}")
-        print(f"Average value iteration time taken: {value_iteration_time_taken} seconds")
+        results = benchmark_algorithms(['policy_iteration', 'value_iteration'], compact_maze, iterations)
 
         # Add title and labels to the maze to show memory and path information
-        label = textLabel(maze, f"Policy iteration maximum memory used",
-                          f"{round(max(policy_iteration_memory), 4)} MiB")
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, f"Value iteration maximum memory used",
-                          f"{round(max(value_iteration_memory), 4)} MiB")
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'Policy iteration path length', len(policy_iteration_path_to_target) + 1)
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'Value iteration path length', len(value_iteration_path_to_target) + 1)
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'Policy iteration time taken', f"{round(policy_iteration_time_taken, 4)}s")
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'Value iteration time taken', f"{round(value_iteration_time_taken, 4)}s")
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 11), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        maze._win.title(f"Search algorithms solving a {maze_rows['number of rows for the maze']}x"
-                        f"{maze_columns['number of columns for the maze']} maze (Policy iteration is red, Value "
-                        f"iteration is yellow)")
+        for algorithm in ('policy_iteration', 'value_iteration'):
+            add_label(maze_to_solve, f"{ALGORITHMS[algorithm][0]} maximum memory used",
+                      f"{round(results[algorithm][0]['peak_memory']['max'], 4)} MiB", 11)
+        for algorithm in ('policy_iteration', 'value_iteration'):
+            add_label(maze_to_solve, f"{ALGORITHMS[algorithm][0]} path length", len(results[algorithm][2]), 11)
+        for algorithm in ('policy_iteration', 'value_iteration'):
+            add_label(maze_to_solve, f"{ALGORITHMS[algorithm][0]} time taken",
+                      f"{round(results[algorithm][0]['time_taken']['mean'], 4)}s", 11)
+        maze_to_solve._win.title(f"Search algorithms solving a {rows}x{columns} maze (Policy iteration is red, Value "
+                                 f"iteration is yellow)")
+
+        # Agents for each MDP algorithm
+        policy_iteration_path = agent(maze_to_solve, footprints=True, color=COLOR.red)
+        value_iteration_path = agent(maze_to_solve, footprints=True, color=COLOR.yellow)
 
-        # Agents for each search algorithm
-        policy_iteration_path = agent(maze, footprints=True, color=COLOR.red)
-        value_iteration_path = agent(maze, footprints=True, color=COLOR.yellow)
+        # Create a trace of each agent
+        maze_to_solve.tracePath({policy_iteration_path: results['policy_iteration'][2].trace_path()}, delay=75)
+        maze_to_solve.tracePath({value_iteration_path: results['value_iteration'][2].trace_path()}, delay=75)
+
+    elif answer["algorithm_type"] == "Search and MDP algorithms":
+        results = benchmark_algorithms(['a_star', 'dfs', 'bfs', 'policy_iteration', 'value_iteration'],
+                                       compact_maze, iterations)
+
+        # Add labels to the maze to show the time taken by each algorithm
+        for algorithm in ('a_star', 'dfs', 'bfs', 'policy_iteration', 'value_iteration'):
+            add_label(maze_to_solve, f"{ALGORITHMS[algorithm][0]} time taken",
+                      f"{round(results[algorithm][0]['time_taken']['mean'], 4)}s", 15)
+        maze_to_solve._win.title(f"Search algorithms solving a {rows}x{columns} maze (A* is blue, DFS is red, "
+                                 f"BFS is yellow, Policy iteration is green, Value iteration is white)")
+
+        # Agents for each algorithm
+        a_star_path = agent(maze_to_solve, footprints=True, color=COLOR.blue)
+        dfs_path = agent(maze_to_solve, footprints=True, color=COLOR.red)
+        bfs_path = agent(maze_to_solve, footprints=True, color=COLOR.yellow)
+        policy_iteration_path = agent(maze_to_solve, footprints=True, color=COLOR.green)
+        value_iteration_path = agent(maze_to_solve, footprints=True, color=COLOR.dark)
 
         # Create a trace of each agent
-        maze.tracePath({policy_iteration_path: policy_iteration_path_to_target}, delay=75)
-        maze.tracePath({value_iteration_path: value_iteration_path_to_target}, delay=75)
+        maze_to_solve.tracePath({a_star_path: results['a_star'][2].trace_path()}, delay=75)
+        maze_to_solve.tracePath({dfs_path: results['dfs'][2].trace_path()}, delay=75)
+        maze_to_solve.tracePath({bfs_path: results['bfs'][2].trace_path()}, delay=75)
+        maze_to_solve.tracePath({policy_iteration_path: results['policy_iteration'][2].trace_path()}, delay=75)
+        maze_to_solve.tracePath({value_iteration_path: results['value_iteration'][2].trace_path()}, delay=75)
 
-        # Run the maze
-        maze.run()
+    # Run the maze
+    maze_to_solve.run()
 
-    elif answer["algorithm_type"] == "Search and MDP algorithms":
-        # A star algorithm completion with memory and time taken being measured
-        for _ in range(int(iterations["iterations"])):
-            a_star_memory, (a_star_maze_area_to_search, a_star_path_to_target) = memory_usage((a_star_algorithm,
-                                                                                               (maze,), {}),
-                                                                                              retval=True)
-            memory_from_iterations.append(max(a_star_memory))
-            search_space_from_iterations.append(len(a_star_maze_area_to_search) + 1)
-            path_length_from_iterations.append(len(a_star_path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_search_space = statistics.mean(search_space_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        a_star_time_taken = timeit(stmt='a_star_algorithm(maze)', number=int(iterations["iterations"]),
-                                   globals=globals())
-
-        print(f"Average A* maximum memory usage: {average_memory} MiB")
-        print(f"Average A* path length: {average_path_length}")
-        print(f"Average A* search space: {average_search_space}")
-        print(f"Average A* time taken: {a_star_time_taken} seconds")
-
-        memory_from_iterations = []
-        search_space_from_iterations = []
-        path_length_from_iterations = []
-
-        # DFS algorithm completion with memory and time taken being measured
-        for _ in range(int(iterations["iterations"])):
-            dfs_memory, (dfs_maze_area_to_search, dfs_path_to_target) = memory_usage((dfs_algorithm,
-                                                                                      (maze,), {}), retval=True)
-            memory_from_iterations.append(max(dfs_memory))
-            search_space_from_iterations.append(len(dfs_maze_area_to_search) + 1)
-            path_length_from_iterations.append(len(dfs_path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_search_space = statistics.mean(search_space_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        dfs_time_taken = timeit(stmt='dfs_algorithm(maze)', number=int(iterations["iterations"]),
-                                globals=globals())
-
-        print(f"Average DFS maximum memory usage: {average_memory} MiB")
-        print(f"Average DFS path length: {average_path_length}")
-        print(f"Average DFS search space: {average_search_space}")
-        print(f"Average DFS time taken: {dfs_time_taken} seconds")
-
-        memory_from_iterations = []
-        search_space_from_iterations = []
-        path_length_from_iterations = []
-
-        # BFS algorithm completion with memory and time taken being measured
-        for _ in range(int(iterations["iterations"])):
-            bfs_memory, (bfs_maze_area_to_search, bfs_path_to_target) = memory_usage((bfs_algorithm,
-                                                                                      (maze,), {}), retval=True)
-            memory_from_iterations.append(max(bfs_memory))
-            search_space_from_iterations.append(len(bfs_maze_area_to_search) + 1)
-            path_length_from_iterations.append(len(bfs_path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_search_space = statistics.mean(search_space_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        bfs_time_taken = timeit(stmt='bfs_algorithm(maze)', number=int(iterations["iterations"]),
-                                globals=globals())
-
-        print(f"Average BFS maximum memory usage: {average_memory} MiB")
-        print(f"Average BFS path length: {average_path_length}")
-        print(f"Average BFS search space: {average_search_space}")
-        print(f"Average BFS time taken: {bfs_time_taken} seconds")
-
-        memory_from_iterations = []
-        search_space_from_iterations = []
-        path_length_from_iterations = []
-
-        # Policy iteration algorithm completion with memory and time taken being measured
-        for _ in range(int(iterations["iterations"])):
-            policy_iteration_memory, policy_iteration_path_to_target = memory_usage((policy_iteration_algorithm,
-                                                                                     (maze,), {}), retval=True)
-            memory_from_iterations.append(max(policy_iteration_memory))
-            path_length_from_iterations.append(len(policy_iteration_path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        policy_iteration_time_taken = timeit(stmt='policy_iteration_algorithm(maze)',
-                                             number=int(iterations["iterations"]),
-                                             globals=globals())
-
-        print(f"Average policy iteration maximum memory usage: {average_memory} MiB")
-        print(f"Average policy iteration path length: {average_path_length}")
-        print(f"Average policy iteration time taken: {policy_iteration_time_taken} seconds")
-
-        memory_from_iterations = []
-        path_length_from_iterations = []
-
-        # Value iteration algorithm completion with memory and time taken being measured
-        for _ in range(int(iterations["iterations"])):
-            value_iteration_memory, value_iteration_path_to_target = memory_usage((value_iteration_algorithm,
-                                                                                   (maze,), {}), retval=True)
-            memory_from_iterations.append(max(value_iteration_memory))
-            path_length_from_iterations.append(len(value_iteration_path_to_target) + 1)
-
-        average_memory = statistics.mean(memory_from_iterations)
-        average_path_length = statistics.mean(path_length_from_iterations)
-        value_iteration_time_taken = timeit(stmt='value_iteration_algorithm(maze)',
-                                            number=int(iterations["iterations"]),
-                                            globals=globals())
-
-        print(f"Average value iteration maximum memory usage: {average_memory} MiB")
-        print(f"Average value iteration path length: {average_path_length}")
-        print(f"Average value iteration time taken: {value_iteration_time_taken} seconds")
-
-        label = textLabel(maze, 'A* time taken', f"{round(a_star_time_taken, 4)}")
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 15), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'DFS time taken', f"{round(dfs_time_taken, 4)}")
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 15), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'BFS time taken', f"{round(bfs_time_taken, 4)}")
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 15), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        maze._win.title(f"Search algorithms solving a {maze_rows['number of rows for the maze']}x"
-                        f"{maze_columns['number of columns for the maze']} maze (A* is yellow, DFS is blue,"
-                        f" BFS is red)")
-        label = textLabel(maze, 'Policy iteration time taken', f"{round(policy_iteration_time_taken, 4)}s")
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 15), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        label = textLabel(maze, 'Value iteration time taken', f"{round(value_iteration_time_taken, 4)}s")
-        label.lab.configure(bg="grey", fg="black", font=('Trebuchet MS', 15), relief="raised")
-        label.lab.pack_configure(expand=False, anchor='s')
-        maze._win.title(f"Search algorithms solving a {maze_rows['number of rows for the maze']}x"
-                        f"{maze_columns['number of columns for the maze']} maze (A* is blue, DFS is red, "
-                        f"BFS is yellow, Policy iteration is green, Value iteration is white)")
 
-        # Agents for each search algorithm
-        a_star_path = agent(maze, footprints=True, color=COLOR.blue)
-        dfs_path = agent(maze, footprints=True, color=COLOR.red)
-        bfs_path = agent(maze, footprints=True, color=COLOR.yellow)
-        policy_iteration_path = agent(maze, footprints=True, color=COLOR.green)
-        value_iteration_path = agent(maze, footprints=True, color=COLOR.dark)
+def main():
+    # Commands given on the command line run without any menus (see command_line.py or run main.py --help)
+    if len(sys.argv) > 1:
+        run_command_line(sys.argv[1:])
+        return
 
-        # Create a trace of each agent
-        maze.tracePath({a_star_path: a_star_path_to_target}, delay=75)
-        maze.tracePath({dfs_path: dfs_path_to_target}, delay=75)
-        maze.tracePath({bfs_path: bfs_path_to_target}, delay=75)
-        maze.tracePath({policy_iteration_path: policy_iteration_path_to_target}, delay=75)
-        maze.tracePath({value_iteration_path: value_iteration_path_to_target}, delay=75)
-
-        # Run the maze
-        maze.run()
-
-# Exit the program!
-elif answer["wish"] == "Exit":
-    print(figlet_format("Goodbye!", justify='center', width=140))
-    sys.exit()
+    # Print welcome banner!
+    print(figlet_format("Welcome to Prathamesh's Maze Solver for CS7IS2!", justify='center', width=140))
+
+    # Either run an individual algorithm or compare multiple algorithms
+    answer = inquirer.prompt([inquirer.List("wish", message="I want to", choices=["Run an individual algorithm",
+                                                                                  "Compare multiple algorithms",
+                                                                                  "Exit"]
+                                            )])
+
+    if answer["wish"] == "Run an individual algorithm":
+        run_individual_algorithm()
+    elif answer["wish"] == "Compare multiple algorithms":
+        compare_algorithms()
+    # Exit the program!
+    elif answer["wish"] == "Exit":
+        print(figlet_format("Goodbye!", justify='center', width=140))
+        sys.exit()
+
+
+# Only run the menus in the main process (benchmark worker processes may import this module)
+if __name__ == "__main__":
+    main()
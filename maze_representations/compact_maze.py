@@ -0,0 +1,165 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import copy
+import csv
+from array import array
+from itertools import accumulate
+
+# Bit used for each cardinal direction in the wall bitmask of a cell
+DIRECTION_BITS = {'N': 1, 'E': 2, 'S': 4, 'W': 8}
+# Order the search algorithms explore neighbouring squares in
+SEARCH_DIRECTION_ORDER = ('N', 'E', 'S', 'W')
+# Order of the directions in a pyamaze maze_map entry (the MDP algorithms choose between actions in this order)
+MAZE_MAP_DIRECTION_ORDER = ('E', 'W', 'N', 'S')
+
+
+# Compiled maze with flat integer cell IDs, a wall bitmask per cell and a CSR-style adjacency index
+class CompactMaze:
+    def __init__(self, rows, cols, wall_bitmasks, neighbour_offsets=None, neighbour_cells=None):
+        self.rows = rows
+        self.cols = cols
+        self.number_of_cells = rows * cols
+        # A bit set to 1 means that direction is open (the same meaning as a 1 in pyamaze's maze_map)
+        self.wall_bitmasks = wall_bitmasks
+        # Moving in a direction adds a fixed offset to the flat (row-major) cell ID
+        self.direction_offsets = {'N': -cols, 'E': 1, 'S': cols, 'W': -1}
+        # The neighbours of cell i are neighbour_cells[neighbour_offsets[i]:neighbour_offsets[i + 1]]
+        # (an adjacency index that was already built, e.g. loaded from disk, can be passed in)
+        if neighbour_offsets is None or neighbour_cells is None:
+            neighbour_offsets, neighbour_cells = build_adjacency_index(self)
+        self.neighbour_offsets = neighbour_offsets
+        self.neighbour_cells = neighbour_cells
+        # Pyamaze mazes start at the bottom right square and have the target at the top left square (1, 1)
+        # (with_endpoints gives a copy of the maze with any other start and goal)
+        self.start_cell = self.number_of_cells - 1
+        self.goal_cell = 0
+        # Heuristic tables precomputed once per maze and reused by later A* runs (see search_algorithms.heuristics)
+        self.heuristic_tables = {}
+        # Graph of junctions and dead ends joined by corridors, built on first use (see corridor_graph.corridor_graph)
+        self.corridor_graph = None
+
+    # Memory-mapped buffers cannot be pickled (e.g. to send the maze to a worker process), so copy them into arrays
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['wall_bitmasks'] = array('B', bytes(self.wall_bitmasks))
+        state['neighbour_offsets'] = array('i', bytes(self.neighbour_offsets))
+        state['neighbour_cells'] = array('i', bytes(self.neighbour_cells))
+        return state
+
+    # Copy of the maze with a different start and/or goal cell (the arrays and heuristic tables are shared)
+    def with_endpoints(self, start_cell=None, goal_cell=None):
+        maze = copy.copy(self)
+        if start_cell is not None:
+            maze.start_cell = start_cell
+        if goal_cell is not None:
+            maze.goal_cell = goal_cell
+        return maze
+
+    # Convert a (row, column) square into a flat cell ID
+    def cell_id(self, square):
+        return (square[0] - 1) * self.cols + (square[1] - 1)
+
+    # Convert a flat cell ID back into a (row, column) square
+    def square(self, cell):
+        row, column = divmod(cell, self.cols)
+        return row + 1, column + 1
+
+    # Get the cells in the same (column by column) order as pyamaze's maze_map
+    def cells_in_maze_map_order(self):
+        return [row * self.cols + column for column in range(self.cols) for row in range(self.rows)]
+
+    # Get the open neighbouring cells of a cell (in N, E, S, W order)
+    def neighbours(self, cell):
+        return self.neighbour_cells[self.neighbour_offsets[cell]:self.neighbour_offsets[cell + 1]]
+
+    # Check if a direction is open from a cell
+    def is_open(self, cell, direction):
+        return self.wall_bitmasks[cell] & DIRECTION_BITS[direction] != 0
+
+    # Get the open directions of a cell in the same order as pyamaze's maze_map
+    def valid_actions(self, cell):
+        return [direction for direction in MAZE_MAP_DIRECTION_ORDER
+                if self.wall_bitmasks[cell] & DIRECTION_BITS[direction]]
+
+    # Get the cell reached by moving in a direction from a cell
+    def step(self, cell, direction):
+        return cell + self.direction_offsets[direction]
+
+    # Export a pyamaze compatible maze_map (e.g. so the maze can be visualized)
+    def to_maze_map(self):
+        maze_map = {}
+        # Pyamaze stores the grid column by column
+        for column in range(1, self.cols + 1):
+            for row in range(1, self.rows + 1):
+                bitmask = self.wall_bitmasks[(row - 1) * self.cols + (column - 1)]
+                maze_map[(row, column)] = {direction: 1 if bitmask & DIRECTION_BITS[direction] else 0
+                                           for direction in MAZE_MAP_DIRECTION_ORDER}
+        return maze_map
+
+
+# Build the CSR-style adjacency index (offsets into a flat array of neighbouring cells)
+def build_adjacency_index(compact_maze):
+    # Offsets of the open neighbours for each of the 16 possible wall bitmasks (in N, E, S, W order)
+    neighbour_offsets_of_bitmask = [[compact_maze.direction_offsets[direction] for direction in SEARCH_DIRECTION_ORDER
+                                     if bitmask & DIRECTION_BITS[direction]] for bitmask in range(16)]
+    number_of_neighbours = [len(offsets) for offsets in neighbour_offsets_of_bitmask]
+    neighbour_offsets = array('i', [0])
+    neighbour_offsets.extend(accumulate(number_of_neighbours[bitmask] for bitmask in compact_maze.wall_bitmasks))
+    neighbour_cells = array('i', [cell + offset for cell, bitmask in enumerate(compact_maze.wall_bitmasks)
+                                  for offset in neighbour_offsets_of_bitmask[bitmask]])
+    return neighbour_offsets, neighbour_cells
+
+
+# Compile a pyamaze maze into a compact maze (compact mazes are returned unchanged)
+def compile_maze(maze):
+    if isinstance(maze, CompactMaze):
+        return maze
+    return compact_maze_from_maze_map(maze.rows, maze.cols, maze.maze_map)
+
+
+# Build a compact maze from a pyamaze style maze_map ((row, column) -> {'E': 0/1, 'W': 0/1, 'N': 0/1, 'S': 0/1})
+def compact_maze_from_maze_map(rows, cols, maze_map):
+    wall_bitmasks = array('B', [0]) * (rows * cols)
+    for (row, column), directions in maze_map.items():
+        bitmask = 0
+        for direction, valid in directions.items():
+            if valid:
+                bitmask |= DIRECTION_BITS[direction]
+        # Never let a direction lead outside the grid
+        if row == 1:
+            bitmask &= ~DIRECTION_BITS['N']
+        if row == rows:
+            bitmask &= ~DIRECTION_BITS['S']
+        if column == 1:
+            bitmask &= ~DIRECTION_BITS['W']
+        if column == cols:
+            bitmask &= ~DIRECTION_BITS['E']
+        wall_bitmasks[(row - 1) * cols + (column - 1)] = bitmask
+    return CompactMaze(rows, cols, wall_bitmasks)
+
+
+# Load a maze saved by pyamaze (CreateMaze(saveMaze=True)) straight into a compact maze, without needing Tkinter
+def load_pyamaze_csv(file_path):
+    maze_map = {}
+    with open(file_path, newline='') as maze_file:
+        reader = csv.reader(maze_file)
+        # Skip the header row ('  cell  ', 'E', 'W', 'N', 'S')
+        next(reader)
+        for row in reader:
+            if not row:
+                continue
+            square = tuple(int(coordinate) for coordinate in row[0].strip('()"').split(','))
+            maze_map[square] = {'E': int(row[1]), 'W': int(row[2]), 'N': int(row[3]), 'S': int(row[4])}
+    # The last cell saved is the bottom right square, which gives the size of the maze
+    rows = max(square[0] for square in maze_map)
+    cols = max(square[1] for square in maze_map)
+    return compact_maze_from_maze_map(rows, cols, maze_map)
+
+
+# Save a compact maze as a CSV file in pyamaze's format (so it can be shown with CreateMaze(loadMaze=...))
+def save_pyamaze_csv(compact_maze, file_path):
+    with open(file_path, 'w', newline='') as maze_file:
+        writer = csv.writer(maze_file)
+        writer.writerow(['  cell  ', 'E', 'W', 'N', 'S'])
+        for square, directions in compact_maze.to_maze_map().items():
+            writer.writerow([square] + [directions[direction] for direction in MAZE_MAP_DIRECTION_ORDER])
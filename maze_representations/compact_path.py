@@ -0,0 +1,70 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+from array import array
+
+
+# Path every solver returns: the cell IDs of the squares from the start to the target in a 4 byte integer array, read
+# as a sequence of (row, column) squares that are only made when they are asked for
+# Only the number of columns of the maze is kept (not the maze), so paths are cheap to keep, pickle and send between
+# processes, and an empty path means the target could not be reached
+class CompactPath:
+    def __init__(self, cols, cells=()):
+        self.cols = cols
+        self.cells = cells if isinstance(cells, array) and cells.typecode == 'i' else array('i', cells)
+
+    # Number of squares on the path (the start and the target included)
+    def __len__(self):
+        return len(self.cells)
+
+    # Square (or list of squares for a slice) at a position on the path
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.square(cell) for cell in self.cells[index]]
+        return self.square(self.cells[index])
+
+    def __iter__(self):
+        return map(self.square, self.cells)
+
+    def __eq__(self, other):
+        if isinstance(other, CompactPath):
+            return self.cols == other.cols and self.cells == other.cells
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CompactPath({list(self)})"
+
+    # Convert a flat cell ID into a (row, column) square
+    def square(self, cell):
+        row, column = divmod(cell, self.cols)
+        return row + 1, column + 1
+
+    # Number of moves along the path (0 if the target could not be reached)
+    @property
+    def steps(self):
+        return max(len(self.cells) - 1, 0)
+
+    # The path as the {square: next square} dictionary pyamaze's tracePath shows (only needed to show it)
+    def trace_path(self):
+        squares = list(self)
+        return dict(zip(squares, squares[1:]))
+
+
+# Path from a parent pointer array (the cell each cell was reached from), walked back from the target to the start
+# An empty path is returned if the target was never reached (its parent is -1)
+def path_from_parents(cols, initial_cell, parents, target_cell):
+    cells = array('i', [target_cell])
+    if target_cell != initial_cell and parents[target_cell] < 0:
+        return CompactPath(cols)
+    while cells[-1] != initial_cell:
+        cells.append(parents[cells[-1]])
+    cells.reverse()
+    return CompactPath(cols, cells)
+
+
+# Path from a shortest path tree rooted at the target, where next_cells[cell] is the next cell on the way to the
+# target, walked from the initial cell (O(path length))
+def path_from_next_cells(cols, initial_cell, next_cells, target_cell):
+    cells = array('i', [initial_cell])
+    while cells[-1] != target_cell:
+        cells.append(next_cells[cells[-1]])
+    return CompactPath(cols, cells)
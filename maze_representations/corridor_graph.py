@@ -0,0 +1,112 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+from array import array
+
+
+# Maze with its corridors contracted: only junctions and dead ends (cells without exactly 2 open directions) are
+# nodes, and each corridor of cells between two nodes is one weighted edge (weight = number of steps along it)
+# The cells of every corridor are kept in travel order so a path over the edges can be expanded back into cells
+class CorridorGraph:
+    def __init__(self, compact_maze):
+        self.compact_maze = compact_maze
+        number_of_cells = compact_maze.number_of_cells
+        neighbour_offsets = compact_maze.neighbour_offsets
+        # Node ID of each cell (-1 for corridor cells) and the cell of each node
+        self.node_of_cell = array('i', [-1]) * number_of_cells
+        self.node_cells = array('i', [cell for cell in range(number_of_cells)
+                                      if neighbour_offsets[cell + 1] - neighbour_offsets[cell] != 2])
+        for node, cell in enumerate(self.node_cells):
+            self.node_of_cell[cell] = node
+        # The edges leaving node i are edges edge_offsets[i]:edge_offsets[i + 1], each going from edge_sources[e] to
+        # edge_targets[e] with weight edge_weights[e] through the cells corridor_cells[corridor_offsets[e]:
+        # corridor_offsets[e + 1]] (every corridor has an edge in each direction)
+        self.edge_offsets = array('i', [0])
+        self.edge_sources = array('i')
+        self.edge_targets = array('i')
+        self.edge_weights = array('i')
+        self.corridor_offsets = array('i', [0])
+        self.corridor_cells = array('i')
+        # Edge each corridor cell lies on (one of the two directions) and its position along that edge's corridor
+        self.corridor_edge_of_cell = array('i', [-1]) * number_of_cells
+        self.corridor_position_of_cell = array('i', [-1]) * number_of_cells
+        node = 0
+        first_unvisited_cell = 0
+        while True:
+            # A loop made only of corridor cells has no node on it, so make one of its cells a node
+            if node == len(self.node_cells):
+                while first_unvisited_cell < number_of_cells and \
+                        (self.node_of_cell[first_unvisited_cell] >= 0 or
+                         self.corridor_edge_of_cell[first_unvisited_cell] >= 0):
+                    first_unvisited_cell += 1
+                if first_unvisited_cell == number_of_cells:
+                    break
+                self.node_of_cell[first_unvisited_cell] = node
+                self.node_cells.append(first_unvisited_cell)
+            self.add_edges_of_node(node)
+            node += 1
+
+    # Number of nodes (junctions and dead ends)
+    @property
+    def number_of_nodes(self):
+        return len(self.node_cells)
+
+    # Follow each corridor leaving a node to the node at its other end
+    def add_edges_of_node(self, node):
+        compact_maze = self.compact_maze
+        node_cell = self.node_cells[node]
+        for first_cell in compact_maze.neighbours(node_cell):
+            edge = len(self.edge_targets)
+            previous_cell, present_cell = node_cell, first_cell
+            position = 0
+            # Corridor cells have exactly 2 neighbours, so keep going to the one we did not come from
+            while self.node_of_cell[present_cell] < 0:
+                self.corridor_cells.append(present_cell)
+                if self.corridor_edge_of_cell[present_cell] < 0:
+                    self.corridor_edge_of_cell[present_cell] = edge
+                    self.corridor_position_of_cell[present_cell] = position
+                position += 1
+                first_neighbour, second_neighbour = compact_maze.neighbours(present_cell)
+                previous_cell, present_cell = present_cell, (second_neighbour if first_neighbour == previous_cell
+                                                             else first_neighbour)
+            self.edge_sources.append(node)
+            self.edge_targets.append(self.node_of_cell[present_cell])
+            self.edge_weights.append(position + 1)
+            self.corridor_offsets.append(len(self.corridor_cells))
+        self.edge_offsets.append(len(self.edge_targets))
+
+    # Cells along an edge's corridor in travel order (not including the nodes at either end)
+    def corridor(self, edge):
+        return self.corridor_cells[self.corridor_offsets[edge]:self.corridor_offsets[edge + 1]]
+
+    # Ways from a cell onto the graph as (node, number of steps, cells walked through on the way in travel order)
+    # A node is just itself, a corridor cell can go either way along its corridor to the nodes at the two ends
+    def entry_points(self, cell):
+        node = self.node_of_cell[cell]
+        if node >= 0:
+            return [(node, 0, [])]
+        edge = self.corridor_edge_of_cell[cell]
+        position = self.corridor_position_of_cell[cell]
+        corridor = self.corridor(edge)
+        forwards = list(corridor[position + 1:])
+        backwards = list(corridor[:position])[::-1]
+        return [(self.edge_targets[edge], len(forwards) + 1, forwards),
+                (self.edge_sources[edge], len(backwards) + 1, backwards)]
+
+    # Cells strictly between two cells of the same corridor in travel order, None if they are on different corridors
+    def cells_between_on_corridor(self, first_cell, second_cell):
+        edge = self.corridor_edge_of_cell[first_cell]
+        if edge < 0 or edge != self.corridor_edge_of_cell[second_cell]:
+            return None
+        first_position = self.corridor_position_of_cell[first_cell]
+        second_position = self.corridor_position_of_cell[second_cell]
+        corridor = self.corridor(edge)
+        if first_position <= second_position:
+            return list(corridor[first_position + 1:second_position])
+        return list(corridor[second_position + 1:first_position])[::-1]
+
+
+# Get the corridor graph of a compact maze, contracting its corridors the first time it is asked for
+def corridor_graph(compact_maze):
+    if compact_maze.corridor_graph is None:
+        compact_maze.corridor_graph = CorridorGraph(compact_maze)
+    return compact_maze.corridor_graph
@@ -0,0 +1,85 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+from array import array
+from maze_representations.compact_maze import DIRECTION_BITS, SEARCH_DIRECTION_ORDER, CompactMaze, \
+    build_adjacency_index, compile_maze
+
+# Direction leading back from the square a move in each direction ends up in
+OPPOSITE_DIRECTIONS = {'N': 'S', 'E': 'W', 'S': 'N', 'W': 'E'}
+# Heuristics that do not depend on the walls, so their cached tables survive wall edits
+WALL_INDEPENDENT_HEURISTICS = ('manhattan', 'zero')
+
+
+# Compact maze whose walls can be opened and closed after it was built
+# Neighbours are read straight from the wall bitmasks, so an edit costs O(1) instead of rebuilding the adjacency index
+# (the index is only rebuilt if something asks for it after an edit, e.g. the corridor graph)
+class DynamicMaze(CompactMaze):
+    def __init__(self, rows, cols, wall_bitmasks):
+        super().__init__(rows, cols, wall_bitmasks, neighbour_offsets=array('i'), neighbour_cells=array('i'))
+        self.adjacency_index = None
+        # Offsets of the open neighbours for each of the 16 possible wall bitmasks (in N, E, S, W order)
+        self.neighbour_offsets_of_bitmask = [[self.direction_offsets[direction]
+                                              for direction in SEARCH_DIRECTION_ORDER
+                                              if bitmask & DIRECTION_BITS[direction]] for bitmask in range(16)]
+
+    # The CSR adjacency index is rebuilt on demand after the walls were edited
+    @property
+    def neighbour_offsets(self):
+        if self.adjacency_index is None:
+            self.adjacency_index = build_adjacency_index(self)
+        return self.adjacency_index[0]
+
+    # The index CompactMaze.__init__ sets is ignored, it is built from the wall bitmasks when it is asked for
+    @neighbour_offsets.setter
+    def neighbour_offsets(self, neighbour_offsets):
+        pass
+
+    @property
+    def neighbour_cells(self):
+        if self.adjacency_index is None:
+            self.adjacency_index = build_adjacency_index(self)
+        return self.adjacency_index[1]
+
+    @neighbour_cells.setter
+    def neighbour_cells(self, neighbour_cells):
+        pass
+
+    # Get the open neighbouring cells of a cell (in N, E, S, W order)
+    def neighbours(self, cell):
+        return [cell + offset for offset in self.neighbour_offsets_of_bitmask[self.wall_bitmasks[cell]]]
+
+    # Open (or close) the wall on one side of a cell, which is also the wall on the opposite side of its neighbour
+    # Returns the two cells whose walls changed (an empty list if the wall already was that way)
+    def set_wall(self, cell, direction, is_open):
+        if direction not in OPPOSITE_DIRECTIONS:
+            raise ValueError(f"Unknown direction {direction!r}, expected one of {tuple(OPPOSITE_DIRECTIONS)}")
+        row, column = divmod(cell, self.cols)
+        neighbouring_row = row + (direction == 'S') - (direction == 'N')
+        neighbouring_column = column + (direction == 'E') - (direction == 'W')
+        if not (0 <= row < self.rows and 0 <= column < self.cols):
+            raise ValueError(f"Cell {cell} is not in the {self.rows}x{self.cols} maze")
+        if not (0 <= neighbouring_row < self.rows and 0 <= neighbouring_column < self.cols):
+            raise ValueError(f"The {direction} wall of {self.square(cell)} is on the edge of the maze")
+        neighbouring_cell = self.step(cell, direction)
+        if self.is_open(cell, direction) == is_open:
+            return []
+        for edited_cell, edited_direction in ((cell, direction), (neighbouring_cell, OPPOSITE_DIRECTIONS[direction])):
+            if is_open:
+                self.wall_bitmasks[edited_cell] |= DIRECTION_BITS[edited_direction]
+            else:
+                self.wall_bitmasks[edited_cell] &= ~DIRECTION_BITS[edited_direction]
+        # Forget everything built from the old walls
+        self.adjacency_index = None
+        self.corridor_graph = None
+        for key in [key for key in self.heuristic_tables if key[0] not in WALL_INDEPENDENT_HEURISTICS]:
+            del self.heuristic_tables[key]
+        return [cell, neighbouring_cell]
+
+
+# Copy a pyamaze maze or compact maze into a maze whose walls can be edited (the original maze is left unchanged)
+def dynamic_maze(maze):
+    compact_maze = compile_maze(maze)
+    editable_maze = DynamicMaze(compact_maze.rows, compact_maze.cols, array('B', bytes(compact_maze.wall_bitmasks)))
+    editable_maze.start_cell = compact_maze.start_cell
+    editable_maze.goal_cell = compact_maze.goal_cell
+    return editable_maze
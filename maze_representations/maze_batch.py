@@ -0,0 +1,74 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+from array import array
+import numpy as np
+from maze_representations.compact_maze import DIRECTION_BITS, MAZE_MAP_DIRECTION_ORDER, compile_maze
+from maze_representations.compact_path import CompactPath
+
+
+# Open-direction masks of wall bitmasks shaped (rows, cols) or (mazes, rows, cols) as a boolean array with the
+# directions first (E, W, N, S order)
+def open_direction_masks(wall_bitmasks):
+    return np.stack([(wall_bitmasks & DIRECTION_BITS[direction]) != 0 for direction in MAZE_MAP_DIRECTION_ORDER])
+
+
+# Mazes of the same size stacked into 3-D (maze, row, column) arrays, so batched solvers can step every maze at once
+# instead of calling a solver (and paying Python's per-call overhead) once per maze
+class MazeBatch:
+    def __init__(self, mazes):
+        self.mazes = [compile_maze(maze) for maze in mazes]
+        if not self.mazes:
+            raise ValueError("A maze batch needs at least one maze")
+        self.rows = self.mazes[0].rows
+        self.cols = self.mazes[0].cols
+        for maze in self.mazes:
+            if (maze.rows, maze.cols) != (self.rows, self.cols):
+                raise ValueError(f"Every maze in a batch has to be {self.rows}x{self.cols}, "
+                                 f"not {maze.rows}x{maze.cols}")
+        # Wall bitmasks of every maze (see compact_maze.DIRECTION_BITS)
+        self.wall_bitmasks = np.stack([np.frombuffer(maze.wall_bitmasks, dtype=np.uint8).reshape(self.rows, self.cols)
+                                       for maze in self.mazes])
+        self.start_cells = np.array([maze.start_cell for maze in self.mazes], dtype=np.int64)
+        self.goal_cells = np.array([maze.goal_cell for maze in self.mazes], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.mazes)
+
+    # Boolean (maze, row, column) array that is only True at one cell of each maze (e.g. its goal cell)
+    def cell_mask(self, cells):
+        mask = np.zeros((len(self), self.rows, self.cols), dtype=bool)
+        mask.reshape(len(self), -1)[np.arange(len(self)), cells] = True
+        return mask
+
+    # Every maze's path (see maze_representations.compact_path.CompactPath) from the cells each maze was at after each
+    # step (shaped (steps + 1, mazes))
+    # Each path ends at the step given in last_steps, empty if that is negative (the target was never reached)
+    def paths(self, cells_of_steps, last_steps):
+        cells_of_mazes = np.ascontiguousarray(cells_of_steps.T, dtype=np.intc)
+        paths = []
+        for maze, last_step in enumerate(last_steps.tolist()):
+            if last_step < 0:
+                paths.append(CompactPath(self.cols))
+                continue
+            # (an array built from bytes copies them straight in instead of converting one value at a time)
+            cells = array('i')
+            cells.frombytes(cells_of_mazes[maze, :last_step + 1].tobytes())
+            paths.append(CompactPath(self.cols, cells))
+        return paths
+
+
+# Split mazes (any mix of sizes) into batches of mazes of the same size, each with at most batch_size mazes (all the
+# mazes of that size if it is None)
+# Yields the positions of a batch's mazes in the list of mazes given along with the batch
+def batches_by_size(mazes, batch_size=None):
+    if batch_size is not None and batch_size <= 0:
+        raise ValueError(f"A batch has to hold at least 1 maze, not {batch_size}")
+    compact_mazes = [compile_maze(maze) for maze in mazes]
+    positions_of_sizes = {}
+    for position, maze in enumerate(compact_mazes):
+        positions_of_sizes.setdefault((maze.rows, maze.cols), []).append(position)
+    for positions in positions_of_sizes.values():
+        mazes_per_batch = batch_size or len(positions)
+        for first_position in range(0, len(positions), mazes_per_batch):
+            batch_positions = positions[first_position:first_position + mazes_per_batch]
+            yield batch_positions, MazeBatch([compact_mazes[position] for position in batch_positions])
@@ -0,0 +1,140 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from maze_representations.compact_maze import CompactMaze, compile_maze
+from maze_representations.maze_generator import DEFAULT_MAZE_GENERATION_ALGORITHM, MAZE_GENERATION_ALGORITHMS, \
+    generate_maze
+
+# Every maze file starts with: magic bytes, format version, rows, columns, number of neighbour entries
+MAZE_FILE_HEADER = struct.Struct('<4sB3xIIQ')
+MAZE_FILE_MAGIC = b'CMAZ'
+MAZE_FILE_VERSION = 1
+MAZE_FILE_EXTENSION = '.maze'
+# Directory the corpus is kept in when no other directory is given
+DEFAULT_CORPUS_DIRECTORY = 'maze_corpus'
+# Generators a maze can be made with: the built-in algorithms of maze_generator, or pyamaze itself (needs Tkinter)
+MAZE_GENERATORS = tuple(MAZE_GENERATION_ALGORITHMS) + ('pyamaze',)
+
+
+# Key a maze is stored under in the corpus
+def maze_key(rows, cols, loop_percent, seed, generator=DEFAULT_MAZE_GENERATION_ALGORITHM):
+    return f"{rows}x{cols}-loop{loop_percent}-seed{seed}-{generator}"
+
+
+# Generate a compact maze with one of the maze generators
+def generate_compact_maze(rows, cols, loop_percent, seed, generator=DEFAULT_MAZE_GENERATION_ALGORITHM):
+    if generator == 'pyamaze':
+        return generate_compact_maze_with_pyamaze(rows, cols, loop_percent, seed)
+    return generate_maze(rows, cols, loop_percent, seed, generator)
+
+
+# Generate a maze with pyamaze, seeding its random generator so the same seed always gives the same maze
+def generate_pyamaze_maze(rows, cols, loop_percent, seed):
+    # Only import pyamaze (and so Tkinter) when a maze actually has to be generated with it
+    from pyamaze import maze
+    random.seed(seed)
+    generated_maze = maze(rows, cols)
+    generated_maze.CreateMaze(loopPercent=loop_percent)
+    return generated_maze
+
+
+# Generate a compact maze with pyamaze
+def generate_compact_maze_with_pyamaze(rows, cols, loop_percent, seed):
+    return compile_maze(generate_pyamaze_maze(rows, cols, loop_percent, seed))
+
+
+# Save a compact maze in the binary maze format (header, wall bitmasks, then the CSR adjacency index)
+def save_compact_maze(compact_maze, file_path):
+    neighbour_offsets = array('i', bytes(compact_maze.neighbour_offsets))
+    neighbour_cells = array('i', bytes(compact_maze.neighbour_cells))
+    # The format is little-endian on every machine
+    if sys.byteorder == 'big':
+        neighbour_offsets.byteswap()
+        neighbour_cells.byteswap()
+    # Write to a temporary file first so a half written maze is never loaded
+    temporary_file_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(temporary_file_path, 'wb') as maze_file:
+        maze_file.write(MAZE_FILE_HEADER.pack(MAZE_FILE_MAGIC, MAZE_FILE_VERSION, compact_maze.rows,
+                                              compact_maze.cols, len(neighbour_cells)))
+        maze_file.write(bytes(compact_maze.wall_bitmasks))
+        # Pad so the integer arrays start on a 4 byte boundary
+        maze_file.write(bytes(-compact_maze.number_of_cells % 4))
+        neighbour_offsets.tofile(maze_file)
+        neighbour_cells.tofile(maze_file)
+    os.replace(temporary_file_path, file_path)
+
+
+# Load a compact maze saved with save_compact_maze
+# With memory_map=True the arrays are views of the memory-mapped file, so only the pages that are used are read
+def load_compact_maze(file_path, memory_map=False):
+    with open(file_path, 'rb') as maze_file:
+        if memory_map:
+            contents = memoryview(mmap.mmap(maze_file.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            contents = memoryview(maze_file.read())
+    magic, version, rows, cols, number_of_neighbour_entries = MAZE_FILE_HEADER.unpack_from(contents)
+    if magic != MAZE_FILE_MAGIC or version != MAZE_FILE_VERSION:
+        raise ValueError(f"{file_path} is not a version {MAZE_FILE_VERSION} maze file")
+    number_of_cells = rows * cols
+    start = MAZE_FILE_HEADER.size
+    wall_bitmasks = contents[start:start + number_of_cells]
+    start += number_of_cells + (-number_of_cells % 4)
+    neighbour_offsets = contents[start:start + 4 * (number_of_cells + 1)]
+    start += 4 * (number_of_cells + 1)
+    neighbour_cells = contents[start:start + 4 * number_of_neighbour_entries]
+    if memory_map and sys.byteorder == 'little':
+        neighbour_offsets = neighbour_offsets.cast('i')
+        neighbour_cells = neighbour_cells.cast('i')
+    else:
+        neighbour_offsets = array_from_bytes('i', neighbour_offsets)
+        neighbour_cells = array_from_bytes('i', neighbour_cells)
+        wall_bitmasks = array_from_bytes('B', wall_bitmasks)
+        if sys.byteorder == 'big':
+            neighbour_offsets.byteswap()
+            neighbour_cells.byteswap()
+    return CompactMaze(rows, cols, wall_bitmasks, neighbour_offsets, neighbour_cells)
+
+
+# Copy raw bytes into a new array of the given type
+def array_from_bytes(typecode, raw_bytes):
+    copied_array = array(typecode)
+    copied_array.frombytes(raw_bytes)
+    return copied_array
+
+
+# Deterministic corpus of mazes generated from (rows, columns, loop percent, seed) and cached on disk
+class MazeCorpus:
+    def __init__(self, directory=DEFAULT_CORPUS_DIRECTORY, generator=DEFAULT_MAZE_GENERATION_ALGORITHM,
+                 memory_map=False):
+        if generator not in MAZE_GENERATORS:
+            raise ValueError(f"Unknown maze generator {generator!r}, expected one of {MAZE_GENERATORS}")
+        self.directory = directory
+        # Name of the maze generator used for mazes that are not cached yet (it is part of every maze's key)
+        self.generator = generator
+        self.memory_map = memory_map
+        os.makedirs(directory, exist_ok=True)
+
+    # File a maze is stored in
+    def maze_file_path(self, key):
+        return os.path.join(self.directory, key + MAZE_FILE_EXTENSION)
+
+    # Get a maze, generating and caching it the first time it is asked for
+    def get(self, rows, cols, loop_percent, seed):
+        file_path = self.maze_file_path(maze_key(rows, cols, loop_percent, seed, self.generator))
+        if not os.path.exists(file_path):
+            save_compact_maze(generate_compact_maze(rows, cols, loop_percent, seed, self.generator), file_path)
+        return load_compact_maze(file_path, self.memory_map)
+
+    # Load a maze that is already in the corpus by its key
+    def load(self, key):
+        return load_compact_maze(self.maze_file_path(key), self.memory_map)
+
+    # Keys of every maze in the corpus
+    def keys(self):
+        return sorted(file_name[:-len(MAZE_FILE_EXTENSION)] for file_name in os.listdir(self.directory)
+                      if file_name.endswith(MAZE_FILE_EXTENSION))
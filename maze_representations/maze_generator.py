@@ -0,0 +1,229 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import random
+from array import array
+from maze_representations.compact_maze import CompactMaze, DIRECTION_BITS
+
+# Bit of each direction in a cell's wall bitmask
+EAST_BIT, WEST_BIT, NORTH_BIT, SOUTH_BIT = (DIRECTION_BITS[direction] for direction in ('E', 'W', 'N', 'S'))
+# Number of random bytes drawn at a time by the randomized depth-first search
+RANDOM_BLOCK_SIZE = 1 << 16
+# Algorithm used when no other one is asked for
+DEFAULT_MAZE_GENERATION_ALGORITHM = 'dfs'
+
+
+# Generate a maze straight into a compact maze, without pyamaze or Tkinter
+# loop_percent has the same meaning as pyamaze's loopPercent (0 gives a perfect maze with exactly one path)
+# The same seed always gives the same maze, and the global random generator is left untouched
+def generate_maze(rows, cols, loop_percent=0, seed=None, algorithm=DEFAULT_MAZE_GENERATION_ALGORITHM):
+    if algorithm not in MAZE_GENERATION_ALGORITHMS:
+        raise ValueError(f"Unknown maze generation algorithm {algorithm!r}, "
+                         f"expected one of {tuple(MAZE_GENERATION_ALGORITHMS)}")
+    if rows <= 0 or cols <= 0:
+        raise ValueError(f"A maze needs a positive number of rows and columns, not {rows}x{cols}")
+    random_generator = random.Random(seed)
+    padded_wall_bitmasks = MAZE_GENERATION_ALGORITHMS[algorithm](rows, cols, random_generator)
+    if loop_percent:
+        add_loops(padded_wall_bitmasks, rows, cols, loop_percent, random_generator)
+    return CompactMaze(rows, cols, remove_border(padded_wall_bitmasks, rows, cols))
+
+
+# The generators work on the grid with a border of cells around it, so a move never has to check the edges of the
+# maze: cell (row, column) is at row * (cols + 2) + column and the border cells are never opened
+def border_cells(rows, cols):
+    width = cols + 2
+    border = bytearray(b'\x01' * width)
+    border += (b'\x01' + bytes(cols) + b'\x01') * rows
+    border += b'\x01' * width
+    return border
+
+
+# Cell of the bordered grid for a flat (row-major) cell ID
+def bordered_cell(cell, cols):
+    return cell + cols + 3 + 2 * (cell // cols)
+
+
+# Copy the wall bitmasks of the cells inside the border into a compact maze's wall bitmasks
+def remove_border(padded_wall_bitmasks, rows, cols):
+    width = cols + 2
+    wall_bitmasks = array('B')
+    for row in range(1, rows + 1):
+        wall_bitmasks.frombytes(padded_wall_bitmasks[row * width + 1:row * width + 1 + cols])
+    return wall_bitmasks
+
+
+# Moves from a cell of the bordered grid as (offset, bit of the direction, bit of the opposite direction)
+def moves(cols):
+    width = cols + 2
+    return ((1, EAST_BIT, WEST_BIT), (-1, WEST_BIT, EAST_BIT),
+            (width, SOUTH_BIT, NORTH_BIT), (-width, NORTH_BIT, SOUTH_BIT))
+
+
+# Randomized depth-first search (recursive backtracker), the algorithm pyamaze uses
+# Gives long winding corridors with few dead ends
+def randomized_depth_first_search(rows, cols, random_generator):
+    width = cols + 2
+    wall_bitmasks = bytearray((rows + 2) * width)
+    # Border cells count as visited so the search never carves into them
+    visited_cells = border_cells(rows, cols)
+    east, west, south, north = moves(cols)
+    # Draw random bytes a block at a time instead of calling random_generator.choice for every move
+    # (a byte modulo the number of choices is uniform for 2 and 4 choices and within 0.4% of uniform for 3)
+    random_bytes = random_generator.randbytes(RANDOM_BLOCK_SIZE)
+    random_index = 0
+    # Start carving from the start square (the bottom right) like pyamaze does
+    present_cell = rows * width + cols
+    visited_cells[present_cell] = 1
+    stack = [present_cell]
+    while stack:
+        present_cell = stack[-1]
+        unvisited_moves = []
+        if not visited_cells[present_cell + 1]:
+            unvisited_moves.append(east)
+        if not visited_cells[present_cell - 1]:
+            unvisited_moves.append(west)
+        if not visited_cells[present_cell + width]:
+            unvisited_moves.append(south)
+        if not visited_cells[present_cell - width]:
+            unvisited_moves.append(north)
+        # Backtrack once every neighbour has been visited
+        if not unvisited_moves:
+            stack.pop()
+            continue
+        if len(unvisited_moves) > 1:
+            random_index += 1
+            if random_index == RANDOM_BLOCK_SIZE:
+                random_bytes = random_generator.randbytes(RANDOM_BLOCK_SIZE)
+                random_index = 0
+            offset, bit, opposite_bit = unvisited_moves[random_bytes[random_index] % len(unvisited_moves)]
+        else:
+            offset, bit, opposite_bit = unvisited_moves[0]
+        neighbouring_cell = present_cell + offset
+        wall_bitmasks[present_cell] |= bit
+        wall_bitmasks[neighbouring_cell] |= opposite_bit
+        visited_cells[neighbouring_cell] = 1
+        stack.append(neighbouring_cell)
+    return wall_bitmasks
+
+
+# Randomized Kruskal's algorithm: open walls in a random order, unless the cells are already connected
+# Connected cells are tracked with a union-find (disjoint set) forest, gives many short dead ends
+def kruskal(rows, cols, random_generator):
+    width = cols + 2
+    wall_bitmasks = bytearray((rows + 2) * width)
+    # Every inner wall as an integer: cell * 2 for the wall to its east, cell * 2 + 1 for the wall to its south
+    walls = [cell * 2 for row in range(1, rows + 1) for cell in range(row * width + 1, row * width + cols)]
+    walls.extend(cell * 2 + 1 for row in range(1, rows) for cell in range(row * width + 1, row * width + cols + 1))
+    random_generator.shuffle(walls)
+    parents = array('i', range(len(wall_bitmasks)))
+    passages_left = rows * cols - 1
+    for wall in walls:
+        cell = wall >> 1
+        neighbouring_cell = cell + width if wall & 1 else cell + 1
+        # Find the root of each cell's set, halving the path to the root along the way
+        root = cell
+        while parents[root] != root:
+            parents[root] = root = parents[parents[root]]
+        neighbouring_root = neighbouring_cell
+        while parents[neighbouring_root] != neighbouring_root:
+            parents[neighbouring_root] = neighbouring_root = parents[parents[neighbouring_root]]
+        if root == neighbouring_root:
+            continue
+        parents[root] = neighbouring_root
+        if wall & 1:
+            wall_bitmasks[cell] |= SOUTH_BIT
+            wall_bitmasks[neighbouring_cell] |= NORTH_BIT
+        else:
+            wall_bitmasks[cell] |= EAST_BIT
+            wall_bitmasks[neighbouring_cell] |= WEST_BIT
+        # A spanning tree of the grid has exactly one passage less than it has cells
+        passages_left -= 1
+        if not passages_left:
+            break
+    return wall_bitmasks
+
+
+# Wilson's algorithm: join cells to the maze with loop-erased random walks
+# Picks uniformly among all perfect mazes (so it has no bias towards long or short corridors), but is the slowest
+def wilson(rows, cols, random_generator):
+    wall_bitmasks = bytearray((rows + 2) * (cols + 2))
+    border = border_cells(rows, cols)
+    possible_moves = moves(cols)
+    in_maze = bytearray(len(wall_bitmasks))
+    in_maze[bordered_cell(random_generator.randrange(rows * cols), cols)] = 1
+    # Move the random walk last left each cell with, following them from the start of a walk erases its loops
+    walk_moves = [None] * len(wall_bitmasks)
+    random_number = random_generator.random
+    cells = list(range(rows * cols))
+    random_generator.shuffle(cells)
+    for walk_start in cells:
+        walk_start = bordered_cell(walk_start, cols)
+        if in_maze[walk_start]:
+            continue
+        # Random walk until a cell of the maze is reached
+        present_cell = walk_start
+        while not in_maze[present_cell]:
+            move = possible_moves[int(random_number() * 4)]
+            while border[present_cell + move[0]]:
+                move = possible_moves[int(random_number() * 4)]
+            walk_moves[present_cell] = move
+            present_cell += move[0]
+        # Add the loop-erased walk to the maze
+        present_cell = walk_start
+        while not in_maze[present_cell]:
+            in_maze[present_cell] = 1
+            offset, bit, opposite_bit = walk_moves[present_cell]
+            wall_bitmasks[present_cell] |= bit
+            wall_bitmasks[present_cell + offset] |= opposite_bit
+            present_cell += offset
+    return wall_bitmasks
+
+
+# Open extra walls so the maze has loops (more than one path), like pyamaze's loopPercent
+# Pyamaze tries to open a wall next to a third of the cells scaled by loopPercent, skipping walls that would
+# leave a fully open 2x2 block of cells
+def add_loops(wall_bitmasks, rows, cols, loop_percent, random_generator):
+    number_of_cells = rows * cols
+    walls_to_open = int(number_of_cells / 3 * loop_percent / 100)
+    border = border_cells(rows, cols)
+    possible_moves = moves(cols)
+    random_number = random_generator.random
+    # Give up after trying as many cells as the maze has, as pyamaze does once it has been through every cell
+    for _ in range(number_of_cells):
+        if walls_to_open <= 0:
+            break
+        cell = int(random_number() * number_of_cells)
+        cell += cols + 3 + 2 * (cell // cols)
+        bitmask = wall_bitmasks[cell]
+        closed_moves = [move for move in possible_moves if not bitmask & move[1] and not border[cell + move[0]]]
+        if not closed_moves:
+            continue
+        offset, bit, opposite_bit = closed_moves[int(random_number() * len(closed_moves))]
+        # opens_block checks the wall from the cell to its west or north
+        if not opens_block(wall_bitmasks, cols + 2, cell + offset if offset < 0 else cell, offset == 1 or offset == -1):
+            wall_bitmasks[cell] |= bit
+            wall_bitmasks[cell + offset] |= opposite_bit
+            walls_to_open -= 1
+
+
+# Check if opening a wall would leave a fully open 2x2 block of cells (pyamaze's isCyclic check)
+# The wall is to the east of the cell if horizontal is True, otherwise to its south
+def opens_block(wall_bitmasks, width, cell, horizontal):
+    if horizontal:
+        # A block with the row below or with the row above
+        below_or_above = wall_bitmasks[cell] & wall_bitmasks[cell + 1]
+        return bool(below_or_above & SOUTH_BIT and wall_bitmasks[cell + width] & EAST_BIT
+                    or below_or_above & NORTH_BIT and wall_bitmasks[cell - width] & EAST_BIT)
+    # A block with the column to the right or with the column to the left
+    right_or_left = wall_bitmasks[cell] & wall_bitmasks[cell + width]
+    return bool(right_or_left & EAST_BIT and wall_bitmasks[cell + 1] & SOUTH_BIT
+                or right_or_left & WEST_BIT and wall_bitmasks[cell - 1] & SOUTH_BIT)
+
+
+# Maze generation algorithms by name, each called as algorithm(rows, cols, random_generator) to get the wall
+# bitmasks of the grid with a border around it
+MAZE_GENERATION_ALGORITHMS = {
+    'dfs': randomized_depth_first_search,
+    'kruskal': kruskal,
+    'wilson': wilson,
+}
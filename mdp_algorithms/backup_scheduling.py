@@ -0,0 +1,105 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import heapq
+from collections import deque
+from mdp_algorithms.stopping_rules import StoppingRule
+
+# Orders in which Bellman backups can be done:
+# 'sweep' - full in-place sweeps in maze_map order (the original behaviour)
+# 'reverse_bfs' - full in-place sweeps ordered by distance from the target, so values flow outwards in one sweep
+# 'prioritized' - prioritized sweeping, always backing up the state with the largest Bellman residual next
+BACKUP_SCHEDULES = ('sweep', 'reverse_bfs', 'prioritized')
+
+
+# Check the backup schedule is one we know about
+def check_backup_schedule(schedule):
+    if schedule not in BACKUP_SCHEDULES:
+        raise ValueError(f"Unknown backup schedule {schedule!r}, expected one of {BACKUP_SCHEDULES}")
+
+
+# Order the cells of a compact maze by their distance from the target (unreachable cells go last)
+def reverse_bfs_order(maze):
+    discovered_squares = bytearray(maze.number_of_cells)
+    discovered_squares[maze.goal_cell] = 1
+    order = [maze.goal_cell]
+    subsequent_squares = deque(order)
+    while subsequent_squares:
+        present_cell = subsequent_squares.popleft()
+        for neighbouring_cell in maze.neighbours(present_cell):
+            if not discovered_squares[neighbouring_cell]:
+                discovered_squares[neighbouring_cell] = 1
+                order.append(neighbouring_cell)
+                subsequent_squares.append(neighbouring_cell)
+    order.extend(cell for cell in range(maze.number_of_cells) if not discovered_squares[cell])
+    return order
+
+
+# Do Bellman backups in the order given by the schedule until the value function converges
+# backup(state, update) returns the change in value of the state (new value - previous value), only changing the
+# value if update is True
+# The stopping rule decides when the full sweeps have converged (see mdp_algorithms.stopping_rules), by default when
+# the largest change of a sweep is below the threshold
+# Returns the number of full sweeps and the number of backups performed
+# If a residuals list is given, the largest change in value of each full sweep is appended to it
+# Seed states (only for prioritized sweeping) are the only states whose residuals are checked at the start, e.g. the
+# squares whose walls changed since the value function last converged
+def run_backups(maze, backup, threshold, schedule='sweep', residuals=None, stopping_rule=None, seed_states=None):
+    check_backup_schedule(schedule)
+    if stopping_rule is None:
+        stopping_rule = StoppingRule(maze, 'residual', threshold)
+    if schedule == 'prioritized':
+        # Prioritized sweeping never does full sweeps, so it can only stop once every residual is below the threshold
+        if stopping_rule.rule != 'residual' or stopping_rule.max_iterations is not None or \
+                stopping_rule.time_budget is not None:
+            raise ValueError("Prioritized sweeping only supports the 'residual' stopping rule without a budget")
+        return prioritized_sweeping(maze, backup, threshold, seed_states)
+    if seed_states is not None:
+        raise ValueError("Only prioritized sweeping can start from seed states")
+    order = maze.cells_in_maze_map_order() if schedule == 'sweep' else reverse_bfs_order(maze)
+    while True:
+        span = None
+        if stopping_rule.needs_span:
+            changes = [backup(state, True) for state in order]
+            max_change_in_value_function = max(abs(change) for change in changes)
+            span = max(changes) - min(changes)
+        else:
+            max_change_in_value_function = 0
+            for state in order:
+                max_change_in_value_function = max(max_change_in_value_function, abs(backup(state, True)))
+        if residuals is not None:
+            residuals.append(max_change_in_value_function)
+        # Break if we reach convergence (or run out of budget)
+        if stopping_rule.iteration_done(max_change_in_value_function, span):
+            return stopping_rule.iterations, stopping_rule.iterations * len(order)
+
+
+# Prioritized sweeping: keep a priority queue of states keyed on their Bellman residual
+# With seed states only those are queued at the start instead of every state, which repairs a converged value function
+# locally when just the seed states' actions changed
+def prioritized_sweeping(maze, backup, threshold, seed_states=None):
+    backups = 0
+    # Residual each state is currently queued with (0 if it is not queued)
+    queued_residuals = [0.0] * maze.number_of_cells
+    # Python's heap is a min heap, so store negative residuals to pop the largest residual first
+    states_to_back_up = []
+    for state in range(maze.number_of_cells) if seed_states is None else set(seed_states):
+        residual = abs(backup(state, False))
+        if residual >= threshold:
+            queued_residuals[state] = residual
+            states_to_back_up.append((-residual, state))
+    heapq.heapify(states_to_back_up)
+    while states_to_back_up:
+        negative_residual, state = heapq.heappop(states_to_back_up)
+        # Skip stale queue entries (the state was backed up or queued again with a different residual since)
+        if queued_residuals[state] != -negative_residual:
+            continue
+        queued_residuals[state] = 0.0
+        backup(state, True)
+        backups += 1
+        # Only the neighbours of a state depend on its value, so only their residuals can have changed
+        for neighbouring_cell in maze.neighbours(state):
+            residual = abs(backup(neighbouring_cell, False))
+            if residual >= threshold and residual > queued_residuals[neighbouring_cell]:
+                queued_residuals[neighbouring_cell] = residual
+                heapq.heappush(states_to_back_up, (-residual, neighbouring_cell))
+    return 0, backups
@@ -0,0 +1,111 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import numpy as np
+from maze_representations.compact_maze import MAZE_MAP_DIRECTION_ORDER
+from maze_representations.maze_batch import open_direction_masks
+from mdp_algorithms.vectorized_value_iteration import best_actions_and_values, random_initial_policy, \
+    shift_values_into_neighbours
+
+
+# Value iteration of every maze in a batch at once (see maze_representations.maze_batch.MazeBatch)
+# Each sweep backs up every square of every maze that has not converged yet with NumPy array operations, exactly like
+# the numpy backend of value iteration does for one maze (see mdp_algorithms.vectorized_value_iteration)
+# A maze stops once the largest change in value of its sweep is below the threshold (or after max_iterations sweeps)
+# Returns a (path, stats) pair for each maze, with its path from the start to the target (empty if the policy does not
+# reach the target) and its sweeps, backups and residuals
+def batched_value_iteration(maze_batch, discount_factor=0.9, threshold=0.005, max_iterations=None):
+    if max_iterations is not None and max_iterations <= 0:
+        raise ValueError(f"The maximum number of iterations has to be at least 1, not {max_iterations}")
+    open_directions = open_direction_masks(maze_batch.wall_bitmasks)
+    goal_mask = maze_batch.cell_mask(maze_batch.goal_cells)
+
+    # Set reward 1000 for each target square and -1 for non-target squares
+    # Blocked directions get a reward of minus infinity instead, so they can never be chosen
+    action_rewards = np.where(open_directions, np.where(goal_mask, 1000.0, -1.0), -np.inf)
+
+    # Set value function with 10000 for each target and -1 for non-target squares
+    value_function = np.where(goal_mask, 10000.0, -1.0)
+
+    # Set initial policy by setting random policies for each square (index into E, W, N, S)
+    policy = random_initial_policy(open_directions)
+    # Final policy of every maze (filled in as the mazes converge)
+    final_policy = policy.copy()
+
+    # Positions in the batch of the mazes still being swept (converged mazes are dropped from the arrays every so often,
+    # so the sweeps only work on the mazes that need them)
+    positions = np.arange(len(maze_batch))
+    # Which of those mazes have not stopped yet (a stopped maze left in the arrays is still swept, but nothing of it is
+    # kept any more)
+    sweeping = np.ones(len(positions), dtype=bool)
+    sweeps = np.zeros(len(maze_batch), dtype=np.int64)
+    # Largest change in value of every maze in each sweep (NaN once a maze stopped)
+    residuals = []
+    # Buffers reused by every sweep
+    next_values = np.empty(open_directions.shape)
+    action_values = np.empty(open_directions.shape)
+    while True:
+        shift_values_into_neighbours(value_function, next_values)
+        # Value of every action from every square
+        np.multiply(next_values, discount_factor, out=action_values)
+        action_values += action_rewards
+        # Like the single maze sweep, ties go to the first direction and only values above 0 change the policy
+        best_actions, best_values = best_actions_and_values(action_values)
+        improving = best_values > 0
+        np.copyto(policy, best_actions, where=improving)
+        # (values not above 0 are set to 0)
+        updated_value_function = np.maximum(best_values, 0.0)
+        max_changes_in_value_function = np.abs(updated_value_function - value_function).max(axis=(1, 2))
+        value_function = updated_value_function
+        sweep_residuals = np.full(len(maze_batch), np.nan)
+        sweep_residuals[positions[sweeping]] = max_changes_in_value_function[sweeping]
+        residuals.append(sweep_residuals)
+        sweeps[positions[sweeping]] += 1
+        # Stop the mazes that reached convergence (or ran out of sweeps)
+        stopping = sweeping & (max_changes_in_value_function < threshold)
+        if max_iterations is not None:
+            stopping |= sweeping & (sweeps[positions] >= max_iterations)
+        final_policy[positions[stopping]] = policy[stopping]
+        sweeping &= ~stopping
+        if not sweeping.any():
+            break
+        # Drop the stopped mazes from the arrays once they are a quarter of them
+        if sweeping.sum() <= len(positions) * 3 // 4:
+            positions = positions[sweeping]
+            value_function = value_function[sweeping]
+            policy = policy[sweeping]
+            action_rewards = action_rewards[:, sweeping]
+            next_values = np.empty(action_rewards.shape)
+            action_values = np.empty(action_rewards.shape)
+            sweeping = sweeping[sweeping]
+
+    paths = batched_follow_policies(maze_batch, final_policy)
+    residuals = np.array(residuals).T.tolist()
+    return [(path, {'sweeps': maze_sweeps, 'backups': maze_sweeps * maze_batch.rows * maze_batch.cols,
+                    'residuals': maze_residuals[:maze_sweeps]})
+            for path, maze_sweeps, maze_residuals in zip(paths, sweeps.tolist(), residuals)]
+
+
+# Follow every maze's policy (a (maze, row, column) array of directions in E, W, N, S order, -1 for none) from its
+# start to its target
+# Returns each maze's path (see maze_representations.compact_path.CompactPath), empty if the policy goes round in
+# circles instead of reaching the target
+def batched_follow_policies(maze_batch, policy):
+    mazes = np.arange(len(maze_batch))
+    number_of_cells = maze_batch.rows * maze_batch.cols
+    # (the extra offset of 0 at the end is the one direction -1 picks)
+    direction_offsets = np.array([maze_batch.mazes[0].direction_offsets[direction]
+                                  for direction in MAZE_MAP_DIRECTION_ORDER] + [0])
+    # The cell each cell's direction leads to (squares without a direction stay where they are)
+    next_cells = np.arange(number_of_cells) + direction_offsets[policy.reshape(len(maze_batch), number_of_cells)]
+    cells = maze_batch.start_cells.copy()
+    # Step on which each maze reached its target (-1 until it has)
+    last_steps = np.where(cells == maze_batch.goal_cells, 0, -1)
+    cells_of_steps = [cells]
+    # A path visiting more squares than the maze has must be going round in circles
+    for step in range(1, number_of_cells):
+        if (last_steps >= 0).all():
+            break
+        cells = np.where(last_steps >= 0, cells, next_cells[mazes, cells])
+        last_steps[(last_steps < 0) & (cells == maze_batch.goal_cells)] = step
+        cells_of_steps.append(cells)
+    return maze_batch.paths(np.array(cells_of_steps), last_steps)
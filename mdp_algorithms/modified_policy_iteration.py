@@ -0,0 +1,117 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+from array import array
+from maze_representations.compact_maze import compile_maze
+from maze_representations.compact_path import CompactPath
+from mdp_algorithms.policy_iteration import POLICY_ITERATION_STOPPING_RULES
+from mdp_algorithms.stopping_rules import StoppingRule
+from mdp_algorithms.utility_functions import follow_policy, save_warm_start, set_initial_cell_rewards, \
+    warm_start_actions, warm_start_value_function
+
+
+# Modified policy iteration algorithm implementation (accepts a pyamaze maze or a compact maze)
+# Like policy iteration, but each policy is only evaluated with a few sweeps (evaluation_sweeps, None evaluates it until
+# convergence) before it is improved, since a rough value function is usually enough to find better actions
+# The policy is deterministic and kept as the cell each cell's action leads to, instead of a dictionary of action
+# probabilities per cell, and the open moves of every cell are only worked out once
+# The report, stopping rules, budgets and warm start work like policy iteration's (see
+# mdp_algorithms.policy_iteration.policy_iteration_algorithm)
+def modified_policy_iteration_algorithm(maze, evaluation_sweeps=5, report=None, stopping_rule='policy_stable',
+                                        evaluation_threshold=0.001, max_iterations=None, time_budget=None,
+                                        discount_factor=0.9, warm_start=None):
+    # Work on the compiled maze (flat integer cell IDs instead of (x,y) tuples)
+    maze = compile_maze(maze)
+    # While the target is not reached yet, keep choosing the best action
+    path = follow_policy(maze, modified_policy_iteration_policy(maze, evaluation_sweeps, report, stopping_rule,
+                                                                evaluation_threshold, max_iterations, time_budget,
+                                                                discount_factor, warm_start))
+    return CompactPath(maze.cols, path)
+
+
+# Find the optimal policy of a compact maze with modified policy iteration
+# Returns the cell each cell's best action leads to (see mdp_algorithms.utility_functions.follow_policy)
+def modified_policy_iteration_policy(maze, evaluation_sweeps=5, report=None, stopping_rule='policy_stable',
+                                     evaluation_threshold=0.001, max_iterations=None, time_budget=None,
+                                     discount_factor=0.9, warm_start=None):
+    if evaluation_sweeps is not None and evaluation_sweeps <= 0:
+        raise ValueError(f"Each policy needs at least 1 evaluation sweep, not {evaluation_sweeps}")
+    if stopping_rule not in POLICY_ITERATION_STOPPING_RULES:
+        raise ValueError(f"Unknown policy iteration stopping rule {stopping_rule!r}, "
+                         f"expected one of {POLICY_ITERATION_STOPPING_RULES}")
+
+    # Set reward 1000 for the target state and -1 for non-target states
+    set_initial_cell_rewards(maze)
+    rewards = maze.rewards
+
+    # The cells each cell's open moves lead to (in the same order as policy iteration tries the actions)
+    next_cells_of_actions = [[maze.step(state, action) for action in maze.valid_actions(state)]
+                             for state in range(maze.number_of_cells)]
+
+    # Set value function as 0 for all states (unless resuming from a warm start)
+    value_function = warm_start_value_function(maze, warm_start) or [0] * maze.number_of_cells
+
+    # The cell each cell's action leads to (a cell without open moves stays where it is)
+    # Start from the warm start's actions that are still open, or the greedy actions of the initial value function
+    policy = array('i', range(maze.number_of_cells))
+    initial_actions = warm_start_actions(maze, warm_start) or [None] * maze.number_of_cells
+    for state, initial_action in enumerate(initial_actions):
+        if initial_action is not None:
+            policy[state] = maze.step(state, initial_action)
+        elif next_cells_of_actions[state]:
+            policy[state] = max(next_cells_of_actions[state], key=lambda next_state: rewards[next_state] +
+                                discount_factor * value_function[next_state])
+
+    stopping = StoppingRule(maze, stopping_rule, max_iterations=max_iterations, time_budget=time_budget,
+                            greedy_next_cell=policy.__getitem__)
+    order = maze.cells_in_maze_map_order()
+    # Total sweeps and backups done while evaluating policies, and the residual of each sweep
+    sweeps = 0
+    residuals = None if report is None else []
+    while True:
+        # Evaluate the current policy with a few sweeps (stopping early if they converge)
+        evaluation_converged = False
+        evaluation_sweeps_done = 0
+        while not evaluation_converged and evaluation_sweeps_done != evaluation_sweeps:
+            max_change_in_value_function = 0
+            for state in order:
+                next_state = policy[state]
+                estimated_state_value = rewards[next_state] + discount_factor * value_function[next_state]
+                change_in_value_function = abs(estimated_state_value - value_function[state])
+                if change_in_value_function > max_change_in_value_function:
+                    max_change_in_value_function = change_in_value_function
+                value_function[state] = estimated_state_value
+            evaluation_sweeps_done += 1
+            if residuals is not None:
+                residuals.append(max_change_in_value_function)
+            evaluation_converged = max_change_in_value_function < evaluation_threshold
+        sweeps += evaluation_sweeps_done
+
+        # Improve the policy greedily with respect to the value function
+        policy_changed = False
+        for state in order:
+            best_next_state = policy[state]
+            best_value = None
+            for next_state in next_cells_of_actions[state]:
+                value = rewards[next_state] + discount_factor * value_function[next_state]
+                # Ties go to the first action, like max() in policy iteration
+                if best_value is None or value > best_value:
+                    best_next_state = next_state
+                    best_value = value
+            if best_next_state != policy[state]:
+                policy[state] = best_next_state
+                policy_changed = True
+        # A policy only counts as stable once its evaluation has converged too, since a few sweeps can leave the values
+        # too rough to show a better action yet
+        stopping.policy_changed = policy_changed or not evaluation_converged
+        if stopping.iteration_done():
+            break
+    if report is not None:
+        report['policy_improvement_rounds'] = stopping.iterations
+        report['sweeps'] = sweeps
+        report['backups'] = sweeps * len(order)
+        report['residuals'] = residuals
+        report['stopped_by'] = stopping.stopped_by
+
+    if warm_start is not None:
+        save_warm_start(warm_start, value_function, policy)
+    return policy
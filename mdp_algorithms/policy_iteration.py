@@ -1,58 +1,119 @@
 # Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
 
-from mdp_algorithms.utility_functions import valid_actions, update_state_based_on_action, set_initial_rewards
+from array import array
+from maze_representations.compact_maze import compile_maze
+from maze_representations.compact_path import CompactPath
+from mdp_algorithms.backup_scheduling import check_backup_schedule, run_backups
+from mdp_algorithms.stopping_rules import StoppingRule
+from mdp_algorithms.utility_functions import follow_policy, save_warm_start, set_initial_cell_rewards, \
+    warm_start_actions, warm_start_value_function
 
 
-def policy_iteration_algorithm(maze):
-    path = []
-    current_state = (maze.rows, maze.cols)
-    path.append(current_state)
-    value_function = {}
-    discount_factor = 0.9
-    maze.rewards = {}
+# Ways of evaluating a policy (the sparse methods solve (I - discount_factor * P)v = r with SciPy)
+EVALUATION_METHODS = ('iterative', 'direct', 'krylov')
+# Stopping rules of the improvement rounds (see mdp_algorithms.stopping_rules, the evaluation uses its threshold)
+POLICY_ITERATION_STOPPING_RULES = ('policy_stable', 'path_stable')
 
-    # Set value function as 0 for all states
-    for state in maze.maze_map:
-        value_function[state] = 0
+
+# Policy iteration algorithm implementation (accepts a pyamaze maze or a compact maze)
+# The schedule picks the order of Bellman backups of the iterative evaluation (see backup_scheduling)
+# If a report dictionary is given, the number of policy improvement rounds, the number of evaluation sweeps and backups
+# performed, the largest change in value of each evaluation sweep (the convergence residuals) and what stopped the
+# improvement rounds are written into it
+# The stopping rule is 'policy_stable' or 'path_stable' (stop as soon as the path from the start stops changing),
+# max_iterations and time_budget (in seconds) stop the improvement rounds early regardless
+# A warm start dictionary resumes from the value function and policy a previous solve left in it (see
+# mdp_algorithms.utility_functions.warm_start_value_function), and is refilled with this solve's
+def policy_iteration_algorithm(maze, evaluation_method='iterative', schedule='sweep', report=None,
+                               stopping_rule='policy_stable', evaluation_threshold=0.001, max_iterations=None,
+                               time_budget=None, discount_factor=0.9, warm_start=None):
+    # Work on the compiled maze (flat integer cell IDs instead of (x,y) tuples)
+    maze = compile_maze(maze)
+    # While the target is not reached yet, keep choosing the best action
+    path = follow_policy(maze, policy_iteration_policy(maze, evaluation_method, schedule, report, stopping_rule,
+                                                       evaluation_threshold, max_iterations, time_budget,
+                                                       discount_factor, warm_start))
+    return CompactPath(maze.cols, path)
+
+
+# Find the optimal policy of a compact maze with policy iteration
+# Returns the cell each cell's best action leads to (see mdp_algorithms.utility_functions.follow_policy)
+def policy_iteration_policy(maze, evaluation_method='iterative', schedule='sweep', report=None,
+                            stopping_rule='policy_stable', evaluation_threshold=0.001, max_iterations=None,
+                            time_budget=None, discount_factor=0.9, warm_start=None):
+    if evaluation_method not in EVALUATION_METHODS:
+        raise ValueError(f"Unknown evaluation method {evaluation_method!r}, expected one of {EVALUATION_METHODS}")
+    if stopping_rule not in POLICY_ITERATION_STOPPING_RULES:
+        raise ValueError(f"Unknown policy iteration stopping rule {stopping_rule!r}, "
+                         f"expected one of {POLICY_ITERATION_STOPPING_RULES}")
+    check_backup_schedule(schedule)
+
+    # Set value function as 0 for all states (unless resuming from a warm start)
+    value_function = warm_start_value_function(maze, warm_start) or [0] * maze.number_of_cells
 
     # Set reward 1000 for the target state and -1 for non-target states
-    set_initial_rewards(maze)
+    set_initial_cell_rewards(maze)
 
     # Complete policy iteration to find the optimal policy
-    policy = policy_improvement(maze, value_function, discount_factor)
+    policy = policy_improvement(maze, value_function, discount_factor, evaluation_method, schedule, report,
+                                stopping_rule, evaluation_threshold, max_iterations, time_budget,
+                                warm_start_actions(maze, warm_start))
 
-    # While the target is not reached yet, keep choosing the best action
-    while current_state != (1, 1):
-        action = max(policy[current_state], key=policy[current_state].get)
-        current_state = update_state_based_on_action(current_state, action)
-        path.append(current_state)
-    return path
+    # The cell the most likely action of each state leads to
+    next_cells = array('i', [maze.step(state, max(policy[state], key=policy[state].get)) if policy[state] else state
+                             for state in range(maze.number_of_cells)])
+    if warm_start is not None:
+        save_warm_start(warm_start, value_function, next_cells)
+    return next_cells
 
 
 # Converge towards an optimal policy by refining it
-def policy_improvement(maze, value_function, discount_factor):
+# The stopping rule decides when to stop refining (by default once a round does not change the policy)
+# Initial actions (e.g. from a warm start) are chosen with probability 1 instead of starting from equal probabilities
+def policy_improvement(maze, value_function, discount_factor, evaluation_method='iterative', schedule='sweep',
+                       report=None, stopping_rule='policy_stable', evaluation_threshold=0.001, max_iterations=None,
+                       time_budget=None, initial_actions=None):
     # Initialize a policy where each state has various actions with equal probability
     current_policy = initialize_policy_for_each_state(maze)
+    if initial_actions is not None:
+        for state, initial_action in enumerate(initial_actions):
+            if initial_action is not None:
+                current_policy[state] = {action: 1 if action == initial_action else 0
+                                         for action in current_policy[state]}
+
+    # The greedy policy moves each state in the direction of its most likely action
+    def greedy_next_cell(state):
+        if not current_policy[state]:
+            return state
+        return maze.step(state, max(current_policy[state], key=current_policy[state].get))
+    stopping = StoppingRule(maze, stopping_rule, max_iterations=max_iterations, time_budget=time_budget,
+                            greedy_next_cell=greedy_next_cell)
+    # Total sweeps and backups done while evaluating policies, and the residual of each sweep
+    sweeps = 0
+    backups = 0
+    residuals = None if report is None else []
     # Find optimal policy
     while True:
         # Track if the policy changes during policy improvement
         policy_has_changed_during_improvement = True
         # Evaluate the current policy
-        policy_evaluation(current_policy, maze, value_function, discount_factor, threshold=0.001)
+        evaluation_sweeps, evaluation_backups = policy_evaluation(current_policy, maze, value_function,
+                                                                  discount_factor, threshold=evaluation_threshold,
+                                                                  method=evaluation_method, schedule=schedule,
+                                                                  residuals=residuals)
+        sweeps += evaluation_sweeps
+        backups += evaluation_backups
         # Iterate over all states in the maze
-        for state in maze.maze_map.keys():
+        for state in maze.cells_in_maze_map_order():
             # Keep track of action values
             expected_values_of_all_actions = {}
             # Keep track of previous action
             action_chosen_by_policy_before_update = max(current_policy[state], key=current_policy[state].get)
             # Iterate through all valid actions
-            for action in valid_actions(state, maze):
-                next_state = update_state_based_on_action(state, action)
-                # If this state is not valid in the maze, use the current state (agent stays in same position)
-                if next_state not in maze.maze_map:
-                    next_state = state
+            for action in maze.valid_actions(state):
+                next_state = maze.step(state, action)
                 # Calculate value of a action at this next state
-                expected_values_of_all_actions[action] = (maze.rewards.get(next_state, 0) +
+                expected_values_of_all_actions[action] = (maze.rewards[next_state] +
                                                           discount_factor * value_function[next_state])
             # Calculate the best possible action
             action_with_highest_expected_value = max(expected_values_of_all_actions,
@@ -66,44 +127,59 @@ def policy_improvement(maze, value_function, discount_factor):
             # Update if the policy has changed to a better one
             if action_chosen_by_policy_before_update != action_with_highest_expected_value:
                 policy_has_changed_during_improvement = False
-        # Break if the policy has improved
-        if policy_has_changed_during_improvement:
+        # Break if the policy has improved (or the stopping rule is met some other way)
+        stopping.policy_changed = not policy_has_changed_during_improvement
+        if stopping.iteration_done():
             break
+    if report is not None:
+        report['policy_improvement_rounds'] = stopping.iterations
+        report['sweeps'] = sweeps
+        report['backups'] = backups
+        report['residuals'] = residuals
+        report['stopped_by'] = stopping.stopped_by
     return current_policy
 
 
 # Initialize a policy where each state has various actions with equal probability
 def initialize_policy_for_each_state(maze):
-    current_policy = {}
-    for state in maze.maze_map.keys():
+    current_policy = [None] * maze.number_of_cells
+    for state in maze.cells_in_maze_map_order():
         current_policy[state] = {}
+        actions = maze.valid_actions(state)
         # Start with uniform policy (set initial probabilities to be equal)
-        for action in valid_actions(state, maze):
+        for action in actions:
             # Set each action to have a probability of 1/total number of valid actions (to have equal probability)
-            current_policy[state][action] = 1.0 / len(valid_actions(state, maze))
+            current_policy[state][action] = 1.0 / len(actions)
     return current_policy
 
 
 # Evaluate the value function until convergence
-def policy_evaluation(policy, maze, value_function, discount_factor, threshold):
-    while True:
-        max_change_in_value_function = 0
-        for state in maze.maze_map.keys():
-            estimated_state_value = 0
-            # Iterate over all actions and their probabilities in the policy
-            for action, probability_of_action in policy[state].items():
-                next_state = update_state_based_on_action(state, action)
-                # If this state is not valid in the maze, use the current state (agent stays in same position)
-                if next_state not in maze.maze_map:
-                    next_state = state
-                # Use Bellman equation for state value estimation
-                estimated_state_value = (estimated_state_value + probability_of_action *
-                                         (maze.rewards.get(next_state, 0) + discount_factor *
-                                          value_function[next_state]))
-            # Change in value function = absolute difference between new value - previous values for each state
-            max_change_in_value_function = max(max_change_in_value_function,
-                                               abs(estimated_state_value - value_function[state]))
+# Returns the number of sweeps and Bellman backups performed (both 0 when a sparse solve was used)
+# If a residuals list is given, the largest change in value of each sweep is appended to it
+def policy_evaluation(policy, maze, value_function, discount_factor, threshold, method='iterative', schedule='sweep',
+                      residuals=None):
+    if method != 'iterative':
+        # Only import SciPy when a sparse solve is actually used
+        from mdp_algorithms.sparse_policy_evaluation import sparse_policy_evaluation
+        # Fall back to the iterative sweep below if the solver did not converge
+        if sparse_policy_evaluation(policy, maze, value_function, discount_factor, threshold, method):
+            return 0, 0
+
+    # Bellman backup of a single state under the policy (the value is only changed if update is True)
+    def bellman_backup(state, update):
+        estimated_state_value = 0
+        # Iterate over all actions and their probabilities in the policy
+        for action, probability_of_action in policy[state].items():
+            next_state = maze.step(state, action)
+            # Use Bellman equation for state value estimation
+            estimated_state_value = (estimated_state_value + probability_of_action *
+                                     (maze.rewards[next_state] + discount_factor *
+                                      value_function[next_state]))
+        # Change in value function = new value - previous value of the state
+        change_in_value_function = estimated_state_value - value_function[state]
+        if update:
             value_function[state] = estimated_state_value
-        # Break if we reach convergence
-        if max_change_in_value_function < threshold:
-            break
+        return change_in_value_function
+
+    # Keep backing up states until the value function converges
+    return run_backups(maze, bellman_backup, threshold, schedule, residuals)
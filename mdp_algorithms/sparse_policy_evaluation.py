@@ -0,0 +1,46 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import numpy as np
+from scipy.sparse import csr_matrix, identity
+from scipy.sparse.linalg import bicgstab, spsolve
+
+# Ways of solving (I - discount_factor * P)v = r for the value function of a policy
+SPARSE_EVALUATION_METHODS = ('direct', 'krylov')
+
+
+# Transition matrix of a policy as a sparse matrix (row = state, column = next state, value = probability)
+def policy_transition_matrix(policy, maze):
+    present_states = []
+    next_states = []
+    probabilities = []
+    for state in range(maze.number_of_cells):
+        for action, probability_of_action in policy[state].items():
+            if probability_of_action:
+                present_states.append(state)
+                next_states.append(maze.step(state, action))
+                probabilities.append(probability_of_action)
+    # Duplicate (state, next state) entries are summed when the matrix is built
+    return csr_matrix((probabilities, (present_states, next_states)),
+                      shape=(maze.number_of_cells, maze.number_of_cells))
+
+
+# Evaluate a policy with one sparse linear solve instead of sweeping until convergence
+# Returns False if the Krylov solver did not converge (the caller then falls back to the iterative sweep)
+def sparse_policy_evaluation(policy, maze, value_function, discount_factor, threshold, method='direct'):
+    if method not in SPARSE_EVALUATION_METHODS:
+        raise ValueError(f"Unknown sparse evaluation method {method!r}, expected one of {SPARSE_EVALUATION_METHODS}")
+    transition_matrix = policy_transition_matrix(policy, maze)
+    # Expected reward of the next state under the policy (r = P * rewards)
+    expected_rewards = transition_matrix @ np.asarray(maze.rewards, dtype=float)
+    system_matrix = (identity(maze.number_of_cells, format='csr') - discount_factor * transition_matrix).tocsc()
+    if method == 'direct':
+        # Sparse LU factorisation
+        solution = spsolve(system_matrix, expected_rewards)
+    else:
+        # Start the Krylov solver from the previous value function, which is close to the answer after round 1
+        solution, info = bicgstab(system_matrix, expected_rewards, x0=np.asarray(value_function, dtype=float),
+                                  atol=threshold)
+        if info != 0:
+            return False
+    value_function[:] = solution.tolist()
+    return True
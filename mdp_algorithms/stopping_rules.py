@@ -0,0 +1,93 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import time
+
+# Rules deciding when an MDP solver has converged enough to stop (an iteration is a sweep of value iteration or an
+# improvement round of policy iteration):
+# 'residual' - the largest change in value of a sweep is below the threshold (the original value iteration rule)
+# 'span' - the span seminorm of a sweep's changes (largest minus smallest change in value) is below the threshold,
+#          values that all move by the same amount cannot change which action is best
+# 'policy_stable' - an iteration did not change the best action of any square (the original policy iteration rule)
+# 'path_stable' - the path the greedy policy takes from the start reaches the target and an iteration did not change
+#                 it (enough when only the path is needed, not a fully converged value function), or the solver has
+#                 fully converged without the path reaching the target
+STOPPING_RULES = ('residual', 'span', 'policy_stable', 'path_stable')
+
+
+# Check the stopping rule is one we know about
+def check_stopping_rule(stopping_rule):
+    if stopping_rule not in STOPPING_RULES:
+        raise ValueError(f"Unknown stopping rule {stopping_rule!r}, expected one of {STOPPING_RULES}")
+
+
+# Decides after each iteration whether a solver can stop, either because its rule says it has converged or because it
+# has used up its budget of iterations or seconds (the reason it stopped is kept in stopped_by)
+# greedy_next_cell(cell) gives the cell the current greedy policy moves to from a cell (needed by 'path_stable'), and
+# the solver sets policy_changed whenever a backup changes the best action of a square (needed by 'policy_stable')
+class StoppingRule:
+    def __init__(self, maze, rule='residual', threshold=0.005, max_iterations=None, time_budget=None,
+                 greedy_next_cell=None):
+        check_stopping_rule(rule)
+        if max_iterations is not None and max_iterations <= 0:
+            raise ValueError(f"The maximum number of iterations has to be at least 1, not {max_iterations}")
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError(f"The time budget has to be more than 0 seconds, not {time_budget}")
+        if rule == 'path_stable' and greedy_next_cell is None:
+            raise ValueError("The 'path_stable' rule needs the greedy policy of the solver")
+        self.maze = maze
+        self.rule = rule
+        self.threshold = threshold
+        self.max_iterations = max_iterations
+        self.time_budget = time_budget
+        self.greedy_next_cell = greedy_next_cell
+        self.policy_changed = False
+        self.iterations = 0
+        self.stopped_by = None
+        self.start_time = time.perf_counter()
+        # Greedy path from the start after the previous iteration (for 'path_stable')
+        self.previous_path = None
+
+    # Whether the span seminorm of the changes has to be worked out for each sweep
+    @property
+    def needs_span(self):
+        return self.rule == 'span'
+
+    # Check the rule after an iteration with its largest absolute change in value and the span of its changes
+    def iteration_done(self, largest_change=None, span=None):
+        self.iterations += 1
+        policy_changed, self.policy_changed = self.policy_changed, False
+        if self.rule == 'residual':
+            converged = largest_change < self.threshold
+        elif self.rule == 'span':
+            converged = span < self.threshold
+        elif self.rule == 'policy_stable':
+            converged = not policy_changed
+        else:
+            path = self.greedy_path()
+            converged = path is not None and path == self.previous_path
+            self.previous_path = path
+        if converged:
+            self.stopped_by = self.rule
+        elif self.rule == 'path_stable' and largest_change is not None and largest_change < self.threshold:
+            # Value iteration has converged, so the path can no longer change
+            self.stopped_by = 'residual'
+        elif self.rule == 'path_stable' and largest_change is None and not policy_changed:
+            # Policy iteration has converged, so the path can no longer change
+            self.stopped_by = 'policy_stable'
+        elif self.max_iterations is not None and self.iterations >= self.max_iterations:
+            self.stopped_by = 'max_iterations'
+        elif self.time_budget is not None and time.perf_counter() - self.start_time >= self.time_budget:
+            self.stopped_by = 'time_budget'
+        return self.stopped_by is not None
+
+    # Path the greedy policy takes from the start, None if it does not reach the target
+    def greedy_path(self):
+        cell = self.maze.start_cell
+        path = [cell]
+        while cell != self.maze.goal_cell:
+            cell = self.greedy_next_cell(cell)
+            path.append(cell)
+            # A path visiting more squares than the maze has must be going round in circles
+            if len(path) > self.maze.number_of_cells:
+                return None
+        return path
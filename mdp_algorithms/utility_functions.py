@@ -1,35 +1,91 @@
 # Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
 
-# Get valid actions from current coordinates
-def valid_actions(coordinates, maze):
-    actions = maze.maze_map[(coordinates[0], coordinates[1])]
-    valid_actions_to_take = []
-    for direction, valid in actions.items():
-        if valid:
-            valid_actions_to_take.append(direction)
-    return valid_actions_to_take
-
-
-# Update a state/square based on an action
-def update_state_based_on_action(state, action):
-    if action == 'N':
-        updated_state = (state[0] - 1, state[1])
-    elif action == 'E':
-        updated_state = (state[0], state[1] + 1)
-    elif action == 'S':
-        updated_state = (state[0] + 1, state[1])
-    elif action == 'W':
-        updated_state = (state[0], state[1] - 1)
-    else:
-        # Unknown action supplied, so default to original state
-        updated_state = state
-    return updated_state
-
-
-# Set initial rewards where the target square has a reward of 1000 and non target squares have -1
-def set_initial_rewards(maze):
-    for state in maze.maze_map:
-        if state == (1, 1):
-            maze.rewards[state] = 1000
-        else:
-            maze.rewards[state] = -1
+from array import array
+
+
+# Set initial rewards of a compact maze where the target cell has a reward of 1000 and non target cells have -1
+def set_initial_cell_rewards(compact_maze):
+    compact_maze.rewards = [-1] * compact_maze.number_of_cells
+    compact_maze.rewards[compact_maze.goal_cell] = 1000
+
+
+# Follow a policy from the start cell of a compact maze to its goal cell
+# The policy gives the cell each cell's chosen action leads to
+# Returns the cells of the path in order (see maze_representations.compact_path.CompactPath), no cells if the policy
+# does not reach the goal (e.g. a solver stopped by its iteration or time budget before the policy got there)
+def follow_policy(compact_maze, next_cells, start_cell=None):
+    current_state = compact_maze.start_cell if start_cell is None else start_cell
+    path = array('i', [current_state])
+    while current_state != compact_maze.goal_cell:
+        current_state = next_cells[current_state]
+        path.append(current_state)
+        # A path visiting more squares than the maze has must be going round in circles
+        if len(path) > compact_maze.number_of_cells:
+            return array('i')
+    return path
+
+
+# A warm start is a dictionary a solver fills with its final 'value_function' (value of each cell ID) and 'policy'
+# (the cell each cell's chosen action leads to), so a later solve of a related problem (another discount factor or
+# threshold, or the same maze with a few walls changed) can resume from them instead of starting from scratch
+# Get the value function to resume from (None if there is nothing to resume from)
+def warm_start_value_function(compact_maze, warm_start):
+    if not warm_start or 'value_function' not in warm_start:
+        return None
+    if len(warm_start['value_function']) != compact_maze.number_of_cells:
+        raise ValueError(f"The warm start has {len(warm_start['value_function'])} values, but the maze has "
+                         f"{compact_maze.number_of_cells} squares")
+    return list(warm_start['value_function'])
+
+
+# Get the action of each cell to resume from (None for cells whose move is no longer open, or if there is nothing to
+# resume from)
+def warm_start_actions(compact_maze, warm_start):
+    if not warm_start or 'policy' not in warm_start:
+        return None
+    next_cells = warm_start['policy']
+    if len(next_cells) != compact_maze.number_of_cells:
+        raise ValueError(f"The warm start has a policy for {len(next_cells)} squares, but the maze has "
+                         f"{compact_maze.number_of_cells} squares")
+    actions = [None] * compact_maze.number_of_cells
+    for cell, next_cell in enumerate(next_cells):
+        for action in compact_maze.valid_actions(cell):
+            if compact_maze.step(cell, action) == next_cell:
+                actions[cell] = action
+                break
+    return actions
+
+
+# Keep the final value function and policy of a solve in the warm start dictionary
+def save_warm_start(warm_start, value_function, next_cells):
+    warm_start['value_function'] = array('d', value_function)
+    warm_start['policy'] = array('i', next_cells)
+
+
+# Warm start built from the distance of every cell to the goal (see search_algorithms.wavefront_bfs), so value
+# iteration starts at its fixed point instead of sweeping the rewards out from the goal square by square
+# The policy moves every cell one step closer to the goal, and the value of a cell d steps away is what value
+# iteration converges to along that path: -1 for every step plus the goal's value discounted d times (0 if that is not
+# above 0, and 0 for cells that cannot reach the goal)
+def goal_distance_warm_start(maze, discount_factor=0.9, backend='numpy'):
+    # Only import NumPy when this warm start is actually used
+    import numpy as np
+    from maze_representations.compact_maze import compile_maze
+    from search_algorithms.wavefront_bfs import wavefront_distance_field
+    compact_maze = compile_maze(maze)
+    goal_cell = compact_maze.goal_cell
+    distances, predecessors = wavefront_distance_field(compact_maze, goal_cell, backend=backend)
+    goal_neighbours = compact_maze.neighbours(goal_cell)
+    # The goal keeps moving to a neighbour and straight back (1000 every other step, -1 in between)
+    goal_value = (1000 - discount_factor) / (1 - discount_factor ** 2) if len(goal_neighbours) else 0.0
+    reached = distances >= 0
+    discounts = np.where(reached, discount_factor ** np.where(reached, distances, 0).astype(np.float64), 0.0)
+    value_function = np.where(reached, np.maximum(discounts * goal_value - (1 - discounts) / (1 - discount_factor),
+                                                  0.0), 0.0)
+    # Every cell reached moves to the cell it was reached from (towards the goal), the rest stay where they are
+    next_cells = np.where(predecessors >= 0, predecessors, np.arange(compact_maze.number_of_cells))
+    if len(goal_neighbours):
+        next_cells[goal_cell] = goal_neighbours[0]
+    warm_start = {}
+    save_warm_start(warm_start, value_function.tolist(), next_cells.tolist())
+    return warm_start
@@ -1,76 +1,137 @@
 # Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
 
 import random
-from mdp_algorithms.utility_functions import valid_actions, set_initial_rewards, update_state_based_on_action
+from array import array
+from maze_representations.compact_maze import compile_maze
+from maze_representations.compact_path import CompactPath
+from mdp_algorithms.backup_scheduling import check_backup_schedule, run_backups
+from mdp_algorithms.stopping_rules import StoppingRule, check_stopping_rule
+from mdp_algorithms.utility_functions import follow_policy, save_warm_start, set_initial_cell_rewards, \
+    warm_start_actions, warm_start_value_function
 
 
-def value_iteration_algorithm(maze):
-    path = []
-    current_state = (maze.rows, maze.cols)
-    path.append(current_state)
-    potential_actions = {}
-    decay = 0.9
-    threshold = 0.005
-    maze.rewards = {}
+# Backends that can run value iteration
+VALUE_ITERATION_BACKENDS = ('python', 'numpy')
+
+
+# Value iteration algorithm implementation (accepts a pyamaze maze or a compact maze)
+# The numpy backend does each sweep as whole-grid array operations instead of looping over squares
+# The schedule picks the order of Bellman backups (see mdp_algorithms.backup_scheduling.BACKUP_SCHEDULES)
+# If a report dictionary is given, the number of sweeps and backups performed, the largest change in value of each
+# sweep (the convergence residuals) and what stopped the sweeps are written into it
+# The stopping rule is a name from mdp_algorithms.stopping_rules.STOPPING_RULES ('path_stable' stops as soon as the
+# path from the start stops changing), max_iterations and time_budget (in seconds) stop the sweeps early regardless
+# A warm start dictionary resumes from the value function and policy a previous solve left in it (see
+# mdp_algorithms.utility_functions.warm_start_value_function), and is refilled with this solve's
+# Changed cells (e.g. the cells maze_representations.dynamic_maze.DynamicMaze.set_wall returned) repair the warm start
+# of the maze before its walls changed with prioritized sweeping seeded from just those cells, instead of re-solving
+def value_iteration_algorithm(maze, backend='python', schedule='sweep', report=None, stopping_rule='residual',
+                              threshold=0.005, max_iterations=None, time_budget=None, discount_factor=0.9,
+                              warm_start=None, changed_cells=None):
+    # Work on the compiled maze (flat integer cell IDs instead of (x,y) tuples)
+    maze = compile_maze(maze)
+    # While the target is not reached yet, keep choosing the best action
+    path = follow_policy(maze, value_iteration_policy(maze, backend, schedule, report, stopping_rule, threshold,
+                                                      max_iterations, time_budget, discount_factor, warm_start,
+                                                      changed_cells))
+    return CompactPath(maze.cols, path)
+
+
+# Find the optimal policy of a compact maze with value iteration
+# Returns the cell each cell's best action leads to (see mdp_algorithms.utility_functions.follow_policy)
+def value_iteration_policy(maze, backend='python', schedule='sweep', report=None, stopping_rule='residual',
+                           threshold=0.005, max_iterations=None, time_budget=None, discount_factor=0.9,
+                           warm_start=None, changed_cells=None):
+    if backend not in VALUE_ITERATION_BACKENDS:
+        raise ValueError(f"Unknown value iteration backend {backend!r}, expected one of {VALUE_ITERATION_BACKENDS}")
+    check_backup_schedule(schedule)
+    check_stopping_rule(stopping_rule)
+    if backend == 'numpy' and schedule != 'sweep':
+        raise ValueError("The numpy backend updates every square at once, so it only supports the 'sweep' schedule")
+    if changed_cells is not None:
+        if backend != 'python' or schedule not in ('sweep', 'prioritized'):
+            raise ValueError("Repairing changed cells uses prioritized sweeping with the python backend")
+        if warm_start_value_function(maze, warm_start) is None:
+            raise ValueError("Repairing changed cells needs the warm start of a solve before the walls changed")
+        # Only the changed cells' actions changed, so the residuals can only have grown there at first
+        schedule = 'prioritized'
+    decay = discount_factor
+
+    if backend == 'numpy':
+        # Only import NumPy when it is actually used
+        from mdp_algorithms.vectorized_value_iteration import vectorized_value_iteration
+        return vectorized_value_iteration(maze, decay, threshold, report, stopping_rule, max_iterations, time_budget,
+                                          warm_start)
 
     # Set reward 1000 for the target state and -1 for non-target states
-    set_initial_rewards(maze)
-
-    # Iterate through all rows
-    for row in range(1, maze.rows + 1):
-        # Iterate through all columns
-        for column in range(1, maze.cols + 1):
-            present_square = (row, column)
-            # Initialize no actions for the current square
-            potential_actions[present_square] = []
-            directions = {'North': 'N', 'East': 'E', 'South': 'S', 'West': 'W'}
-            # Go to all directions
-            for direction in directions.values():
-                # If the present square has a valid path in the current direction, save it as a potential action
-                if maze.maze_map[present_square][direction]:
-                    potential_actions[present_square] = valid_actions((row, column), maze)
-
-    # Set value function with 10000 for the target and -1 for non-target squares
-    value_function = {}
-    for square in maze.maze_map:
-        if square == (1, 1):
-            value_function[square] = 10000
-        elif square in potential_actions.keys():
-            value_function[square] = -1
-
-    # Set initial policy by setting random policies for each cell
-    policy = {}
-    for potential_action in potential_actions.keys():
-        policy[potential_action] = random.choice(potential_actions[potential_action])
-
-    while True:
-        max_change_in_value_function = 0
-        # Iterate through all squares in the maze
-        for state in maze.maze_map:
-            updated_value = 0
-            previous_value = value_function[state]
-            # Iterate through all potential actions for the present square
-            for action in potential_actions[state]:
-                next_state = update_state_based_on_action(state, action)
-                value = (maze.rewards[state] + (decay * value_function[tuple(next_state)]))
-                # Check if the action is better
-                if value > updated_value:
-                    # If so, store this action and update the value
-                    policy[state] = action
-                    updated_value = value
+    set_initial_cell_rewards(maze)
+
+    # The potential actions of each square are the directions that are open from it
+    potential_actions = [maze.valid_actions(state) for state in range(maze.number_of_cells)]
 
+    # Set value function with 10000 for the target and -1 for non-target squares (unless resuming from a warm start)
+    value_function = warm_start_value_function(maze, warm_start)
+    if value_function is None:
+        value_function = [-1] * maze.number_of_cells
+        value_function[maze.goal_cell] = 10000
+
+    # Set initial policy by setting random policies for each cell (keeping the warm start's actions that are still open)
+    policy = warm_start_actions(maze, warm_start) or [None] * maze.number_of_cells
+    # (a square walled in on every side has no action)
+    policy = [action if action is not None or not actions else random.choice(actions)
+              for action, actions in zip(policy, potential_actions)]
+
+    # Decides when the sweeps can stop (the greedy policy moves each square in the direction of its best action)
+    stopping = StoppingRule(maze, stopping_rule, threshold, max_iterations, time_budget,
+                            greedy_next_cell=lambda state: maze.step(state, policy[state]) if policy[state] else state)
+
+    # Squares whose value a repair of changed cells backed up
+    repaired_cells = None if changed_cells is None else set(changed_cells)
+
+    # Bellman backup of a single square (the value and policy are only changed if update is True)
+    def bellman_backup(state, update):
+        updated_value = 0
+        best_action = None
+        # Iterate through all potential actions for the present square
+        for action in potential_actions[state]:
+            next_state = maze.step(state, action)
+            value = (maze.rewards[state] + (decay * value_function[next_state]))
+            # Check if the action is better
+            if value > updated_value:
+                # If so, store this action and update the value
+                best_action = action
+                updated_value = value
+        # Change in value function = new value - previous value of the state
+        change_in_value_function = updated_value - value_function[state]
+        if update:
             # Update the value of the current state
             value_function[state] = updated_value
-            # Change in value function = absolute difference between new value - previous values for each state
-            max_change_in_value_function = max(max_change_in_value_function,
-                                               abs(previous_value - value_function[state]))
-        # Break if we reach convergence
-        if max_change_in_value_function < threshold:
-            break
+            if repaired_cells is not None:
+                repaired_cells.add(state)
+            if best_action is not None and best_action != policy[state]:
+                policy[state] = best_action
+                stopping.policy_changed = True
+        return change_in_value_function
 
-    # While the target is not reached yet, keep choosing the best action
-    while current_state != (1, 1):
-        action = policy[current_state]
-        current_state = update_state_based_on_action(current_state, action)
-        path.append(current_state)
-    return path
+    # Keep backing up squares until the value function converges
+    residuals = None if report is None else []
+    sweeps, backups = run_backups(maze, bellman_backup, threshold, schedule, residuals, stopping, changed_cells)
+    if repaired_cells is not None:
+        # Values that fall after a wall closes can stop within the threshold of their old best action's value, so pick
+        # the best action again around every repaired square (its neighbours' values changed too)
+        for state in repaired_cells.union(*[maze.neighbours(cell) for cell in repaired_cells]):
+            bellman_backup(state, True)
+            backups += 1
+    if report is not None:
+        report['sweeps'] = sweeps
+        report['backups'] = backups
+        report['residuals'] = residuals
+        # Prioritized sweeping stops on its own once every residual is below the threshold
+        report['stopped_by'] = stopping.stopped_by or 'residual'
+
+    # The cell the best action of each square leads to
+    next_cells = array('i', [maze.step(state, action) if action is not None else state
+                             for state, action in enumerate(policy)])
+    if warm_start is not None:
+        save_warm_start(warm_start, value_function, next_cells)
+    return next_cells
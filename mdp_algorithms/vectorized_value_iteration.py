@@ -0,0 +1,145 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import random
+from array import array
+import numpy as np
+from maze_representations.compact_maze import MAZE_MAP_DIRECTION_ORDER
+from maze_representations.maze_batch import open_direction_masks
+from mdp_algorithms.stopping_rules import StoppingRule
+from mdp_algorithms.utility_functions import save_warm_start, warm_start_value_function
+
+
+# Open-direction masks of a compact maze as a (4, rows, cols) boolean array in E, W, N, S order
+def wall_mask_arrays(compact_maze):
+    wall_bitmasks = np.frombuffer(compact_maze.wall_bitmasks, dtype=np.uint8).reshape(compact_maze.rows,
+                                                                                     compact_maze.cols)
+    return open_direction_masks(wall_bitmasks)
+
+
+# Copy the value of the neighbouring square in every direction into next_values (E, W, N, S order)
+# The value function is one grid (rows, cols) or a stack of grids (mazes, rows, cols)
+def shift_values_into_neighbours(value_function, next_values):
+    # Squares on the edge of the grid have no neighbour in that direction (those moves are always masked out)
+    next_values.fill(-np.inf)
+    next_values[0, ..., :-1] = value_function[..., 1:]
+    next_values[1, ..., 1:] = value_function[..., :-1]
+    next_values[2, ..., 1:, :] = value_function[..., :-1, :]
+    next_values[3, ..., :-1, :] = value_function[..., 1:, :]
+
+
+# Best action of every square and its value from the values of every action (directions first, E, W, N, S order)
+# Ties go to the first direction like argmax, but finding the maximum first and then the first direction reaching it
+# with integer arithmetic is several times faster than argmax over the directions (the slowest-changing axis)
+def best_actions_and_values(action_values):
+    best_values = action_values.max(axis=0)
+    best_actions = np.full(best_values.shape, len(action_values) - 1, dtype=np.int8)
+    for direction in range(len(action_values) - 2, -1, -1):
+        # Squares where this direction is as good as the best move to it (earlier directions are checked later)
+        best_actions -= (action_values[direction] == best_values).view(np.int8) * (best_actions - np.int8(direction))
+    return best_actions, best_values
+
+
+# Random initial policy choosing uniformly between the open directions of each square (-1 if there are none)
+def random_initial_policy(open_directions):
+    # Seed NumPy from the random module so random.seed() still makes runs reproducible
+    generator = np.random.default_rng(random.getrandbits(64))
+    number_of_open_directions = open_directions.sum(axis=0)
+    chosen_direction = np.floor(generator.random(number_of_open_directions.shape) *
+                                number_of_open_directions).astype(np.int64)
+    # The chosen direction is the open direction whose running count of open directions reaches chosen_direction + 1
+    open_direction_count = np.cumsum(open_directions, axis=0)
+    is_chosen = open_directions & (open_direction_count == chosen_direction + 1)
+    return np.where(number_of_open_directions > 0, is_chosen.argmax(axis=0), -1)
+
+
+# Value iteration where each Bellman backup updates the whole grid at once with NumPy array operations
+# Returns the cell each square's best action leads to
+# If a report dictionary is given, the number of sweeps and backups, the residual of each sweep and what stopped the
+# sweeps are written into it (see mdp_algorithms.stopping_rules for the stopping rule and budgets)
+# A warm start dictionary is resumed from and refilled like the pure Python value iteration's
+def vectorized_value_iteration(compact_maze, decay, threshold, report=None, stopping_rule='residual',
+                               max_iterations=None, time_budget=None, warm_start=None):
+    open_directions = wall_mask_arrays(compact_maze)
+    blocked_directions = ~open_directions
+    goal_row, goal_column = divmod(compact_maze.goal_cell, compact_maze.cols)
+
+    # Set reward 1000 for the target state and -1 for non-target states
+    rewards = np.full((compact_maze.rows, compact_maze.cols), -1.0)
+    rewards[goal_row, goal_column] = 1000
+
+    # Set value function with 10000 for the target and -1 for non-target squares (unless resuming from a warm start)
+    warm_start_values = warm_start_value_function(compact_maze, warm_start)
+    if warm_start_values is None:
+        value_function = np.full((compact_maze.rows, compact_maze.cols), -1.0)
+        value_function[goal_row, goal_column] = 10000
+    else:
+        value_function = np.array(warm_start_values, dtype=np.float64).reshape(compact_maze.rows, compact_maze.cols)
+
+    # Set initial policy by setting random policies for each cell (index into E, W, N, S)
+    policy = random_initial_policy(open_directions)
+    # Cell ID offset of a move in each direction (E, W, N, S)
+    direction_offsets = np.array([compact_maze.direction_offsets[direction] for direction in MAZE_MAP_DIRECTION_ORDER])
+    # Keep the warm start's moves that are still open
+    if warm_start and 'policy' in warm_start:
+        resume_warm_start_policy(compact_maze, warm_start, open_directions, direction_offsets, policy)
+
+    # Decides when the sweeps can stop (the greedy policy moves each square in the direction of its best action)
+    def greedy_next_cell(cell):
+        direction = policy.flat[cell]
+        return cell + int(direction_offsets[direction]) if direction >= 0 else cell
+    stopping = StoppingRule(compact_maze, stopping_rule, threshold, max_iterations, time_budget, greedy_next_cell)
+
+    # Buffers reused by every sweep
+    next_values = np.empty(open_directions.shape)
+    action_values = np.empty(open_directions.shape)
+    # Largest change in value of each sweep
+    residuals = []
+    while True:
+        shift_values_into_neighbours(value_function, next_values)
+        # Value of every action from every square, blocked directions can never be chosen
+        np.multiply(next_values, decay, out=action_values)
+        action_values += rewards
+        np.copyto(action_values, -np.inf, where=blocked_directions)
+        # Like the pure Python sweep, ties go to the first direction and only values above 0 change the policy
+        best_actions, best_values = best_actions_and_values(action_values)
+        improving = best_values > 0
+        if stopping_rule == 'policy_stable':
+            stopping.policy_changed = bool((policy[improving] != best_actions[improving]).any())
+        policy[improving] = best_actions[improving]
+        updated_value_function = np.where(improving, best_values, 0.0)
+        # Change in value function = new value - previous value for each state
+        changes_in_value_function = updated_value_function - value_function
+        max_change_in_value_function = float(np.abs(changes_in_value_function).max())
+        span = float(changes_in_value_function.max() - changes_in_value_function.min()) if stopping.needs_span else None
+        value_function = updated_value_function
+        residuals.append(max_change_in_value_function)
+        # Break if we reach convergence (or run out of budget)
+        if stopping.iteration_done(max_change_in_value_function, span):
+            break
+    if report is not None:
+        report['sweeps'] = len(residuals)
+        report['backups'] = len(residuals) * compact_maze.number_of_cells
+        report['residuals'] = residuals
+        report['stopped_by'] = stopping.stopped_by
+
+    # The cell the best action of each square leads to (squares without open directions stay where they are)
+    policy = policy.ravel()
+    cells = np.arange(compact_maze.number_of_cells)
+    next_cells = array('i')
+    next_cells.frombytes(np.where(policy >= 0, cells + direction_offsets[policy], cells).astype(np.intc).tobytes())
+    if warm_start is not None:
+        # (an array built from bytes copies them straight in instead of converting one value at a time)
+        save_warm_start(warm_start, value_function.astype(np.float64).tobytes(), next_cells)
+    return next_cells
+
+
+# Set the direction of every square whose move in the warm start's policy is still open
+def resume_warm_start_policy(compact_maze, warm_start, open_directions, direction_offsets, policy):
+    if len(warm_start['policy']) != compact_maze.number_of_cells:
+        raise ValueError(f"The warm start has a policy for {len(warm_start['policy'])} squares, but the maze has "
+                         f"{compact_maze.number_of_cells} squares")
+    moves = (np.array(warm_start['policy'], dtype=np.int64) -
+             np.arange(compact_maze.number_of_cells)).reshape(policy.shape)
+    for direction in range(len(MAZE_MAP_DIRECTION_ORDER)):
+        resumed = open_directions[direction] & (moves == direction_offsets[direction])
+        policy[resumed] = direction
@@ -1,59 +1,101 @@
 # Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
 
-from queue import PriorityQueue
-from search_algorithms.utility_functions import set_neighbouring_square, construct_path_from_dictionary
-
-
-# A star algorithm implementation using manhattan heuristic
-def a_star_algorithm(maze):
-    # Set the (x,y) coordinates of the starting square
-    initial_maze_square = (maze.rows, maze.cols)
-    # Before we start, lets keep track of explored squares and how we got there
-    explored_squares = {}
-    # Use a priority queue to keep track of nodes to explore
-    nodes_to_explore = PriorityQueue()
-    nodes_to_explore.put((manhattan_distance(initial_maze_square, (1, 1)),
-                          manhattan_distance(initial_maze_square, (1, 1)), initial_maze_square))
-    # G-score is the cost from the start
-    g_score = dict.fromkeys(maze.grid, float('inf'))
-    g_score[initial_maze_square] = 0
-    # F-Score is the cost from the start + estimated cost (i.e. heuristic with manhattan distance)
-    f_score = dict.fromkeys(maze.grid, float('inf'))
-    f_score[initial_maze_square] = manhattan_distance(initial_maze_square, (1, 1))
-    # Start with initial maze square!
-    maze_area_to_search = [initial_maze_square]
+import heapq
+from array import array
+from itertools import count
+from maze_representations.compact_maze import compile_maze
+from maze_representations.compact_path import path_from_parents
+from search_algorithms.heuristics import heuristic_table
+from search_algorithms.utility_functions import EXPLORED_EVENT, FRONTIER_EVENT, PATH_EVENT, collect_search_events, \
+    write_search_report
+
+# Ways of breaking ties between squares with the same F-Score
+TIE_BREAKING_POLICIES = ('higher_g', 'fifo', 'lifo')
+
+
+# A star algorithm implementation (accepts a pyamaze maze or a compact maze)
+# The heuristic is a name from search_algorithms.heuristics.HEURISTICS or a prebuilt table indexed by cell ID
+# If a report dictionary is given, the search counters are written into it (see write_search_report)
+def a_star_algorithm(maze, tie_breaking='higher_g', heuristic='manhattan', report=None):
+    return collect_search_events(a_star_search_events(maze, tie_breaking, heuristic, frontier_events=False,
+                                                      report=report))
+
+
+# A star algorithm yielding its search events as it goes (see search_algorithms.utility_functions for the events)
+# Nothing is buffered, so the search space can be shown or logged while the search is still running
+def a_star_search_events(maze, tie_breaking='higher_g', heuristic='manhattan', frontier_events=True, report=None):
+    if tie_breaking not in TIE_BREAKING_POLICIES:
+        raise ValueError(f"Unknown tie breaking policy {tie_breaking!r}, expected one of {TIE_BREAKING_POLICIES}")
+    # Work on the compiled maze (flat integer cell IDs instead of (x,y) tuples)
+    compact_maze = compile_maze(maze)
+    # Set the cell ID of the starting square and the target square
+    initial_cell = compact_maze.start_cell
+    target_cell = compact_maze.goal_cell
+    # Estimated cost from each cell to the target (built once per maze and heuristic, then reused)
+    estimated_cost_to_target = heuristic_table(compact_maze, target_cell, heuristic)
+    # Before we start, lets keep track of explored squares and how we got there (parent cell ID of each cell)
+    explored_squares = array('i', [-1]) * compact_maze.number_of_cells
+    # G-score is the cost from the start (every step between neighbouring squares costs 1)
+    g_score = array('d', [float('inf')]) * compact_maze.number_of_cells
+    g_score[initial_cell] = 0
+    # Squares that have already been expanded with their best G-score (the closed set)
+    closed_squares = bytearray(compact_maze.number_of_cells)
+    # Insertion counter used by the FIFO/LIFO tie breaking policies
+    insertion_order = count()
+    # Use a binary heap of (F-score, tie breaker, cell) to keep track of nodes to explore
+    nodes_to_explore = [(estimated_cost_to_target[initial_cell],
+                         tie_breaker(tie_breaking, 0, insertion_order), initial_cell)]
+    # Squares are yielded as (x,y) tuples like pyamaze uses
+    square = compact_maze.square
+    # Heap pops and the most squares waiting to be explored at once (only counted when there is a report)
+    frontier_pops = frontier_peak = 0
     # Keep looping until we have explored everything necessary
-    while not nodes_to_explore.empty():
-        # Get the 3rd element in tuple (i.e. square we are presently at)
-        _, _, present_square = nodes_to_explore.get()
+    while nodes_to_explore:
+        if report is not None:
+            frontier_pops += 1
+            frontier_peak = max(frontier_peak, len(nodes_to_explore))
+        # Get the 3rd element in tuple (i.e. cell we are presently at)
+        _, _, present_cell = heapq.heappop(nodes_to_explore)
+        # Skip stale heap entries of squares that were already expanded (lazy deletion)
+        if closed_squares[present_cell]:
+            continue
+        closed_squares[present_cell] = 1
         # Add the current cell to the search space
-        maze_area_to_search.append(present_square)
+        yield EXPLORED_EVENT, square(present_cell)
         # If we reached the target, break out of the loop!
-        if present_square == (1, 1):
+        if present_cell == target_cell:
             break
-        # Pyamaze takes single letter representations of each cardinal direction
-        directions = {'North': 'N', 'East': 'E', 'South': 'S', 'West': 'W'}
-        # Otherwise, explore potentially neighbouring squares and update G-Score/F-Score if a better path is found
-        for direction in directions.values():
-            if maze.maze_map[present_square][direction]:
-                # Set the neighbouring square (x,y) based on the direction and the square we are presenting at
-                neighbouring_square = set_neighbouring_square(direction, present_square)
-                # Set a temporary G-Score and F-Score
-                tentative_g_score = g_score[present_square]
-                tentative_f_score = tentative_g_score + manhattan_distance(neighbouring_square, (1, 1))
-                # If the tentative F-score (total estimated cost) for reaching 'neighbouring_square' is lower, update!
-                if tentative_f_score < f_score[neighbouring_square]:
-                    explored_squares[neighbouring_square] = present_square
-                    f_score[neighbouring_square] = tentative_f_score
-                    g_score[neighbouring_square] = tentative_g_score
-                    nodes_to_explore.put((tentative_f_score,
-                                          manhattan_distance(neighbouring_square, (1, 1)),
-                                          neighbouring_square))
-    # Construct the path from the start to the target square
-    path_to_target = construct_path_from_dictionary(initial_maze_square, explored_squares)
-    return maze_area_to_search, path_to_target
-
-
-# Manhattan distance between 2 points for the heuristic (instead of Euclidean distance which would underestimate it)
-def manhattan_distance(starting_maze_square, ending_maze_square):
-    return abs(starting_maze_square[0] - ending_maze_square[0]) + abs(starting_maze_square[1] - ending_maze_square[1])
+        # Otherwise, explore neighbouring cells and update G-Score if a better path is found
+        tentative_g_score = g_score[present_cell] + 1
+        for neighbouring_cell in compact_maze.neighbours(present_cell):
+            # Ignore squares that have already been expanded or already have a path that is at least as short
+            if closed_squares[neighbouring_cell] or tentative_g_score >= g_score[neighbouring_cell]:
+                continue
+            explored_squares[neighbouring_cell] = present_cell
+            g_score[neighbouring_cell] = tentative_g_score
+            # F-Score is the cost from the start + estimated cost (i.e. the heuristic)
+            tentative_f_score = tentative_g_score + estimated_cost_to_target[neighbouring_cell]
+            heapq.heappush(nodes_to_explore, (tentative_f_score,
+                                              tie_breaker(tie_breaking, tentative_g_score, insertion_order),
+                                              neighbouring_cell))
+            if frontier_events:
+                yield FRONTIER_EVENT, square(neighbouring_cell)
+    # Construct the path from the start to the target square by walking the parents back from the target
+    path_to_target = path_from_parents(compact_maze.cols, initial_cell, explored_squares, target_cell)
+    if report is not None:
+        # Every closed square was expanded except the target (closing it ends the search), and every square pushed
+        # onto the heap was either popped or is still on it
+        write_search_report(report, closed_squares.count(1) - closed_squares[target_cell], frontier_pops,
+                            frontier_pops + len(nodes_to_explore), frontier_peak)
+    yield PATH_EVENT, path_to_target
+
+
+# Secondary heap key for squares with equal F-Scores (smaller keys are explored first)
+def tie_breaker(tie_breaking, g_score, insertion_order):
+    if tie_breaking == 'higher_g':
+        # Prefer squares further from the start (i.e. closer to the target)
+        return -g_score
+    elif tie_breaking == 'fifo':
+        return next(insertion_order)
+    # LIFO prefers the most recently added square
+    return -next(insertion_order)
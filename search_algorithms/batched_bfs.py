@@ -0,0 +1,82 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import numpy as np
+from maze_representations.compact_maze import MAZE_MAP_DIRECTION_ORDER
+from maze_representations.maze_batch import open_direction_masks
+
+
+# Spread a wavefront of squares (a boolean (..., rows, cols) array) one step through every open wall
+# Open directions are the matching (4, ..., rows, cols) masks in E, W, N, S order
+def spread_wavefront(wavefront, open_directions):
+    moving = wavefront & open_directions
+    spread = np.zeros_like(wavefront)
+    spread[..., :, 1:] |= moving[0, ..., :, :-1]
+    spread[..., :, :-1] |= moving[1, ..., :, 1:]
+    spread[..., :-1, :] |= moving[2, ..., 1:, :]
+    spread[..., 1:, :] |= moving[3, ..., :-1, :]
+    return spread
+
+
+# Distance of the squares of every maze in a batch from that maze's target, found with a BFS backwards from the
+# targets that expands a whole wavefront of squares (in every maze at once) per step instead of one square at a time
+# With stop_at_start, a maze stops spreading once its wavefront reaches its start (like BFS stops at the target)
+# Returns the (maze, row, column) distances (-1 for squares that were not reached) and the squares each maze expanded
+def batched_wavefront_distances(maze_batch, stop_at_start=True):
+    open_directions = open_direction_masks(maze_batch.wall_bitmasks)
+    wavefront = maze_batch.cell_mask(maze_batch.goal_cells)
+    start_mask = maze_batch.cell_mask(maze_batch.start_cells)
+    reached = wavefront.copy()
+    distances = np.full(wavefront.shape, -1, dtype=np.int32)
+    distances[wavefront] = 0
+    nodes_expanded = np.zeros(len(maze_batch), dtype=np.int64)
+    distance = 0
+    while True:
+        if stop_at_start:
+            # Mazes whose start has been reached are done
+            wavefront &= ~(reached & start_mask).any(axis=(1, 2))[:, np.newaxis, np.newaxis]
+        if not wavefront.any():
+            return distances, nodes_expanded
+        nodes_expanded += wavefront.sum(axis=(1, 2))
+        distance += 1
+        # Only squares no earlier wavefront reached join the next one
+        wavefront = spread_wavefront(wavefront, open_directions) & ~reached
+        reached |= wavefront
+        distances[wavefront] = distance
+
+
+# Walk every maze's shortest path from its start to its target, always stepping to an open neighbour one square closer
+# (the distances come from batched_wavefront_distances)
+# Returns each maze's path (see maze_representations.compact_path.CompactPath), empty if its target cannot be reached
+def batched_descend_distances(maze_batch, distances):
+    mazes = np.arange(len(maze_batch))
+    number_of_cells = maze_batch.rows * maze_batch.cols
+    distances = distances.reshape(len(maze_batch), number_of_cells)
+    open_directions = open_direction_masks(maze_batch.wall_bitmasks).reshape(-1, len(maze_batch), number_of_cells)
+    direction_offsets = [maze_batch.mazes[0].direction_offsets[direction] for direction in MAZE_MAP_DIRECTION_ORDER]
+    cells = maze_batch.start_cells.copy()
+    path_lengths = distances[mazes, cells]
+    cells_of_steps = [cells]
+    for _ in range(max(int(path_lengths.max()), 0)):
+        distances_to_go = distances[mazes, cells]
+        # Mazes already at their target (or that cannot reach it) stay where they are
+        moved = distances_to_go <= 0
+        next_cells = cells.copy()
+        for direction, direction_offset in enumerate(direction_offsets):
+            # Moves off the grid are never open, so clipping them only keeps the lookup in bounds
+            neighbouring_cells = np.clip(cells + direction_offset, 0, number_of_cells - 1)
+            moves = ~moved & open_directions[direction, mazes, cells] & \
+                (distances[mazes, neighbouring_cells] == distances_to_go - 1)
+            next_cells[moves] = neighbouring_cells[moves]
+            moved |= moves
+        cells = next_cells
+        cells_of_steps.append(cells)
+    return maze_batch.paths(np.array(cells_of_steps), path_lengths)
+
+
+# Breadth-first search of every maze in a batch at once (see maze_representations.maze_batch.MazeBatch)
+# Returns a (path, stats) pair for each maze, with its path from the start to the target (empty if the target cannot be
+# reached) and the number of squares expanded
+def batched_bfs(maze_batch):
+    distances, nodes_expanded = batched_wavefront_distances(maze_batch)
+    paths = batched_descend_distances(maze_batch, distances)
+    return [(path, {'nodes_expanded': expanded}) for path, expanded in zip(paths, nodes_expanded.tolist())]
@@ -0,0 +1,112 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import heapq
+from array import array
+from maze_representations.compact_maze import compile_maze
+from maze_representations.compact_path import path_from_next_cells, path_from_parents
+from search_algorithms.heuristics import heuristic_table
+from search_algorithms.utility_functions import convert_cells_to_squares
+
+
+# Bidirectional A star algorithm implementation (accepts a pyamaze maze or a compact maze)
+# One A* runs from the start towards the target and another from the target towards the start until the shortest
+# path where they meet cannot be beaten by any square the two searches still have to explore
+# Both searches use the average of the heuristic to the target and the heuristic to the start (balanced
+# heuristics), which keeps the stopping rule simple and explores fewer squares than using each heuristic on its own
+# The heuristic is a name from search_algorithms.heuristics.HEURISTICS (it needs a table for both directions)
+def bidirectional_a_star_algorithm(maze, heuristic='manhattan'):
+    # Work on the compiled maze (flat integer cell IDs instead of (x,y) tuples)
+    compact_maze = compile_maze(maze)
+    # Set the cell ID of the starting square and the target square
+    initial_cell = compact_maze.start_cell
+    target_cell = compact_maze.goal_cell
+    # Estimated cost from each cell to the target and to the start (built once per maze and heuristic, then reused)
+    estimated_cost_to_target = heuristic_table(compact_maze, target_cell, heuristic)
+    estimated_cost_to_start = heuristic_table(compact_maze, initial_cell, heuristic)
+    forward_search = BidirectionalSearch(compact_maze, initial_cell, estimated_cost_to_target, estimated_cost_to_start)
+    backward_search = BidirectionalSearch(compact_maze, target_cell, estimated_cost_to_start, estimated_cost_to_target)
+    # Start with empty search space
+    maze_area_to_search = []
+    # Length of the shortest path found so far and the passage joining its two halves, as (square reached by the
+    # forward search, square reached by the backward search)
+    shortest_path_length = 0 if initial_cell == target_cell else float('inf')
+    meeting_squares = None
+    # With balanced heuristics no path through the squares still to explore is shorter than the sum of the lowest
+    # F-Score of each search (a search that has nothing left to explore has an F-Score of infinity)
+    while forward_search.lowest_f_score() + backward_search.lowest_f_score() < shortest_path_length:
+        # Expand the search with fewer squares waiting to be explored
+        if len(forward_search.nodes_to_explore) <= len(backward_search.nodes_to_explore):
+            search, other_search = forward_search, backward_search
+        else:
+            search, other_search = backward_search, forward_search
+        present_cell = search.expand_next_cell()
+        # Add the current cell to the search space
+        maze_area_to_search.append(present_cell)
+        # Every neighbour the other search has reached joins the two searches into a path
+        for neighbouring_cell in compact_maze.neighbours(present_cell):
+            path_length = search.g_score[present_cell] + 1 + other_search.g_score[neighbouring_cell]
+            if path_length < shortest_path_length:
+                shortest_path_length = path_length
+                meeting_squares = ((present_cell, neighbouring_cell) if search is forward_search
+                                   else (neighbouring_cell, present_cell))
+    # Construct the path from the start to where the searches meet, then on from there to the target (a start that
+    # is already the target is the whole path, the searches never meet across a passage then)
+    path_cells = array('i', [initial_cell]) if initial_cell == target_cell else array('i')
+    if meeting_squares is not None:
+        forward_cell, backward_cell = meeting_squares
+        # (the backward search's parents lead on towards the target)
+        path_cells = path_from_parents(compact_maze.cols, initial_cell, forward_search.explored_squares,
+                                       forward_cell).cells
+        path_cells += path_from_next_cells(compact_maze.cols, backward_cell, backward_search.explored_squares,
+                                           target_cell).cells
+    return convert_cells_to_squares(compact_maze, maze_area_to_search, path_cells)
+
+
+# One direction of a bidirectional A* search
+class BidirectionalSearch:
+    def __init__(self, compact_maze, initial_cell, estimated_cost_to_destination, estimated_cost_from_origin):
+        self.compact_maze = compact_maze
+        # Estimated cost from each cell to the square this search is heading for and from the square it started at
+        self.estimated_cost_to_destination = estimated_cost_to_destination
+        self.estimated_cost_from_origin = estimated_cost_from_origin
+        # Keep track of explored squares and how we got there (parent cell ID of each cell)
+        self.explored_squares = array('i', [-1]) * compact_maze.number_of_cells
+        # G-score is the cost from the square this search started at (every step costs 1)
+        self.g_score = array('d', [float('inf')]) * compact_maze.number_of_cells
+        self.g_score[initial_cell] = 0
+        # Squares that have already been expanded with their best G-score (the closed set)
+        self.closed_squares = bytearray(compact_maze.number_of_cells)
+        # Binary heap of (F-score, -G-score, cell), ties go to squares further from where the search started
+        self.nodes_to_explore = [(self.balanced_heuristic(initial_cell), 0, initial_cell)]
+
+    # Half the difference between the estimated cost to the destination and from the origin
+    # (the balanced heuristics of the two directions add up to 0, so they agree on which squares are promising)
+    def balanced_heuristic(self, cell):
+        return (self.estimated_cost_to_destination[cell] - self.estimated_cost_from_origin[cell]) / 2
+
+    # Lowest F-Score of the squares waiting to be explored (dropping stale heap entries of squares that were already
+    # expanded on the way)
+    def lowest_f_score(self):
+        while self.nodes_to_explore and self.closed_squares[self.nodes_to_explore[0][2]]:
+            heapq.heappop(self.nodes_to_explore)
+        return self.nodes_to_explore[0][0] if self.nodes_to_explore else float('inf')
+
+    # Expand the square with the lowest F-Score and return it (lowest_f_score has already dropped stale entries)
+    def expand_next_cell(self):
+        _, _, present_cell = heapq.heappop(self.nodes_to_explore)
+        self.closed_squares[present_cell] = 1
+        # Explore neighbouring cells and update G-Score if a better path is found
+        tentative_g_score = self.g_score[present_cell] + 1
+        for neighbouring_cell in self.compact_maze.neighbours(present_cell):
+            # Ignore squares that have already been expanded or already have a path that is at least as short
+            if self.closed_squares[neighbouring_cell] or tentative_g_score >= self.g_score[neighbouring_cell]:
+                continue
+            # Squares the heuristic knows cannot reach the destination are never worth exploring
+            if self.estimated_cost_to_destination[neighbouring_cell] == float('inf'):
+                continue
+            self.explored_squares[neighbouring_cell] = present_cell
+            self.g_score[neighbouring_cell] = tentative_g_score
+            # F-Score is the cost from the origin + the balanced heuristic
+            heapq.heappush(self.nodes_to_explore, (tentative_g_score + self.balanced_heuristic(neighbouring_cell),
+                                                   -tentative_g_score, neighbouring_cell))
+        return present_cell
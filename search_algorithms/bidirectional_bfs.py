@@ -0,0 +1,70 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+from array import array
+from maze_representations.compact_maze import compile_maze
+from maze_representations.compact_path import path_from_next_cells, path_from_parents
+from search_algorithms.utility_functions import convert_cells_to_squares
+
+
+# Bidirectional breadth first search algorithm implementation (accepts a pyamaze maze or a compact maze)
+# One BFS runs from the start and another from the target, each expanding a whole layer at a time (the smaller
+# frontier goes next) until the two searches meet in the middle
+def bidirectional_bfs_algorithm(maze):
+    # Work on the compiled maze (flat integer cell IDs instead of (x,y) tuples)
+    compact_maze = compile_maze(maze)
+    # Set the cell ID of the starting square and the target square
+    initial_cell = compact_maze.start_cell
+    target_cell = compact_maze.goal_cell
+    # Start with the target in the search space (the backward search starts from it)
+    maze_area_to_search = [target_cell] if target_cell != initial_cell else []
+    # Parent cell ID of each cell found by the forward search (pointing back towards the start) and by the backward
+    # search (pointing on towards the target)
+    forward_parents = array('i', [-1]) * compact_maze.number_of_cells
+    backward_parents = array('i', [-1]) * compact_maze.number_of_cells
+    # Distance from the start and to the target of each cell found by each search (-1 if it has not been found yet)
+    forward_distances = array('i', [-1]) * compact_maze.number_of_cells
+    backward_distances = array('i', [-1]) * compact_maze.number_of_cells
+    forward_distances[initial_cell] = 0
+    backward_distances[target_cell] = 0
+    forward_frontier = [initial_cell]
+    backward_frontier = [target_cell]
+    # Cell where the two searches meet on the shortest path found so far
+    meeting_cell = initial_cell if initial_cell == target_cell else -1
+    # Keep expanding layers until the searches meet (or one of them runs out of squares to explore)
+    while meeting_cell < 0 and forward_frontier and backward_frontier:
+        # Expand the smaller frontier, so the search from the side with fewer branches does more of the work
+        if len(forward_frontier) <= len(backward_frontier):
+            frontier, parents, distances = forward_frontier, forward_parents, forward_distances
+            other_distances = backward_distances
+        else:
+            frontier, parents, distances = backward_frontier, backward_parents, backward_distances
+            other_distances = forward_distances
+        next_frontier = []
+        shortest_meeting_distance = float('inf')
+        for present_cell in frontier:
+            distance = distances[present_cell] + 1
+            for neighbouring_cell in compact_maze.neighbours(present_cell):
+                # If the neighbouring square has already been found by this search, ignore it
+                if distances[neighbouring_cell] >= 0:
+                    continue
+                distances[neighbouring_cell] = distance
+                parents[neighbouring_cell] = present_cell
+                maze_area_to_search.append(neighbouring_cell)
+                next_frontier.append(neighbouring_cell)
+                # The other search found this square too, so there is a path through it
+                # (keep going to the end of the layer, a later square of the layer can give a shorter path)
+                if other_distances[neighbouring_cell] >= 0 and \
+                        distance + other_distances[neighbouring_cell] < shortest_meeting_distance:
+                    shortest_meeting_distance = distance + other_distances[neighbouring_cell]
+                    meeting_cell = neighbouring_cell
+        if frontier is forward_frontier:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+    # Construct the path from the start to the meeting square, then on from the meeting square to the target
+    path_cells = array('i')
+    if meeting_cell >= 0:
+        path_cells = path_from_parents(compact_maze.cols, initial_cell, forward_parents, meeting_cell).cells
+        # (the meeting square is the last square of the first part and the first square of the second)
+        path_cells += path_from_next_cells(compact_maze.cols, meeting_cell, backward_parents, target_cell).cells[1:]
+    return convert_cells_to_squares(compact_maze, maze_area_to_search, path_cells)
@@ -0,0 +1,120 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import heapq
+from array import array
+from maze_representations.compact_maze import compile_maze
+from maze_representations.corridor_graph import corridor_graph
+from search_algorithms.heuristics import heuristic_table
+from search_algorithms.utility_functions import convert_cells_to_squares
+
+
+# A star algorithm on the corridor graph of the maze (accepts a pyamaze maze or a compact maze)
+# Only junctions and dead ends are expanded, a whole corridor is crossed in one step
+# The heuristic is a name from search_algorithms.heuristics.HEURISTICS or a prebuilt table indexed by cell ID
+def corridor_a_star_algorithm(maze, heuristic='manhattan'):
+    # Work on the compiled maze (flat integer cell IDs instead of (x,y) tuples)
+    compact_maze = compile_maze(maze)
+    return corridor_search(compact_maze, heuristic_table(compact_maze, compact_maze.goal_cell, heuristic))
+
+
+# Breadth first search on the corridor graph of the maze (accepts a pyamaze maze or a compact maze)
+# Corridors have different lengths, so the breadth first order becomes uniform cost search (A* without a heuristic)
+def corridor_bfs_algorithm(maze):
+    # Work on the compiled maze (flat integer cell IDs instead of (x,y) tuples)
+    compact_maze = compile_maze(maze)
+    return corridor_search(compact_maze, heuristic_table(compact_maze, compact_maze.goal_cell, 'zero'))
+
+
+# A* over the junctions and dead ends of a compact maze, expanding the corridors it crossed back into a path of cells
+# The search space is the squares of the junctions and dead ends that were expanded
+def corridor_search(compact_maze, estimated_cost_to_target):
+    graph = corridor_graph(compact_maze)
+    # Set the cell ID of the starting square and the target square
+    initial_cell = compact_maze.start_cell
+    target_cell = compact_maze.goal_cell
+    # G-score of each node is the number of steps from the start
+    g_score = array('d', [float('inf')]) * graph.number_of_nodes
+    # Edge each node was reached by (-1 if it was reached straight from the start)
+    parent_edges = array('i', [-1]) * graph.number_of_nodes
+    # The start may be in the middle of a corridor: keep the cells walked from it to the node at each end
+    start_legs = {}
+    for node, steps, cells in graph.entry_points(initial_cell):
+        if steps < g_score[node]:
+            g_score[node] = steps
+            start_legs[node] = cells
+    # So may the target: the nodes at the ends of its corridor finish the path in that many more steps
+    target_legs = {}
+    for node, steps, cells in graph.entry_points(target_cell):
+        if node not in target_legs or steps < target_legs[node][0]:
+            target_legs[node] = (steps, cells)
+    # Length of the shortest path found so far and the node it leaves the graph at (-1 if it never touches a node)
+    shortest_path_length = float('inf')
+    last_node = -1
+    # The start and target can be on the same corridor (or be the same square) with a path that stays on it
+    cells_between = [] if initial_cell == target_cell else graph.cells_between_on_corridor(initial_cell, target_cell)
+    if cells_between is not None:
+        shortest_path_length = 0 if initial_cell == target_cell else len(cells_between) + 1
+    # Squares that have already been expanded with their best G-score (the closed set)
+    closed_nodes = bytearray(graph.number_of_nodes)
+    # Use a binary heap of (F-score, -G-score, node) to keep track of nodes to explore
+    nodes_to_explore = [(g_score[node] + estimated_cost_to_target[graph.node_cells[node]], -g_score[node], node)
+                        for node in start_legs]
+    heapq.heapify(nodes_to_explore)
+    # Start with empty search space
+    maze_area_to_search = []
+    while nodes_to_explore:
+        f_score, _, present_node = heapq.heappop(nodes_to_explore)
+        # Skip stale heap entries of nodes that were already expanded (lazy deletion)
+        if closed_nodes[present_node]:
+            continue
+        # No node left to explore can lead to a path shorter than the shortest one found
+        if f_score >= shortest_path_length:
+            break
+        closed_nodes[present_node] = 1
+        # Add the current junction or dead end to the search space
+        maze_area_to_search.append(graph.node_cells[present_node])
+        # The target is the node itself or on one of its corridors
+        if present_node in target_legs and g_score[present_node] + target_legs[present_node][0] < shortest_path_length:
+            shortest_path_length = g_score[present_node] + target_legs[present_node][0]
+            last_node = present_node
+        # Cross each corridor leaving the node and update G-Score if a better path is found
+        for edge in range(graph.edge_offsets[present_node], graph.edge_offsets[present_node + 1]):
+            neighbouring_node = graph.edge_targets[edge]
+            tentative_g_score = g_score[present_node] + graph.edge_weights[edge]
+            # Ignore nodes that have already been expanded or already have a path that is at least as short
+            if closed_nodes[neighbouring_node] or tentative_g_score >= g_score[neighbouring_node]:
+                continue
+            g_score[neighbouring_node] = tentative_g_score
+            parent_edges[neighbouring_node] = edge
+            # F-Score is the cost from the start + estimated cost (i.e. the heuristic)
+            heapq.heappush(nodes_to_explore, (tentative_g_score +
+                                              estimated_cost_to_target[graph.node_cells[neighbouring_node]],
+                                              -tentative_g_score, neighbouring_node))
+    # Construct the path from the start to the target square
+    path = []
+    if last_node >= 0:
+        path = expand_path(graph, initial_cell, target_cell, last_node, parent_edges, start_legs, target_legs)
+    elif cells_between is not None:
+        path = [initial_cell] + cells_between + [target_cell] if initial_cell != target_cell else [initial_cell]
+    return convert_cells_to_squares(compact_maze, maze_area_to_search, path)
+
+
+# Expand the path over the corridor graph ending at last_node back into the cells from the start to the target
+def expand_path(graph, initial_cell, target_cell, last_node, parent_edges, start_legs, target_legs):
+    # Collect the cells backwards, from the target to the start
+    cells = [target_cell]
+    cells.extend(target_legs[last_node][1])
+    node = last_node
+    if graph.node_cells[node] != target_cell:
+        cells.append(graph.node_cells[node])
+    # Follow the corridors the nodes were reached by back to the first node
+    while parent_edges[node] >= 0:
+        edge = parent_edges[node]
+        cells.extend(reversed(graph.corridor(edge)))
+        node = graph.edge_sources[edge]
+        cells.append(graph.node_cells[node])
+    cells.extend(reversed(start_legs[node]))
+    if graph.node_cells[node] != initial_cell:
+        cells.append(initial_cell)
+    cells.reverse()
+    return cells
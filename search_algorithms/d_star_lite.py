@@ -0,0 +1,121 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import heapq
+from array import array
+from maze_representations.compact_maze import compile_maze
+from maze_representations.compact_path import CompactPath
+
+
+# D* Lite incremental search (accepts a pyamaze maze or a compact maze, walls can only change on a DynamicMaze)
+# The search runs backwards from the target, so when walls change (update_walls) or the start moves (move_start) only
+# the squares whose distance to the target changed are expanded again instead of searching the whole maze again
+# With a start that never moves this is Lifelong Planning A* (LPA*) run from the target
+class DStarLite:
+    def __init__(self, maze):
+        self.maze = compile_maze(maze)
+        number_of_cells = self.maze.number_of_cells
+        self.start_cell = self.maze.start_cell
+        self.goal_cell = self.maze.goal_cell
+        self.start_row, self.start_column = divmod(self.start_cell, self.maze.cols)
+        # G-score is the distance to the target found when a square was last expanded, RHS-score is the one-step
+        # lookahead from its neighbours' G-scores (a square whose scores differ is inconsistent and has to be expanded)
+        self.g_score = array('d', [float('inf')]) * number_of_cells
+        self.rhs_score = array('d', [float('inf')]) * number_of_cells
+        self.rhs_score[self.goal_cell] = 0
+        # Added to every key when the start moves, so keys already in the heap stay lower bounds (instead of
+        # recalculating every key)
+        self.key_modifier = 0
+        # Key each inconsistent square is queued with, heap entries with any other key are stale (lazy deletion)
+        self.queued_keys = {self.goal_cell: self.calculate_key(self.goal_cell)}
+        self.squares_to_expand = [(self.queued_keys[self.goal_cell], self.goal_cell)]
+        # Number of squares expanded by every search so far
+        self.nodes_expanded = 0
+        self.compute_shortest_path()
+
+    # Manhattan distance from the start to a square (it never overestimates, whichever walls are open)
+    def heuristic(self, cell):
+        row, column = divmod(cell, self.maze.cols)
+        return abs(row - self.start_row) + abs(column - self.start_column)
+
+    # Priority of a square as (F-Score, G-Score), compared in that order
+    def calculate_key(self, cell):
+        g_score = min(self.g_score[cell], self.rhs_score[cell])
+        return g_score + self.heuristic(cell) + self.key_modifier, g_score
+
+    # Work out the RHS-score of a square again and queue it if it became inconsistent (or unqueue it if it did not)
+    def update_square(self, cell):
+        if cell != self.goal_cell:
+            self.rhs_score[cell] = min((self.g_score[neighbouring_cell] for neighbouring_cell
+                                        in self.maze.neighbours(cell)), default=float('inf')) + 1
+        if self.g_score[cell] != self.rhs_score[cell]:
+            key = self.queued_keys[cell] = self.calculate_key(cell)
+            heapq.heappush(self.squares_to_expand, (key, cell))
+        else:
+            self.queued_keys.pop(cell, None)
+
+    # Lowest key in the heap (dropping stale entries on the way), infinite if nothing is queued
+    def lowest_key(self):
+        while self.squares_to_expand and \
+                self.queued_keys.get(self.squares_to_expand[0][1]) != self.squares_to_expand[0][0]:
+            heapq.heappop(self.squares_to_expand)
+        return self.squares_to_expand[0][0] if self.squares_to_expand else (float('inf'), float('inf'))
+
+    # Expand inconsistent squares until the start is consistent and no queued square can shorten its path
+    def compute_shortest_path(self):
+        while self.lowest_key() < self.calculate_key(self.start_cell) or \
+                self.rhs_score[self.start_cell] != self.g_score[self.start_cell]:
+            old_key, present_cell = heapq.heappop(self.squares_to_expand)
+            del self.queued_keys[present_cell]
+            new_key = self.calculate_key(present_cell)
+            # The key is out of date (the start has moved since it was queued), so queue it again with the new one
+            if old_key < new_key:
+                self.queued_keys[present_cell] = new_key
+                heapq.heappush(self.squares_to_expand, (new_key, present_cell))
+                continue
+            self.nodes_expanded += 1
+            if self.g_score[present_cell] > self.rhs_score[present_cell]:
+                # A shorter path was found, so the neighbours may be able to use it
+                self.g_score[present_cell] = self.rhs_score[present_cell]
+                for neighbouring_cell in self.maze.neighbours(present_cell):
+                    self.update_square(neighbouring_cell)
+            else:
+                # The path got longer (e.g. a wall was closed), so the square and its neighbours have to look again
+                self.g_score[present_cell] = float('inf')
+                for neighbouring_cell in self.maze.neighbours(present_cell):
+                    self.update_square(neighbouring_cell)
+                self.update_square(present_cell)
+
+    # Replan after the walls of some cells changed (e.g. the cells DynamicMaze.set_wall returned)
+    def update_walls(self, changed_cells):
+        for cell in changed_cells:
+            self.update_square(cell)
+        self.compute_shortest_path()
+
+    # Replan from a new start (e.g. after the agent took a step along the path)
+    def move_start(self, start_cell):
+        self.key_modifier += self.heuristic(start_cell)
+        self.start_cell = start_cell
+        self.start_row, self.start_column = divmod(start_cell, self.maze.cols)
+        self.compute_shortest_path()
+
+    # Length of the shortest path from the start to the target, None if the target cannot be reached
+    def distance(self):
+        distance = self.g_score[self.start_cell]
+        return None if distance == float('inf') else int(distance)
+
+    # Cells of the shortest path from the start to the target, empty if the target cannot be reached
+    def path_cells(self):
+        if self.distance() is None:
+            return []
+        cell = self.start_cell
+        path = [cell]
+        # Every step goes to the neighbour closest to the target
+        while cell != self.goal_cell:
+            cell = min(self.maze.neighbours(cell), key=self.g_score.__getitem__)
+            path.append(cell)
+        return path
+
+    # Shortest path from the start to the target (see maze_representations.compact_path.CompactPath), empty if the
+    # target cannot be reached
+    def path(self):
+        return CompactPath(self.maze.cols, self.path_cells())
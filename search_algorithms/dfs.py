@@ -1,46 +1,68 @@
 # Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
 
-from search_algorithms.utility_functions import set_neighbouring_square, construct_path_from_dictionary
+from array import array
+from maze_representations.compact_maze import compile_maze
+from maze_representations.compact_path import path_from_parents
+from search_algorithms.utility_functions import EXPLORED_EVENT, FRONTIER_EVENT, PATH_EVENT, collect_search_events, \
+    write_search_report
 
 
-# Depth first search algorithm implementation
-def dfs_algorithm(maze):
-    # Set the (x,y) coordinates of the starting square
-    initial_maze_square = (maze.rows, maze.cols)
-    # Start with empty search space
-    maze_area_to_search = []
-    # Before we start, lets keep track of explored squares and how we got there
-    explored_squares = {}
+# Depth first search algorithm implementation (accepts a pyamaze maze or a compact maze)
+# If a report dictionary is given, the search counters are written into it (see write_search_report)
+def dfs_algorithm(maze, report=None):
+    return collect_search_events(dfs_search_events(maze, frontier_events=False, report=report))
+
+
+# Depth first search yielding its search events as it goes (see search_algorithms.utility_functions for the events)
+# Nothing is buffered, so the search space can be shown or logged while the search is still running
+def dfs_search_events(maze, frontier_events=True, report=None):
+    # Work on the compiled maze (flat integer cell IDs instead of (x,y) tuples)
+    compact_maze = compile_maze(maze)
+    # Set the cell ID of the starting square and the target square
+    initial_cell = compact_maze.start_cell
+    target_cell = compact_maze.goal_cell
+    # Squares are yielded as (x,y) tuples like pyamaze uses
+    square = compact_maze.square
+    # Before we start, lets keep track of explored squares and how we got there (parent cell ID of each cell)
+    explored_squares = array('i', [-1]) * compact_maze.number_of_cells
     # Start off with the initial square as the next square that is discovered
-    discovered_squares = [initial_maze_square]
-    subsequent_squares = [initial_maze_square]
+    # (one byte per cell marks discovered squares so checking a square is O(1))
+    discovered_squares = bytearray(compact_maze.number_of_cells)
+    discovered_squares[initial_cell] = 1
+    subsequent_squares = [initial_cell]
+    # Squares taken off the frontier and the most squares waiting to be explored at once (only counted when there
+    # is a report)
+    frontier_pops = frontier_peak = 0
     # Keep looping until we have explored everything necessary
     while len(subsequent_squares) > 0:
-        # Get the next element in the list of squares to go to
-        present_square = subsequent_squares[-1]
-        # Remove the last element in the list of squares to go to (only keeping the 1st to the 2nd last element)
-        subsequent_squares = subsequent_squares[:-1]
+        if report is not None:
+            frontier_pops += 1
+            frontier_peak = max(frontier_peak, len(subsequent_squares))
+        # Pop the next square to go to off the end of the stack (in place, without copying the stack)
+        present_cell = subsequent_squares.pop()
         # If we reached the target, break out of the loop!
-        if present_square == (1, 1):
+        if present_cell == target_cell:
             break
-        # Pyamaze takes single letter representations of each cardinal direction
-        directions = {'North': 'N', 'East': 'E', 'South': 'S', 'West': 'W'}
-        # Otherwise, explore potentially neighbouring squares
-        for direction in directions.values():
-            if maze.maze_map[present_square][direction]:
-                # Set the neighbouring square (x,y) based on the direction and the square we are presenting at
-                neighbouring_square = set_neighbouring_square(direction, present_square)
-                # If the neighbouring square has already been explored, ignore it
-                if neighbouring_square in discovered_squares:
-                    continue
-                # Add the neighbour to the list of explored squares
-                maze_area_to_search.append(present_square)
-                # Add neighbour to the list of squares to explore next
-                subsequent_squares.append(neighbouring_square)
-                # Add neighbour to the list of discovered squares
-                discovered_squares.append(neighbouring_square)
-                # Update the DFS path between the (relationship between the neighbour and the present square)
-                explored_squares[neighbouring_square] = present_square
-    # Construct the path from the start to the target square
-    path_to_target = construct_path_from_dictionary(initial_maze_square, explored_squares)
-    return maze_area_to_search, path_to_target
+        # Otherwise, explore neighbouring cells
+        for neighbouring_cell in compact_maze.neighbours(present_cell):
+            # If the neighbouring square has already been explored, ignore it
+            if discovered_squares[neighbouring_cell]:
+                continue
+            # Add the neighbour to the list of explored squares
+            yield EXPLORED_EVENT, square(present_cell)
+            # Add neighbour to the list of squares to explore next
+            subsequent_squares.append(neighbouring_cell)
+            if frontier_events:
+                yield FRONTIER_EVENT, square(neighbouring_cell)
+            # Mark the neighbour as discovered
+            discovered_squares[neighbouring_cell] = 1
+            # Update the DFS path between the (relationship between the neighbour and the present square)
+            explored_squares[neighbouring_cell] = present_cell
+    # Construct the path from the start to the target square by walking the parents back from the target
+    path_to_target = path_from_parents(compact_maze.cols, initial_cell, explored_squares, target_cell)
+    if report is not None:
+        # Every discovered square was pushed onto the frontier once, and every square popped off it was expanded
+        # except the target (which is popped if and only if it was discovered, and ends the search)
+        write_search_report(report, frontier_pops - discovered_squares[target_cell], frontier_pops,
+                            discovered_squares.count(1), frontier_peak)
+    yield PATH_EVENT, path_to_target
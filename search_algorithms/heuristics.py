@@ -0,0 +1,120 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+from array import array
+from collections import deque
+
+# Number of landmarks used by the landmark (ALT) heuristic
+DEFAULT_NUMBER_OF_LANDMARKS = 4
+
+
+# Manhattan distance between 2 points for the heuristic (instead of Euclidean distance which would underestimate it)
+def manhattan_distance(starting_maze_square, ending_maze_square):
+    return abs(starting_maze_square[0] - ending_maze_square[0]) + abs(starting_maze_square[1] - ending_maze_square[1])
+
+
+# Manhattan distance from every cell to the target, stored in a table so A* never recomputes it
+def manhattan_distance_table(compact_maze, target_cell):
+    target_row, target_column = divmod(target_cell, compact_maze.cols)
+    column_distances = [abs(column - target_column) for column in range(compact_maze.cols)]
+    table = array('d')
+    for row in range(compact_maze.rows):
+        row_distance = abs(row - target_row)
+        table.extend([row_distance + column_distance for column_distance in column_distances])
+    return table
+
+
+# The zero heuristic turns A* into Dijkstra's algorithm (uniform cost search)
+def zero_table(compact_maze, target_cell):
+    return array('d', [0]) * compact_maze.number_of_cells
+
+
+# Exact distance from every cell to the target (the perfect heuristic, A* then only expands the shortest path)
+def exact_goal_distance_table(compact_maze, target_cell):
+    return breadth_first_distances(compact_maze, target_cell)
+
+
+# Exact distance from every cell to the target found by the wavefront engine (the same table as 'exact', but built with
+# NumPy a whole wavefront at a time, see search_algorithms.wavefront_bfs)
+def wavefront_goal_distance_table(compact_maze, target_cell):
+    # Only import NumPy when this heuristic is actually used
+    from search_algorithms.wavefront_bfs import goal_distance_table
+    return goal_distance_table(compact_maze, target_cell)
+
+
+# Landmark (ALT) heuristic using the triangle inequality on distances to a few precomputed landmark cells
+class LandmarkHeuristic:
+    def __init__(self, landmark_distances, target_cell):
+        # Pair up the distance table of each landmark with the distance from that landmark to the target
+        self.landmarks = [(distances, distances[target_cell]) for distances in landmark_distances]
+
+    # Lower bound on the distance from a cell to the target: max over landmarks of |d(L, cell) - d(L, target)|
+    def __getitem__(self, cell):
+        return max(abs(distances[cell] - distance_to_target) for distances, distance_to_target in self.landmarks)
+
+
+# Build the landmark heuristic for a target (the landmark distance tables are shared by every target of a maze)
+def landmark_heuristic(compact_maze, target_cell, number_of_landmarks=DEFAULT_NUMBER_OF_LANDMARKS):
+    key = ('landmark_distances', number_of_landmarks)
+    if key not in compact_maze.heuristic_tables:
+        compact_maze.heuristic_tables[key] = select_landmarks(compact_maze, number_of_landmarks)
+    return LandmarkHeuristic(compact_maze.heuristic_tables[key], target_cell)
+
+
+# Pick landmarks far away from each other (farthest point selection) and return each landmark's distance table
+def select_landmarks(compact_maze, number_of_landmarks):
+    # Start from the cell furthest away from the start of the maze
+    distances = breadth_first_distances(compact_maze, compact_maze.start_cell)
+    landmark_distances = []
+    # Distance from every cell to its closest landmark chosen so far
+    closest_landmark_distances = distances
+    for _ in range(number_of_landmarks):
+        landmark = max(range(compact_maze.number_of_cells),
+                       key=lambda cell: closest_landmark_distances[cell]
+                       if closest_landmark_distances[cell] != float('inf') else -1)
+        distances = breadth_first_distances(compact_maze, landmark)
+        landmark_distances.append(distances)
+        closest_landmark_distances = array('d', map(min, closest_landmark_distances, distances))
+    return landmark_distances
+
+
+# Distance (number of steps) from a source cell to every cell, infinity for unreachable cells
+def breadth_first_distances(compact_maze, source_cell):
+    distances = array('d', [float('inf')]) * compact_maze.number_of_cells
+    distances[source_cell] = 0
+    subsequent_squares = deque([source_cell])
+    while subsequent_squares:
+        present_cell = subsequent_squares.popleft()
+        next_distance = distances[present_cell] + 1
+        for neighbouring_cell in compact_maze.neighbours(present_cell):
+            if distances[neighbouring_cell] == float('inf'):
+                distances[neighbouring_cell] = next_distance
+                subsequent_squares.append(neighbouring_cell)
+    return distances
+
+
+# Registry of heuristics by name, each builds something indexable by cell ID from (compact maze, target cell)
+HEURISTICS = {
+    'manhattan': manhattan_distance_table,
+    'zero': zero_table,
+    'exact': exact_goal_distance_table,
+    'exact_wavefront': wavefront_goal_distance_table,
+    'landmarks': landmark_heuristic,
+}
+
+
+# Register a new heuristic (the builder is called once per maze and target, and its result is cached)
+def register_heuristic(name, heuristic_builder):
+    HEURISTICS[name] = heuristic_builder
+
+
+# Get the heuristic of a maze for a target, building it only the first time it is needed for that maze
+def heuristic_table(compact_maze, target_cell, heuristic='manhattan'):
+    # A heuristic that was already built (e.g. a table of goal distances) can be passed in directly
+    if not isinstance(heuristic, str):
+        return heuristic
+    if heuristic not in HEURISTICS:
+        raise ValueError(f"Unknown heuristic {heuristic!r}, expected one of {tuple(HEURISTICS)}")
+    key = (heuristic, target_cell)
+    if key not in compact_maze.heuristic_tables:
+        compact_maze.heuristic_tables[key] = HEURISTICS[heuristic](compact_maze, target_cell)
+    return compact_maze.heuristic_tables[key]
@@ -0,0 +1,319 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+import heapq
+from array import array
+from maze_representations.compact_maze import DIRECTION_BITS, SEARCH_DIRECTION_ORDER, compile_maze
+from maze_representations.compact_path import CompactPath, path_from_parents
+from search_algorithms.heuristics import heuristic_table
+from search_algorithms.utility_functions import EXPLORED_EVENT, FRONTIER_EVENT, PATH_EVENT, collect_search_events, \
+    write_search_report
+
+# The memory-bounded searches never allocate anything per cell up front: their per-cell state lives in pages of cells
+# that are only allocated once a cell in the page is first written, and every allocation is counted against an optional
+# memory limit (in bytes), so huge mazes can be searched on machines with little memory
+# Cells per page of a paged cell array or bitset (a power of 2, so a cell's page is found with a shift)
+PAGE_SHIFT = 12
+CELLS_PER_PAGE = 1 << PAGE_SHIFT
+# Rough size in bytes of one entry of A*'s heap (a tuple of 3 numbers and the list slot pointing at it)
+HEAP_ENTRY_BYTES = 120
+# Bytes of the current path kept by IDA* and the bitset DFS for each square on it (its cell ID and next move)
+PATH_SQUARE_BYTES = 5
+# Largest G-score of a paged A* search (read as the G-score of squares that were never reached)
+UNREACHED_G_SCORE = 2 ** 31 - 1
+
+
+# Running total of the memory a search has allocated, raising MemoryError once it goes over the memory limit
+class MemoryBudget:
+    def __init__(self, memory_limit=None):
+        if memory_limit is not None and memory_limit <= 0:
+            raise ValueError(f"The memory limit has to be above 0 bytes, not {memory_limit}")
+        self.memory_limit = memory_limit
+        self.bytes_allocated = 0
+
+    # Count an allocation
+    def allocate(self, number_of_bytes):
+        self.bytes_allocated += number_of_bytes
+        self.check()
+
+    # Raise MemoryError if the memory allocated so far and extra_bytes (memory in use that is not allocated through the
+    # budget, e.g. a heap) are over the memory limit
+    def check(self, extra_bytes=0):
+        if self.memory_limit is not None and self.bytes_allocated + extra_bytes > self.memory_limit:
+            raise MemoryError(f"The search needs more than its memory limit of {self.memory_limit} bytes")
+
+
+# Array of a value per cell (e.g. G-scores) whose memory is only allocated a page of cells at a time, when a cell in the
+# page is first written (cells that were never written read as the default value)
+class PagedCellArray:
+    def __init__(self, number_of_cells, typecode, default, memory_budget):
+        self.pages = [None] * ((number_of_cells + CELLS_PER_PAGE - 1) >> PAGE_SHIFT)
+        self.default = default
+        self.memory_budget = memory_budget
+        # Every new page starts as a copy of the empty page
+        self.empty_page = array(typecode, [default]) * CELLS_PER_PAGE
+        self.page_bytes = CELLS_PER_PAGE * self.empty_page.itemsize
+
+    def __getitem__(self, cell):
+        page = self.pages[cell >> PAGE_SHIFT]
+        return self.default if page is None else page[cell & (CELLS_PER_PAGE - 1)]
+
+    def __setitem__(self, cell, value):
+        page = self.pages[cell >> PAGE_SHIFT]
+        if page is None:
+            self.memory_budget.allocate(self.page_bytes)
+            page = self.pages[cell >> PAGE_SHIFT] = self.empty_page[:]
+        page[cell & (CELLS_PER_PAGE - 1)] = value
+
+
+# Set of cells stored as 1 bit per cell, a page of cells at a time (pages are allocated like PagedCellArray's)
+class PagedCellBitset:
+    def __init__(self, number_of_cells, memory_budget):
+        self.pages = [None] * ((number_of_cells + CELLS_PER_PAGE - 1) >> PAGE_SHIFT)
+        self.memory_budget = memory_budget
+
+    def __contains__(self, cell):
+        page = self.pages[cell >> PAGE_SHIFT]
+        return page is not None and page[(cell & (CELLS_PER_PAGE - 1)) >> 3] >> (cell & 7) & 1 == 1
+
+    def add(self, cell):
+        page = self.pages[cell >> PAGE_SHIFT]
+        if page is None:
+            self.memory_budget.allocate(CELLS_PER_PAGE // 8)
+            page = self.pages[cell >> PAGE_SHIFT] = bytearray(CELLS_PER_PAGE // 8)
+        page[(cell & (CELLS_PER_PAGE - 1)) >> 3] |= 1 << (cell & 7)
+
+    def discard(self, cell):
+        page = self.pages[cell >> PAGE_SHIFT]
+        if page is not None:
+            page[(cell & (CELLS_PER_PAGE - 1)) >> 3] &= ~(1 << (cell & 7))
+
+
+# Estimated cost from each cell to the target as a function of the cell ID
+# Manhattan distances are worked out from the cell ID instead of being stored in a table (which costs 8 bytes per cell)
+# Any other heuristic is built by search_algorithms.heuristics (outside the memory limit)
+def cost_to_target_estimate(compact_maze, target_cell, heuristic):
+    if heuristic != 'manhattan':
+        return heuristic_table(compact_maze, target_cell, heuristic).__getitem__
+    cols = compact_maze.cols
+    target_row, target_column = divmod(target_cell, cols)
+
+    def manhattan_distance_to_target(cell):
+        row, column = divmod(cell, cols)
+        return abs(row - target_row) + abs(column - target_column)
+    return manhattan_distance_to_target
+
+
+# Offsets of the open moves for each of the 16 possible wall bitmasks, in the order the moves are tried
+def move_offsets_of_bitmasks(compact_maze, direction_order=SEARCH_DIRECTION_ORDER):
+    return [[compact_maze.direction_offsets[direction] for direction in direction_order
+             if bitmask & DIRECTION_BITS[direction]] for bitmask in range(16)]
+
+
+# A star algorithm keeping its G-scores, parents and closed set in lazily allocated pages (accepts a pyamaze maze or a
+# compact maze)
+# Finds the same shortest path as a_star_algorithm, but the memory it uses grows with the squares it reaches instead of
+# the size of the maze, and a MemoryError is raised if it needs more than memory_limit bytes
+# If a report dictionary is given, the search counters are written into it (see write_search_report) along with the
+# bytes the search allocated
+def paged_a_star_algorithm(maze, heuristic='manhattan', memory_limit=None, report=None):
+    return collect_search_events(paged_a_star_search_events(maze, heuristic, memory_limit, frontier_events=False,
+                                                            report=report))
+
+
+# Paged A* yielding its search events as it goes (see search_algorithms.utility_functions for the events)
+def paged_a_star_search_events(maze, heuristic='manhattan', memory_limit=None, frontier_events=True, report=None):
+    compact_maze = compile_maze(maze)
+    initial_cell = compact_maze.start_cell
+    target_cell = compact_maze.goal_cell
+    memory_budget = MemoryBudget(memory_limit)
+    estimated_cost_to_target = cost_to_target_estimate(compact_maze, target_cell, heuristic)
+    move_offsets_of_bitmask = move_offsets_of_bitmasks(compact_maze)
+    wall_bitmasks = compact_maze.wall_bitmasks
+    # G-scores fit in 4 byte integers since every step costs 1
+    g_score = PagedCellArray(compact_maze.number_of_cells, 'i', UNREACHED_G_SCORE, memory_budget)
+    g_score[initial_cell] = 0
+    explored_squares = PagedCellArray(compact_maze.number_of_cells, 'i', -1, memory_budget)
+    closed_squares = PagedCellBitset(compact_maze.number_of_cells, memory_budget)
+    # Binary heap of (F-score, tie breaker, cell), ties go to the square further from the start like a_star_algorithm
+    nodes_to_explore = [(estimated_cost_to_target(initial_cell), 0, initial_cell)]
+    square = compact_maze.square
+    nodes_expanded = frontier_pops = frontier_pushes = frontier_peak = 0
+    while nodes_to_explore:
+        frontier_pops += 1
+        frontier_peak = max(frontier_peak, len(nodes_to_explore))
+        _, _, present_cell = heapq.heappop(nodes_to_explore)
+        # Skip stale heap entries of squares that were already expanded (lazy deletion)
+        if present_cell in closed_squares:
+            continue
+        closed_squares.add(present_cell)
+        nodes_expanded += 1
+        yield EXPLORED_EVENT, square(present_cell)
+        if present_cell == target_cell:
+            break
+        tentative_g_score = g_score[present_cell] + 1
+        for offset in move_offsets_of_bitmask[wall_bitmasks[present_cell]]:
+            neighbouring_cell = present_cell + offset
+            if neighbouring_cell in closed_squares or tentative_g_score >= g_score[neighbouring_cell]:
+                continue
+            explored_squares[neighbouring_cell] = present_cell
+            g_score[neighbouring_cell] = tentative_g_score
+            heapq.heappush(nodes_to_explore, (tentative_g_score + estimated_cost_to_target(neighbouring_cell),
+                                              -tentative_g_score, neighbouring_cell))
+            frontier_pushes += 1
+            if frontier_events:
+                yield FRONTIER_EVENT, square(neighbouring_cell)
+        # The heap is the only memory not allocated through the budget
+        memory_budget.check(len(nodes_to_explore) * HEAP_ENTRY_BYTES)
+    # Walk the parents back from the target (an empty path if the target was never reached)
+    path_to_target = path_from_parents(compact_maze.cols, initial_cell, explored_squares, target_cell)
+    if report is not None:
+        # Closing the target ends the search, so it is not counted as expanded
+        write_search_report(report, nodes_expanded - (target_cell in closed_squares), frontier_pops,
+                            frontier_pushes + 1, frontier_peak)
+        report['bytes_allocated'] = memory_budget.bytes_allocated + frontier_peak * HEAP_ENTRY_BYTES
+    yield PATH_EVENT, path_to_target
+
+
+# Iterative deepening A* (IDA*) (accepts a pyamaze maze or a compact maze)
+# Repeats a depth first search that gives up on squares whose F-score is above a bound, raising the bound to the
+# smallest F-score that went over it after each search, until the target is reached. Only the current path is kept (no
+# transposition table of G-scores), so the memory used grows with the length of the path instead of the size of the
+# maze, at the cost of expanding squares again in every search (and once per path reaching them within the bound,
+# which adds up quickly in mazes with many loops)
+# A MemoryError is raised if it needs more than memory_limit bytes
+# If a report dictionary is given, the search counters are written into it (see write_search_report) along with the
+# number of searches (iterations) and the bytes the search allocated
+def ida_star_algorithm(maze, heuristic='manhattan', memory_limit=None, report=None):
+    return collect_search_events(ida_star_search_events(maze, heuristic, memory_limit, frontier_events=False,
+                                                        report=report))
+
+
+# IDA* yielding its search events as it goes (see search_algorithms.utility_functions for the events)
+# Squares are explored again by every search, so the same square can be yielded many times
+def ida_star_search_events(maze, heuristic='manhattan', memory_limit=None, frontier_events=True, report=None):
+    compact_maze = compile_maze(maze)
+    initial_cell = compact_maze.start_cell
+    target_cell = compact_maze.goal_cell
+    memory_budget = MemoryBudget(memory_limit)
+    estimated_cost_to_target = cost_to_target_estimate(compact_maze, target_cell, heuristic)
+    move_offsets_of_bitmask = move_offsets_of_bitmasks(compact_maze)
+    wall_bitmasks = compact_maze.wall_bitmasks
+    # Squares on the current path, so the path never goes round in a circle
+    on_path = PagedCellBitset(compact_maze.number_of_cells, memory_budget)
+    square = compact_maze.square
+    bound = estimated_cost_to_target(initial_cell)
+    path_cells = []
+    nodes_expanded = frontier_pushes = frontier_peak = iterations = 0
+    while bound != float('inf'):
+        iterations += 1
+        # The current path and the index of the next move to try from each of its squares
+        path_cells = array('i', [initial_cell])
+        next_moves = array('B', [0])
+        on_path.add(initial_cell)
+        # Smallest F-score above the bound seen by this search (the bound of the next search)
+        next_bound = float('inf')
+        while path_cells:
+            present_cell = path_cells[-1]
+            move = next_moves[-1]
+            if move == 0:
+                nodes_expanded += 1
+                yield EXPLORED_EVENT, square(present_cell)
+                if present_cell == target_cell:
+                    break
+            move_offsets = move_offsets_of_bitmask[wall_bitmasks[present_cell]]
+            if move == len(move_offsets):
+                # Every move from this square was tried, so backtrack
+                path_cells.pop()
+                next_moves.pop()
+                on_path.discard(present_cell)
+                continue
+            next_moves[-1] = move + 1
+            neighbouring_cell = present_cell + move_offsets[move]
+            if neighbouring_cell in on_path:
+                continue
+            # The G-score of the neighbour is the number of steps along the path to it
+            f_score = len(path_cells) + estimated_cost_to_target(neighbouring_cell)
+            if f_score > bound:
+                next_bound = min(next_bound, f_score)
+                continue
+            path_cells.append(neighbouring_cell)
+            next_moves.append(0)
+            on_path.add(neighbouring_cell)
+            frontier_pushes += 1
+            if len(path_cells) > frontier_peak:
+                frontier_peak = len(path_cells)
+                memory_budget.allocate(PATH_SQUARE_BYTES)
+            if frontier_events:
+                yield FRONTIER_EVENT, square(neighbouring_cell)
+        if path_cells:
+            break
+        bound = next_bound
+    if report is not None:
+        # Every square pushed onto the path was visited (and popped off it unless it is on the final path), and all of
+        # them were expanded except the target the final path ends at
+        write_search_report(report, nodes_expanded - bool(path_cells), nodes_expanded, frontier_pushes + iterations,
+                            frontier_peak)
+        report['iterations'] = iterations
+        report['bytes_allocated'] = memory_budget.bytes_allocated
+    yield PATH_EVENT, CompactPath(compact_maze.cols, path_cells)
+
+
+# Depth first search marking discovered squares in a lazily allocated bitset (accepts a pyamaze maze or a compact maze)
+# Instead of a parent per cell, it backtracks along the current path, which becomes the path once the target is found,
+# so it needs 1 bit per square reached plus a few bytes per square on the current path
+# A MemoryError is raised if it needs more than memory_limit bytes
+# If a report dictionary is given, the search counters are written into it (see write_search_report) along with the
+# bytes the search allocated
+def bitset_dfs_algorithm(maze, memory_limit=None, report=None):
+    return collect_search_events(bitset_dfs_search_events(maze, memory_limit, frontier_events=False, report=report))
+
+
+# Bitset DFS yielding its search events as it goes (see search_algorithms.utility_functions for the events)
+def bitset_dfs_search_events(maze, memory_limit=None, frontier_events=True, report=None):
+    compact_maze = compile_maze(maze)
+    initial_cell = compact_maze.start_cell
+    target_cell = compact_maze.goal_cell
+    memory_budget = MemoryBudget(memory_limit)
+    # Moves are tried in reverse (W, S, E, N) like dfs_algorithm, which takes the last neighbour it pushed first
+    move_offsets_of_bitmask = move_offsets_of_bitmasks(compact_maze, SEARCH_DIRECTION_ORDER[::-1])
+    wall_bitmasks = compact_maze.wall_bitmasks
+    discovered_squares = PagedCellBitset(compact_maze.number_of_cells, memory_budget)
+    discovered_squares.add(initial_cell)
+    square = compact_maze.square
+    # The current path and the index of the next move to try from each of its squares
+    path_cells = array('i', [initial_cell])
+    next_moves = array('B', [0])
+    nodes_expanded = frontier_pushes = frontier_peak = 0
+    while path_cells:
+        present_cell = path_cells[-1]
+        move = next_moves[-1]
+        if move == 0:
+            nodes_expanded += 1
+            yield EXPLORED_EVENT, square(present_cell)
+            if present_cell == target_cell:
+                break
+        move_offsets = move_offsets_of_bitmask[wall_bitmasks[present_cell]]
+        if move == len(move_offsets):
+            # Every move from this square was tried, so backtrack
+            path_cells.pop()
+            next_moves.pop()
+            continue
+        next_moves[-1] = move + 1
+        neighbouring_cell = present_cell + move_offsets[move]
+        if neighbouring_cell in discovered_squares:
+            continue
+        discovered_squares.add(neighbouring_cell)
+        path_cells.append(neighbouring_cell)
+        next_moves.append(0)
+        frontier_pushes += 1
+        if len(path_cells) > frontier_peak:
+            frontier_peak = len(path_cells)
+            memory_budget.allocate(PATH_SQUARE_BYTES)
+        if frontier_events:
+            yield FRONTIER_EVENT, square(neighbouring_cell)
+    if report is not None:
+        # The target the path ends at (if it was reached) was visited but not expanded
+        write_search_report(report, nodes_expanded - bool(path_cells), nodes_expanded, frontier_pushes + 1,
+                            frontier_peak)
+        report['bytes_allocated'] = memory_budget.bytes_allocated
+    yield PATH_EVENT, CompactPath(compact_maze.cols, path_cells)
@@ -0,0 +1,103 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+from array import array
+from collections import OrderedDict, deque
+from maze_representations.compact_maze import compile_maze
+from maze_representations.compact_path import CompactPath, path_from_next_cells
+from mdp_algorithms.modified_policy_iteration import modified_policy_iteration_policy
+from mdp_algorithms.policy_iteration import policy_iteration_policy
+from mdp_algorithms.utility_functions import follow_policy
+from mdp_algorithms.value_iteration import value_iteration_policy
+
+# Number of goals whose shortest path trees (and MDP policies) are kept when no other cache size is given
+DEFAULT_CACHE_SIZE = 64
+# MDP algorithms whose policies can be cached: name -> function finding the policy of a compact maze
+MDP_POLICY_FUNCTIONS = {'modified_policy_iteration': modified_policy_iteration_policy,
+                        'policy_iteration': policy_iteration_policy, 'value_iteration': value_iteration_policy}
+
+
+# Shortest path tree of every cell to a goal cell, found with a BFS backwards from the goal
+# Returns the next cell on the way to the goal and the distance to the goal of every cell (-1 if it is unreachable)
+def reverse_shortest_path_tree(compact_maze, goal_cell):
+    next_cells = array('i', [-1]) * compact_maze.number_of_cells
+    distances = array('i', [-1]) * compact_maze.number_of_cells
+    next_cells[goal_cell] = goal_cell
+    distances[goal_cell] = 0
+    subsequent_squares = deque([goal_cell])
+    while subsequent_squares:
+        present_cell = subsequent_squares.popleft()
+        distance = distances[present_cell] + 1
+        # Passages are open from both sides, so a neighbour of the present cell can move to it
+        for neighbouring_cell in compact_maze.neighbours(present_cell):
+            if distances[neighbouring_cell] < 0:
+                distances[neighbouring_cell] = distance
+                next_cells[neighbouring_cell] = present_cell
+                subsequent_squares.append(neighbouring_cell)
+    return next_cells, distances
+
+
+# Answers many start -> goal queries on one maze (squares are (row, column) tuples like pyamaze's)
+# The shortest path tree and MDP policies of the most recently used goals are cached, so every later query to one of
+# those goals is answered by walking its path instead of searching the maze again
+class PathService:
+    def __init__(self, maze, cache_size=DEFAULT_CACHE_SIZE):
+        if cache_size <= 0:
+            raise ValueError(f"The cache has to hold at least one goal, not {cache_size}")
+        self.maze = compile_maze(maze)
+        self.cache_size = cache_size
+        # Goal cell -> (next cells, distances), least recently used first
+        self.shortest_path_trees = OrderedDict()
+        # (MDP algorithm, goal cell) -> next cell chosen by the policy, least recently used first
+        self.mdp_policies = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # Cell ID of a square, checking the square is in the maze
+    def cell(self, square):
+        if not (1 <= square[0] <= self.maze.rows and 1 <= square[1] <= self.maze.cols):
+            raise ValueError(f"{square} is not a square of the {self.maze.rows}x{self.maze.cols} maze")
+        return self.maze.cell_id(square)
+
+    # Get an entry of a least recently used cache, building it (and evicting the least recently used entry) if needed
+    def cached(self, cache, key, build):
+        if key in cache:
+            self.cache_hits += 1
+            cache.move_to_end(key)
+            return cache[key]
+        self.cache_misses += 1
+        entry = cache[key] = build()
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return entry
+
+    # Shortest path tree to a goal square as (next cells, distances)
+    def shortest_path_tree(self, goal):
+        goal_cell = self.cell(goal)
+        return self.cached(self.shortest_path_trees, goal_cell,
+                           lambda: reverse_shortest_path_tree(self.maze, goal_cell))
+
+    # Length of the shortest path (number of moves) between two squares, None if the goal cannot be reached
+    def distance(self, start, goal):
+        _, distances = self.shortest_path_tree(goal)
+        distance = distances[self.cell(start)]
+        return None if distance < 0 else distance
+
+    # Shortest path from the start to the goal (see maze_representations.compact_path.CompactPath), empty if the goal
+    # cannot be reached
+    def path(self, start, goal):
+        next_cells, _ = self.shortest_path_tree(goal)
+        start_cell = self.cell(start)
+        if next_cells[start_cell] < 0:
+            return CompactPath(self.maze.cols)
+        return path_from_next_cells(self.maze.cols, start_cell, next_cells, self.cell(goal))
+
+    # Path an MDP algorithm's optimal policy to the goal takes from the start, empty if the policy does not reach the
+    # goal from the start (like path when the goal cannot be reached)
+    def mdp_path(self, start, goal, algorithm='value_iteration'):
+        if algorithm not in MDP_POLICY_FUNCTIONS:
+            raise ValueError(f"Unknown MDP algorithm {algorithm!r}, expected one of {tuple(MDP_POLICY_FUNCTIONS)}")
+        goal_cell = self.cell(goal)
+        goal_maze = self.maze.with_endpoints(start_cell=self.cell(start), goal_cell=goal_cell)
+        next_cells = self.cached(self.mdp_policies, (algorithm, goal_cell),
+                                 lambda: MDP_POLICY_FUNCTIONS[algorithm](goal_maze))
+        return CompactPath(self.maze.cols, follow_policy(goal_maze, next_cells))
@@ -0,0 +1,61 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+from maze_representations.compact_path import CompactPath
+from maze_representations.dynamic_maze import dynamic_maze
+from mdp_algorithms.utility_functions import follow_policy
+from mdp_algorithms.value_iteration import value_iteration_policy
+from search_algorithms.d_star_lite import DStarLite
+
+# Solvers that can be kept up to date while the walls change
+# 'd_star_lite' - D* Lite search (see search_algorithms.d_star_lite), the shortest path
+# 'value_iteration' - value iteration repaired with prioritized sweeping from the cells whose walls changed
+REPLANNING_SOLVERS = ('d_star_lite', 'value_iteration')
+
+
+# Keeps the path through a maze whose walls are opened and closed up to date without solving it from scratch
+# (accepts a pyamaze maze or a compact maze, which is copied so the original is left unchanged)
+class MazeReplanner:
+    def __init__(self, maze, solver='d_star_lite', report=None):
+        if solver not in REPLANNING_SOLVERS:
+            raise ValueError(f"Unknown replanning solver {solver!r}, expected one of {REPLANNING_SOLVERS}")
+        self.maze = dynamic_maze(maze)
+        self.solver = solver
+        # Squares D* Lite had expanded when the previous search finished
+        self.nodes_expanded_before = 0
+        if solver == 'd_star_lite':
+            self.search = DStarLite(self.maze)
+        else:
+            # The value function and policy each repair starts from (see mdp_algorithms.utility_functions)
+            self.warm_start = {}
+            self.next_cells = value_iteration_policy(self.maze, report=report, warm_start=self.warm_start)
+        self.write_report(report)
+
+    # Open (or close) the wall on one side of a square and return the updated path (empty if the target cannot be
+    # reached any more)
+    # If a report dictionary is given, the work the repair took is written into it
+    def set_wall(self, square, direction, is_open, report=None):
+        changed_cells = self.maze.set_wall(self.maze.cell_id(square), direction, is_open)
+        # Nothing to repair if the wall already was that way
+        if changed_cells:
+            if self.solver == 'd_star_lite':
+                self.search.update_walls(changed_cells)
+            else:
+                self.next_cells = value_iteration_policy(self.maze, report=report, warm_start=self.warm_start,
+                                                         changed_cells=changed_cells)
+        self.write_report(report)
+        return self.path()
+
+    # Current path from the start to the target (see maze_representations.compact_path.CompactPath), empty if the
+    # target cannot be reached
+    def path(self):
+        if self.solver == 'd_star_lite':
+            return self.search.path()
+        return CompactPath(self.maze.cols, follow_policy(self.maze, self.next_cells))
+
+    # D* Lite counts the squares it expanded over all its searches, so report the ones the last search expanded
+    # (value iteration writes its own report)
+    def write_report(self, report):
+        if self.solver == 'd_star_lite':
+            if report is not None:
+                report['nodes_expanded'] = self.search.nodes_expanded - self.nodes_expanded_before
+            self.nodes_expanded_before = self.search.nodes_expanded
@@ -1,24 +1,40 @@
 # Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
 
-# Set the neighbouring squares depending on the cardinal directions provided
-def set_neighbouring_square(direction, present_square):
-    neighbouring_square = None
-    if direction == 'N':
-        neighbouring_square = (present_square[0] - 1, present_square[1])
-    elif direction == 'E':
-        neighbouring_square = (present_square[0], present_square[1] + 1)
-    elif direction == 'S':
-        neighbouring_square = (present_square[0] + 1, present_square[1])
-    elif direction == 'W':
-        neighbouring_square = (present_square[0], present_square[1] - 1)
-    return neighbouring_square
-
-
-# Construct the path from the dictionary of explored squares
-def construct_path_from_dictionary(initial_maze_square, explored_squares):
-    square = (1, 1)
-    path_to_target = {}
-    while square != initial_maze_square:
-        path_to_target[explored_squares[square]] = square
-        square = explored_squares[square]
-    return path_to_target
+from maze_representations.compact_path import CompactPath
+
+# Search events are (event, value) tuples yielded by the *_search_events generators while they run:
+# (EXPLORED_EVENT, square) when a square joins the search space, (FRONTIER_EVENT, square) when a square is added to
+# the squares waiting to be explored, and finally (PATH_EVENT, path) with the path (see
+# maze_representations.compact_path.CompactPath) once the search is over
+EXPLORED_EVENT = 'explored'
+FRONTIER_EVENT = 'frontier'
+PATH_EVENT = 'path'
+
+
+# Convert a search space made of compact maze cell IDs back into (x,y) squares for pyamaze, along with the cells of the
+# path (in order from the start to the target) as the compact path every solver returns
+def convert_cells_to_squares(compact_maze, maze_area_to_search, path_cells):
+    square = compact_maze.square
+    return [square(cell) for cell in maze_area_to_search], CompactPath(compact_maze.cols, path_cells)
+
+
+# Buffer the events of a search into the (search space, path) the search algorithms return
+def collect_search_events(search_events):
+    maze_area_to_search = []
+    path_to_target = None
+    for event, value in search_events:
+        if event == EXPLORED_EVENT:
+            maze_area_to_search.append(value)
+        elif event == PATH_EVENT:
+            path_to_target = value
+    return maze_area_to_search, path_to_target
+
+
+# Write the counters of a search into its report dictionary
+# nodes_expanded - squares whose neighbours were looked at, frontier_pops/frontier_pushes - squares taken off and put
+# onto the queue, stack or heap of squares to explore, frontier_peak - the most squares waiting there at once
+def write_search_report(report, nodes_expanded, frontier_pops, frontier_pushes, frontier_peak):
+    report['nodes_expanded'] = nodes_expanded
+    report['frontier_pops'] = frontier_pops
+    report['frontier_pushes'] = frontier_pushes
+    report['frontier_peak'] = frontier_peak
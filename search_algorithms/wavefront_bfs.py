@@ -0,0 +1,135 @@
+# Maze implementation library reference/credit: Pyamaze (https://pypi.org/project/pyamaze/)
+
+from array import array
+import numpy as np
+from maze_representations.compact_maze import DIRECTION_BITS, SEARCH_DIRECTION_ORDER, compile_maze
+from maze_representations.compact_path import path_from_parents
+from search_algorithms.utility_functions import write_search_report
+
+# Ways of finding a distance field:
+# 'numpy' - BFS that expands a whole wavefront (every square at the same distance) per step with NumPy array operations
+# 'scipy' - scipy.sparse.csgraph's breadth-first shortest paths over the maze's adjacency index
+WAVEFRONT_BACKENDS = ('numpy', 'scipy')
+# Wavefronts with fewer squares than this are spread with plain Python instead, since NumPy's overhead per call is only
+# worth paying for wide wavefronts (perfect mazes are mostly long corridors with a wavefront of a square or two)
+SMALL_WAVEFRONT = 64
+
+
+# Distance field of a maze (accepts a pyamaze maze or a compact maze): the distance of every cell from a source cell
+# (the goal cell by default, which makes it a table of goal distances) and the cell each cell was reached from
+# With a stop cell the numpy backend stops as soon as that cell is reached (further squares may be left unreached)
+# If a report dictionary is given, the search counters are written into it (see write_search_report) along with the
+# number of wavefronts expanded
+# Returns NumPy int32 arrays of the distances (-1 for squares that were not reached) and of the cells each square was
+# reached from (-1 for the source and squares that were not reached)
+def wavefront_distance_field(maze, source_cell=None, stop_cell=None, backend='numpy', report=None):
+    if backend not in WAVEFRONT_BACKENDS:
+        raise ValueError(f"Unknown wavefront backend {backend!r}, expected one of {WAVEFRONT_BACKENDS}")
+    compact_maze = compile_maze(maze)
+    if source_cell is None:
+        source_cell = compact_maze.goal_cell
+    if backend == 'scipy':
+        return scipy_distance_field(compact_maze, source_cell, report)
+
+    # The distances and predecessors are kept in arrays Python can index quickly (for small wavefronts), with NumPy
+    # arrays sharing their memory (for wide wavefronts)
+    distances = array('i', [-1]) * compact_maze.number_of_cells
+    predecessors = array('i', [-1]) * compact_maze.number_of_cells
+    distance_array = np.frombuffer(distances, dtype=np.intc)
+    predecessor_array = np.frombuffer(predecessors, dtype=np.intc)
+    wall_bitmasks = compact_maze.wall_bitmasks
+    wall_bitmask_array = np.frombuffer(wall_bitmasks, dtype=np.uint8)
+    distances[source_cell] = 0
+    # Wall bit and cell ID offset of a move in each direction (N, E, S, W like the other searches)
+    moves = [(DIRECTION_BITS[direction], compact_maze.direction_offsets[direction])
+             for direction in SEARCH_DIRECTION_ORDER]
+    # Offsets of the open moves for each of the 16 possible wall bitmasks
+    move_offsets_of_bitmask = [[offset for bit, offset in moves if bitmask & bit] for bitmask in range(16)]
+    # Cells of the current wavefront (the squares every later wavefront is spread from), a list or a NumPy array
+    wavefront = [source_cell]
+    nodes_expanded = frontier_peak = wavefronts = 0
+    while len(wavefront) and (stop_cell is None or distances[stop_cell] < 0):
+        wavefronts += 1
+        nodes_expanded += len(wavefront)
+        frontier_peak = max(frontier_peak, len(wavefront))
+        if len(wavefront) < SMALL_WAVEFRONT:
+            next_wavefront = []
+            for present_cell in (wavefront if isinstance(wavefront, list) else wavefront.tolist()):
+                for offset in move_offsets_of_bitmask[wall_bitmasks[present_cell]]:
+                    neighbouring_cell = present_cell + offset
+                    if distances[neighbouring_cell] < 0:
+                        distances[neighbouring_cell] = wavefronts
+                        predecessors[neighbouring_cell] = present_cell
+                        next_wavefront.append(neighbouring_cell)
+            wavefront = next_wavefront
+            continue
+        wavefront = np.asarray(wavefront, dtype=np.int64)
+        bitmasks = wall_bitmask_array[wavefront]
+        next_wavefront = []
+        for bit, offset in moves:
+            # Squares of the wavefront that are open in this direction, and the squares they move to
+            cells = wavefront[(bitmasks & bit) != 0]
+            neighbouring_cells = cells + offset
+            # Only squares no earlier wavefront (or earlier direction) reached join the next wavefront, and two squares
+            # can never move to the same square in the same direction
+            unreached = distance_array[neighbouring_cells] < 0
+            neighbouring_cells = neighbouring_cells[unreached]
+            distance_array[neighbouring_cells] = wavefronts
+            predecessor_array[neighbouring_cells] = cells[unreached]
+            next_wavefront.append(neighbouring_cells)
+        wavefront = np.concatenate(next_wavefront)
+    if report is not None:
+        # Every square reached was pushed onto the wavefront once, and every square of a wavefront was expanded
+        write_search_report(report, nodes_expanded, nodes_expanded, int(np.count_nonzero(distance_array >= 0)),
+                            frontier_peak)
+        report['wavefronts'] = wavefronts
+    return distance_array, predecessor_array
+
+
+# Distance field found by SciPy's shortest paths over the maze's adjacency index (see wavefront_distance_field)
+def scipy_distance_field(compact_maze, source_cell, report=None):
+    # Only import SciPy when this backend is actually used
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra
+    number_of_cells = compact_maze.number_of_cells
+    neighbour_cells = np.frombuffer(compact_maze.neighbour_cells, dtype=np.intc)
+    # The adjacency index is already in the compressed sparse row layout SciPy uses
+    graph = csr_matrix((np.ones(len(neighbour_cells), dtype=np.int8), neighbour_cells,
+                        np.frombuffer(compact_maze.neighbour_offsets, dtype=np.intc)),
+                       shape=(number_of_cells, number_of_cells))
+    distance_field, predecessor_field = dijkstra(graph, indices=source_cell, unweighted=True,
+                                                 return_predecessors=True)
+    reached = np.isfinite(distance_field)
+    distances = np.where(reached, distance_field, -1).astype(np.int32)
+    predecessors = np.where(predecessor_field >= 0, predecessor_field, -1).astype(np.int32)
+    if report is not None:
+        # SciPy expands every square it reaches
+        squares_reached = int(np.count_nonzero(reached))
+        write_search_report(report, squares_reached, squares_reached, squares_reached, None)
+        report['wavefronts'] = int(distances.max()) + 1
+    return distances, predecessors
+
+
+# Table of the exact distance from every cell to a target cell in the format of the heuristic tables (an array of
+# floats, infinity for unreachable cells), so A* and the MDP solvers can reuse it (see search_algorithms.heuristics)
+def goal_distance_table(maze, target_cell=None, backend='numpy'):
+    distances, _ = wavefront_distance_field(maze, target_cell, backend=backend)
+    table = array('d')
+    table.frombytes(np.where(distances >= 0, distances, np.inf).astype(np.float64).tobytes())
+    return table
+
+
+# Breadth first search algorithm on the wavefront engine (accepts a pyamaze maze or a compact maze)
+# Finds a shortest path like bfs_algorithm but expands a wavefront per step (see wavefront_distance_field)
+# Returns the squares reached (in order of distance from the start) and the path (see maze_representations.compact_path)
+def wavefront_bfs_algorithm(maze, backend='numpy', report=None):
+    compact_maze = compile_maze(maze)
+    distances, predecessors = wavefront_distance_field(compact_maze, compact_maze.start_cell, compact_maze.goal_cell,
+                                                       backend, report)
+    # Every square reached apart from the start, closest first (like the order bfs_algorithm explores them in)
+    reached_cells = np.flatnonzero(distances > 0)
+    reached_cells = reached_cells[np.argsort(distances[reached_cells], kind='stable')]
+    square = compact_maze.square
+    maze_area_to_search = [square(cell) for cell in reached_cells.tolist()]
+    return maze_area_to_search, path_from_parents(compact_maze.cols, compact_maze.start_cell, predecessors,
+                                                  compact_maze.goal_cell)